@@ -1,148 +1,190 @@
-from flask import Flask, render_template, redirect, url_for, flash, request
-from flask_sqlalchemy import SQLAlchemy
-from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Flask, render_template, redirect, url_for, flash, request, current_app
+from flask.cli import with_appcontext
+from flask_login import LoginManager, login_user, login_required, logout_user, current_user
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import joinedload, selectinload
+from collections.abc import Mapping
 from datetime import datetime
+import click
 import re
+import time
+import uuid
+import weakref
 
 import os
 
+from models import (db, APPLICATION_STATUSES, ACTIVE_MENTORSHIP_STATUSES, User, Course, Job,
+                    Application, Mentorship, MentorMatch, Progress, Certificate, Tag, UserTag)
+from she.backend.routes import jobs_bp, certificates_bp
+from she.backend.routes.certificates import get_queue
+from she.backend.services.query_budget import QueryBudget, query_budget
+from she.backend.services import index_advisor, schema_upgrade
+from she.backend.services.tags import parse_tags
+from she.backend.services.pagination import KeysetPage, page_size, paginate, request_cursor
+from she.backend.services.cache import VersionedCache, as_dict
+from she.backend.services.identity_cache import IdentityCache, IDENTITY_COLUMNS
+from she.backend.services import password_hasher
+from she.backend.services.password_hasher import HashingBusy, passwords
+from she.backend.services import sqlite_tuning
+from she.backend.services.sqlite_tuning import SQLiteTuning, retry_on_lock
+from she.backend.services.assets import Assets
+from she.backend.services.template_cache import TemplateCache
+from she.backend.services.http_cache import HTTPCache, conditional, table_version
+from she.backend.services.fragment_cache import FragmentCache, page_cache
+from she.backend.services.recommender import Recommender, document
+
 # Get the directory where this script is located
 basedir = os.path.abspath(os.path.dirname(__file__))
 
-app = Flask(
-    __name__,
-    template_folder=os.path.join(basedir, 'she', 'frontend', 'templates'),
-    static_folder=os.path.join(basedir, 'she', 'frontend', 'static')
-)
-app.config['SECRET_KEY'] = 'your-secret-key-here-change-this'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///she_empowerment.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-db = SQLAlchemy(app)
-login_manager = LoginManager(app)
+DEFAULT_CONFIG = {
+    'SECRET_KEY': 'your-secret-key-here-change-this',
+    'SQLALCHEMY_DATABASE_URI': 'sqlite:///she_empowerment.db',
+    'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+    'PAGE_SIZE_DEFAULT': 20,
+    'PAGE_SIZE_MAX': 100,
+    # Learners a mentor can have pending or accepted at once
+    'MENTOR_CAPACITY': 10,
+    'MENTOR_SUGGESTIONS': 3,
+}
+
+# ── EXTENSIONS ───────────────────────────────────────────────────────────────
+# Created unbound at import time and attached to each app by create_app()
+
+login_manager = LoginManager()
 login_manager.login_view = 'login'
 login_manager.login_message = 'Please log in to access this page.'
 
-# ── DATABASE MODELS ──────────────────────────────────────────────────────────
+# WAL and friends on every SQLite connection; @retry_on_lock views re-run on
+# 'database is locked' instead of failing the request
+sqlite_settings = SQLiteTuning(db=db)
+
+# Counts SQL statements per request in debug/testing mode so N+1 queries
+# fail loudly instead of creeping back into the list views.
+query_counter = QueryBudget()
+
+# Catalog and dashboard reference data: per-process LRU in front of a
+# SQLite file shared by all workers, invalidated on commit
+cache = VersionedCache()
+
+# current_user is a cached projection of the users row, not the ORM object
+identity_cache = IdentityCache()
+
+# Page CSS/JS built from static/src into fingerprinted, precompressed files
+# that browsers cache for a year
+assets = Assets()
+
+# Compiled templates survive restarts on disk and are loaded before forking
+templates = TemplateCache()
+
+# 304s for unchanged listing pages, gzip/brotli for large text responses
+http_cache = HTTPCache()
+
+# Rendered HTML shared by all workers: {% cache %} blocks and whole
+# anonymous pages, dropped when the data they show is committed
+fragments = FragmentCache()
+
+# Courses and jobs ranked against each learner's skill assessment
+recommender = Recommender()
+
+# Engines of every app built in this process. Pooled connections must not
+# cross a fork, so children start with empty pools; the set is weak so apps
+# built by tests and benchmarks can still be collected.
+_engines = weakref.WeakSet()
+
+
+def _dispose_engines_after_fork():
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_engines_after_fork)
+
+# Cached reference data is rebuilt whenever these tables change
+cache.watch({
+    'courses': ('courses',),
+    'jobs': ('jobs',),
+    'users': ('mentors',),
+    'user_tags': ('mentors',),
+    'mentor_matches': ('mentors',),
+})
+# The recommender's indexes only depend on the item text, not on counters
+# that move with every application
+cache.watch_columns('courses', ('title', 'category', 'level', 'description'), ('course_texts',))
+cache.watch_columns('jobs', ('title', 'requirements', 'description', 'company', 'location', 'is_active'),
+                    ('job_texts',))
+
+identity_cache.watch(User)
+
+MENTOR_CARD_COLUMNS = ('id', 'name', 'expertise', 'experience_years', 'location', 'education')
+
+# Tags one mentor filter may combine, which bounds its bound parameters
+MAX_FILTER_TAGS = 10
+
 
-class User(UserMixin, db.Model):
-    __tablename__ = 'users'
+def course_document(course):
+    return document(course.title, course.category, course.level, course.description)
 
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
-    email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(200), nullable=False)
-    phone = db.Column(db.String(20))
-    location = db.Column(db.String(100))
-    education = db.Column(db.String(200))
-    skill_level = db.Column(db.String(50))
-    role = db.Column(db.String(50), nullable=False)  # women, mentor, recruiter
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-    # Women specific fields
-    interests = db.Column(db.String(500))
-    completed_courses = db.Column(db.String(500))
-
-    # Mentor specific fields
-    expertise = db.Column(db.String(500))
-    experience_years = db.Column(db.Integer)
-
-    # Recruiter specific fields
-    company = db.Column(db.String(100))
-    position = db.Column(db.String(100))
-
-    # ── RELATIONSHIPS (needed so templates can do app.user, req.mentee, m.mentee) ──
-    applications = db.relationship('Application', foreign_keys='Application.user_id',
-                                   backref='user', lazy=True)
-    mentee_requests = db.relationship('Mentorship', foreign_keys='Mentorship.mentee_id',
-                                      backref='mentee', lazy=True)
-    mentor_requests = db.relationship('Mentorship', foreign_keys='Mentorship.mentor_id',
-                                      backref='mentor_rel', lazy=True)
-    progress_records = db.relationship('Progress', backref='student', lazy=True)
-
-    def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
-
-    def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
-
-
-class Course(db.Model):
-    __tablename__ = 'courses'
-
-    id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(200), nullable=False)
-    description = db.Column(db.Text)
-    category = db.Column(db.String(100))
-    level = db.Column(db.String(50))
-    duration = db.Column(db.String(50))
-    mentor_id = db.Column(db.Integer, db.ForeignKey('users.id'))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-
-    enrollments = db.relationship('Progress', backref='course', lazy=True)
-
-
-class Job(db.Model):
-    __tablename__ = 'jobs'
-
-    id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(200), nullable=False)
-    description = db.Column(db.Text)
-    company = db.Column(db.String(200))
-    location = db.Column(db.String(100))
-    requirements = db.Column(db.Text)
-    salary_range = db.Column(db.String(100))
-    recruiter_id = db.Column(db.Integer, db.ForeignKey('users.id'))
-    posted_at = db.Column(db.DateTime, default=datetime.utcnow)
-    is_active = db.Column(db.Boolean, default=True)
-
-    applications = db.relationship('Application', backref='job', lazy=True)
-    recruiter = db.relationship('User', foreign_keys=[recruiter_id])
-
-
-class Application(db.Model):
-    __tablename__ = 'applications'
-
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
-    status = db.Column(db.String(50), default='pending')
-    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
-    # .user backref comes from User.applications
-    # .job  backref comes from Job.applications
-
-
-class Mentorship(db.Model):
-    __tablename__ = 'mentorships'
-
-    id = db.Column(db.Integer, primary_key=True)
-    mentee_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    mentor_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    status = db.Column(db.String(50), default='pending')
-    requested_at = db.Column(db.DateTime, default=datetime.utcnow)
-    scheduled_date = db.Column(db.DateTime)
-    feedback = db.Column(db.Text)
-    # .mentee backref comes from User.mentee_requests (foreign_keys=mentee_id)
-
-
-class Progress(db.Model):
-    __tablename__ = 'progress'
-
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
-    progress_percentage = db.Column(db.Float, default=0)
-    completed = db.Column(db.Boolean, default=False)
-    certificate_issued = db.Column(db.Boolean, default=False)
-    last_accessed = db.Column(db.DateTime, default=datetime.utcnow)
-    # .course  backref comes from Course.enrollments
-    # .student backref comes from User.progress_records
+
+def job_document(job):
+    return document(job.title, job.requirements, job.description, job.company, job.location)
+
+
+def profile_document(user):
+    return document(user.interests, user.education, user.skill_level, user.location)
+
+
+recommender.source('courses', 'course_texts', lambda: [
+    (course.id, course_document(course)) for course in db.session.query(
+        Course.id, Course.title, Course.category, Course.level, Course.description)])
+recommender.source('jobs', 'job_texts', lambda: [
+    (job.id, job_document(job)) for job in db.session.query(
+        Job.id, Job.title, Job.requirements, Job.description, Job.company, Job.location)
+    .filter(Job.is_active.is_(True))])
+
+
+def cards(model, ids):
+    """Plain dicts of the given rows, in the order of `ids`"""
+    rows = {row.id: as_dict(row) for row in model.query.filter(model.id.in_(ids))} if ids else {}
+    return [rows[item_id] for item_id in ids if item_id in rows]
+
+
+def recommended_cards(kind, model, profile):
+    """Cards of `kind` recommended to the current user, or None before there are any"""
+    ids = recommender.recommend(kind, current_user.id, profile)
+    if not ids:
+        return ids
+    return cache.get_or_set(kind, f"cards:{','.join(map(str, ids))}", lambda: cards(model, ids))
+
+
+def pick(recommended, fallback, exclude=(), count=3):
+    """Up to `count` recommended cards, topped up from fallback() when too few match"""
+    chosen = [card for card in recommended or () if card['id'] not in exclude][:count]
+    if len(chosen) < count:
+        seen = {card['id'] for card in chosen}
+        chosen += [card for card in fallback()
+                   if card['id'] not in seen and card['id'] not in exclude][:count - len(chosen)]
+    return chosen
+
+# Core routes are collected here and added to the app by create_app()
+_routes = []
+
+
+def route(rule, **options):
+    def decorator(view):
+        _routes.append((rule, view, options))
+        return view
+    return decorator
+
+
+def _load_identity(user_id):
+    row = db.session.query(*[getattr(User, column) for column in IDENTITY_COLUMNS]).filter(
+        User.id == user_id).first()
+    return row._asdict() if row else None
 
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return identity_cache.load(int(user_id), _load_identity)
 
 
 def is_valid_email(email):
@@ -150,14 +192,21 @@ def is_valid_email(email):
     return re.match(pattern, email) is not None
 
 
+def hashing_busy(error):
+    flash('We are handling a lot of sign-ins right now. Please try again in a moment.', 'error')
+    template = 'signup.html' if request.endpoint == 'signup' else 'login.html'
+    return render_template(template), 503, {'Retry-After': '2'}
+
+
 # ── ROUTES ───────────────────────────────────────────────────────────────────
 
-@app.route('/')
+@route('/')
+@page_cache()
 def index():
     return render_template('index.html')
 
 
-@app.route('/login', methods=['GET', 'POST'])
+@route('/login', methods=['GET', 'POST'])
 def login():
     if current_user.is_authenticated:
         return redirect(url_for('dashboard'))
@@ -177,6 +226,8 @@ def login():
         user = User.query.filter_by(email=email).first()
 
         if user and user.check_password(password):
+            if user.rehash_password(password):
+                db.session.commit()
             login_user(user)
             flash('Login successful! 🌸', 'success')
             return redirect(url_for('dashboard'))
@@ -187,7 +238,8 @@ def login():
     return render_template('login.html')
 
 
-@app.route('/signup', methods=['GET', 'POST'])
+@route('/signup', methods=['GET', 'POST'])
+@retry_on_lock
 def signup():
     if current_user.is_authenticated:
         return redirect(url_for('dashboard'))
@@ -235,18 +287,21 @@ def signup():
 
         try:
             db.session.add(new_user)
+            new_user.sync_tags()
             db.session.commit()
             flash('Registration successful! Please login. 🌸', 'success')
             return redirect(url_for('login'))
-        except Exception:
+        except Exception as error:
             db.session.rollback()
+            if sqlite_tuning.is_lock_error(error):
+                raise  # let @retry_on_lock run the signup again
             flash('An error occurred. Please try again.', 'error')
             return render_template('signup.html')
 
     return render_template('signup.html')
 
 
-@app.route('/forgot-password', methods=['GET', 'POST'])
+@route('/forgot-password', methods=['GET', 'POST'])
 def forgot_password():
     if request.method == 'POST':
         email = request.form.get('email', '').strip()
@@ -270,20 +325,32 @@ def forgot_password():
     return render_template('forgot_password.html')
 
 
-@app.route('/dashboard')
+@route('/dashboard')
 @login_required
+# Cold caches: enrollments, recommended and fallback course and job cards, mentors
+@query_budget(8)
 def dashboard():
     if current_user.role == 'women':
-        courses  = Course.query.limit(3).all()
-        jobs     = Job.query.filter_by(is_active=True).limit(3).all()
-        mentors  = User.query.filter_by(role='mentor').limit(3).all()
         progress = Progress.query.filter_by(user_id=current_user.id).all()
+        profile  = profile_document(current_user)
+        courses  = pick(
+            recommended_cards('courses', Course, profile),
+            lambda: cache.get_or_set('courses', 'dashboard', lambda: [
+                as_dict(course) for course in Course.query.limit(3)]),
+            exclude={p.course_id for p in progress})
+        jobs     = pick(
+            recommended_cards('jobs', Job, profile),
+            lambda: cache.get_or_set('jobs', 'dashboard', lambda: [
+                as_dict(job) for job in Job.query.filter_by(is_active=True).limit(3)]))
+        mentors  = cache.get_or_set('mentors', 'dashboard', lambda: [
+            as_dict(mentor, *MENTOR_CARD_COLUMNS)
+            for mentor in User.query.filter_by(role='mentor').limit(3)])
         return render_template('women_dashboard.html',
                                courses=courses, jobs=jobs,
                                mentors=mentors, progress=progress)
 
     elif current_user.role == 'mentor':
-        mentees = Mentorship.query.filter_by(
+        mentees = Mentorship.query.options(joinedload(Mentorship.mentee)).filter_by(
             mentor_id=current_user.id, status='accepted').all()
         pending_requests = Mentorship.query.filter_by(
             mentor_id=current_user.id, status='pending').count()
@@ -293,51 +360,76 @@ def dashboard():
 
     elif current_user.role == 'recruiter':
         jobs = Job.query.filter_by(recruiter_id=current_user.id).all()
-        applications = Application.query.join(Job).filter(
-            Job.recruiter_id == current_user.id).count()
+        applications = sum(job.applications_count for job in jobs)
+        pending_applications = sum(job.pending_count for job in jobs)
         return render_template('recruiter_dashboard.html',
-                               jobs=jobs, applications=applications)
+                               jobs=jobs, applications=applications,
+                               pending_applications=pending_applications)
 
     return redirect(url_for('index'))
 
 
 # ── WOMEN ROUTES ─────────────────────────────────────────────────────────────
 
-@app.route('/skill-assessment', methods=['GET', 'POST'])
+@route('/skill-assessment', methods=['GET', 'POST'])
 @login_required
+@retry_on_lock
 def skill_assessment():
     if current_user.role != 'women':
         flash('Access denied', 'error')
         return redirect(url_for('dashboard'))
     if request.method == 'POST':
-        current_user.education   = request.form.get('education', '')
-        current_user.interests   = request.form.get('interest', '')
-        current_user.skill_level = request.form.get('computer_skills', '')
+        user = db.session.get(User, current_user.id)
+        user.education   = request.form.get('education', '')
+        user.interests   = request.form.get('interest', '')
+        user.skill_level = request.form.get('computer_skills', '')
+        user.sync_tags()
         db.session.commit()
         flash('Skill assessment completed! 🌸', 'success')
         return redirect(url_for('dashboard'))
     return render_template('skill_assessment.html')
 
 
-@app.route('/courses')
+def courses_version():
+    return table_version('courses', db.session.query(func.count(Course.id), func.max(Course.created_at)))
+
+
+@route('/courses')
 @login_required
+@conditional(courses_version)
 def courses():
-    all_courses = Course.query.all()
-    return render_template('courses.html', courses=all_courses)
+    # The cache key is built from the parsed cursor and clamped page size, so
+    # made-up query strings can't each fill a cache entry
+    after, per_page = request_cursor(Course.id), page_size()
+
+    def load_page():
+        page = paginate(Course.query, Course.id, per_page=per_page)
+        return KeysetPage([as_dict(course) for course in page.items],
+                          page.next_cursor, page.per_page)
 
+    page = cache.get_or_set('courses', f"page:{after[0] if after else ''}:{per_page}", load_page)
+    return render_template('courses.html', courses=page.items, page=page)
 
-@app.route('/my-courses')
+
+@route('/my-courses')
 @login_required
+@query_budget(3)
 def my_courses():
     if current_user.role != 'women':
         flash('Access denied', 'error')
         return redirect(url_for('dashboard'))
-    enrollments = Progress.query.filter_by(user_id=current_user.id).all()
-    return render_template('my_courses.html', enrollments=enrollments)
+    enrollments = Progress.query.options(joinedload(Progress.course)).filter_by(
+        user_id=current_user.id).all()
+    certificates = {}
+    if any(enrollment.certificate_issued for enrollment in enrollments):
+        certificates = {certificate.course_id: certificate for certificate in
+                        Certificate.query.filter_by(user_id=current_user.id)}
+    return render_template('my_courses.html', enrollments=enrollments, certificates=certificates)
 
 
-@app.route('/enroll-course/<int:course_id>')
+@route('/enroll-course/<int:course_id>')
 @login_required
+@retry_on_lock
 def enroll_course(course_id):
     if current_user.role != 'women':
         flash('Access denied', 'error')
@@ -358,15 +450,84 @@ def enroll_course(course_id):
     return redirect(url_for('dashboard'))
 
 
-@app.route('/mentors')
+@route('/update-progress/<int:course_id>', methods=['POST'])
 @login_required
-def mentors():
-    all_mentors = User.query.filter_by(role='mentor').all()
-    return render_template('mentors.html', mentors=all_mentors)
+@retry_on_lock
+def update_progress(course_id):
+    if current_user.role != 'women':
+        flash('Access denied', 'error')
+        return redirect(url_for('dashboard'))
+
+    progress = Progress.query.filter_by(
+        user_id=current_user.id, course_id=course_id).first_or_404()
+    percentage = min(max(request.form.get('percentage', 0, type=float), 0.0), 100.0)
+
+    progress.progress_percentage = percentage
+    progress.last_accessed = datetime.utcnow()
+    if percentage >= 100 and not progress.certificate_issued:
+        progress.completed = True
+        progress.completed_at = datetime.utcnow()
+        # The PDF is rendered by `flask certificates worker`, off the request
+        certificate = Certificate(user_id=current_user.id, course_id=course_id,
+                                  certificate_number=f"CERT-{uuid.uuid4().hex.upper()}")
+        db.session.add(certificate)
+        get_queue().enqueue(certificate)
+        progress.certificate_issued = True
+        flash('Congratulations! You have completed the course. 🎓 '
+              'Your certificate is being prepared and will be ready to download shortly.', 'success')
+    db.session.commit()
+    return redirect(url_for('my_courses'))
 
 
-@app.route('/request-mentor/<int:mentor_id>')
+def tagged_users(kind, names, match_all=True):
+    """Ids of users with every one (or with any) of the tag names, as a subquery"""
+    query = (select(UserTag.user_id).join(Tag, Tag.id == UserTag.tag_id)
+             .where(UserTag.kind == kind, Tag.name.in_(names)))
+    if match_all:
+        # (user, tag, kind) is the primary key, so each matching tag counts once
+        query = query.group_by(UserTag.user_id).having(func.count() == len(names))
+    return query
+
+
+def popular_tags(kind, limit=20):
+    """(tag name, user count) of the most used tags of a kind"""
+    return [tuple(row) for row in db.session.query(Tag.name, func.count())
+            .join(UserTag, UserTag.tag_id == Tag.id).filter(UserTag.kind == kind)
+            .group_by(Tag.id).order_by(func.count().desc(), Tag.name).limit(limit)]
+
+
+def mentors_version():
+    return table_version('mentors', db.session.query(func.count(User.id), func.max(User.created_at))
+                         .filter(User.role == 'mentor'))
+
+
+@route('/mentors')
+@login_required
+@conditional(mentors_version)
+def mentors():
+    expertise = parse_tags(request.args.get('expertise', ''))[:MAX_FILTER_TAGS]
+    match = request.args.get('match', 'all')
+
+    query = User.query.filter_by(role='mentor')
+    if expertise:
+        query = query.filter(User.id.in_(tagged_users('expertise', expertise, match != 'any')))
+
+    page = paginate(query, User.id)
+    suggested = []
+    if current_user.role == 'women' and page.is_first:
+        # Precomputed by `flask match-mentors`, best first
+        suggested = (User.query.join(MentorMatch, MentorMatch.mentor_id == User.id)
+                     .filter(MentorMatch.mentee_id == current_user.id)
+                     .order_by(MentorMatch.rank).all())
+    return render_template('mentors.html', mentors=page.items, page=page,
+                           expertise=expertise, match=match, suggested=suggested,
+                           expertise_tags=cache.get_or_set('mentors', 'expertise-tags',
+                                                           lambda: popular_tags('expertise')))
+
+
+@route('/request-mentor/<int:mentor_id>')
 @login_required
+@retry_on_lock
 def request_mentor(mentor_id):
     if current_user.role != 'women':
         flash('Access denied', 'error')
@@ -378,6 +539,20 @@ def request_mentor(mentor_id):
         flash('You already requested this mentor', 'info')
         return redirect(url_for('mentors'))
 
+    active = Mentorship.query.filter(Mentorship.mentor_id == mentor_id,
+                                     Mentorship.status.in_(ACTIVE_MENTORSHIP_STATUSES)).count()
+    # Places match-mentors reserved for other learners count as taken until
+    # those learners start a mentorship, as they did when the places were given out
+    reserved = MentorMatch.query.filter(
+        MentorMatch.mentor_id == mentor_id, MentorMatch.assigned.is_(True),
+        MentorMatch.mentee_id != current_user.id,
+        ~select(Mentorship.id).where(
+            Mentorship.mentee_id == MentorMatch.mentee_id,
+            Mentorship.status.in_(ACTIVE_MENTORSHIP_STATUSES)).exists()).count()
+    if active + reserved >= current_app.config['MENTOR_CAPACITY']:
+        flash('This mentor has no free places right now, try one of your suggested mentors', 'info')
+        return redirect(url_for('mentors'))
+
     mentorship = Mentorship(mentee_id=current_user.id, mentor_id=mentor_id)
     db.session.add(mentorship)
     db.session.commit()
@@ -385,8 +560,9 @@ def request_mentor(mentor_id):
     return redirect(url_for('dashboard'))
 
 
-@app.route('/apply-job/<int:job_id>')
+@route('/apply-job/<int:job_id>')
 @login_required
+@retry_on_lock
 def apply_job(job_id):
     if current_user.role != 'women':
         flash('Access denied', 'error')
@@ -402,6 +578,9 @@ def apply_job(job_id):
 
     application = Application(user_id=current_user.id, job_id=job_id)
     db.session.add(application)
+    job.record_application()
+    # Scored now, with the others, so the applicants page only has to read
+    job.rank_applications()
     db.session.commit()
     flash(f'Applied to {job.title} successfully! 🌸', 'success')
     return redirect(url_for('dashboard'))
@@ -409,20 +588,22 @@ def apply_job(job_id):
 
 # ── MENTOR ROUTES ─────────────────────────────────────────────────────────────
 
-@app.route('/mentorship-requests')
+@route('/mentorship-requests')
 @login_required
+@query_budget(3)
 def mentorship_requests():
     if current_user.role != 'mentor':
         flash('Access denied', 'error')
         return redirect(url_for('dashboard'))
 
-    reqs = Mentorship.query.filter_by(
+    reqs = Mentorship.query.options(joinedload(Mentorship.mentee)).filter_by(
         mentor_id=current_user.id, status='pending').all()
     return render_template('mentorship_requests.html', requests=reqs)
 
 
-@app.route('/accept-mentor/<int:request_id>')
+@route('/accept-mentor/<int:request_id>')
 @login_required
+@retry_on_lock
 def accept_mentor(request_id):
     mentorship = Mentorship.query.get_or_404(request_id)
     if mentorship.mentor_id != current_user.id:
@@ -435,8 +616,9 @@ def accept_mentor(request_id):
     return redirect(url_for('mentorship_requests'))
 
 
-@app.route('/reject-mentor/<int:request_id>')
+@route('/reject-mentor/<int:request_id>')
 @login_required
+@retry_on_lock
 def reject_mentor(request_id):
     mentorship = Mentorship.query.get_or_404(request_id)
     if mentorship.mentor_id != current_user.id:
@@ -451,8 +633,9 @@ def reject_mentor(request_id):
 
 # ── RECRUITER ROUTES ──────────────────────────────────────────────────────────
 
-@app.route('/post-job', methods=['GET', 'POST'])
+@route('/post-job', methods=['GET', 'POST'])
 @login_required
+@retry_on_lock
 def post_job():
     if current_user.role != 'recruiter':
         flash('Access denied', 'error')
@@ -486,8 +669,10 @@ def post_job():
     return render_template('post_job.html')
 
 
-@app.route('/view-applicants/<int:job_id>')
+@route('/view-applicants/<int:job_id>')
 @login_required
+# Read-only: the job and one page of applicants; they are scored when they apply
+@query_budget(4)
 def view_applicants(job_id):
     if current_user.role != 'recruiter':
         flash('Access denied', 'error')
@@ -498,13 +683,16 @@ def view_applicants(job_id):
         flash('Access denied', 'error')
         return redirect(url_for('dashboard'))
 
-    applications = Application.query.filter_by(job_id=job_id).all()
+    # Best fit first; ix_applications_job_score serves both the order and the cursor
+    page = paginate(Application.query.options(joinedload(Application.user)).filter_by(
+        job_id=job_id), Application.match_score, Application.id, descending=True)
     return render_template('view_applicants.html', job=job,
-                           applications=applications)
+                           applications=page.items, page=page)
 
 
-@app.route('/update-application/<int:app_id>/<string:status>')
+@route('/update-application/<int:app_id>/<string:status>')
 @login_required
+@retry_on_lock
 def update_application(app_id, status):
     application = Application.query.get_or_404(app_id)
     job = Job.query.get(application.job_id)
@@ -513,6 +701,11 @@ def update_application(app_id, status):
         flash('Access denied', 'error')
         return redirect(url_for('dashboard'))
 
+    if status not in APPLICATION_STATUSES:
+        flash('Invalid application status', 'error')
+        return redirect(url_for('view_applicants', job_id=job.id))
+
+    job.move_application(application.status, status)
     application.status = status
     db.session.commit()
     flash(f'Application marked as {status} ✓', 'success')
@@ -521,7 +714,7 @@ def update_application(app_id, status):
 
 # ── LOGOUT ────────────────────────────────────────────────────────────────────
 
-@app.route('/logout')
+@route('/logout')
 @login_required
 def logout():
     logout_user()
@@ -531,7 +724,8 @@ def logout():
 
 # ── DB INIT ───────────────────────────────────────────────────────────────────
 
-@app.cli.command("init-db")
+@click.command("init-db")
+@with_appcontext
 def init_db():
     db.create_all()
 
@@ -561,7 +755,478 @@ def init_db():
     print("✓ Database initialized!")
 
 
+@click.command("sync-tags")
+@with_appcontext
+def sync_tags():
+    """Rebuild user_tags from every user's expertise, interests and completed courses"""
+    user_ids = [user_id for (user_id,) in db.session.query(User.id).order_by(User.id)]
+    for start in range(0, len(user_ids), 500):
+        batch = User.query.options(selectinload(User.tag_links)).filter(
+            User.id.in_(user_ids[start:start + 500]))
+        for user in batch:
+            user.sync_tags()
+        db.session.commit()
+    print(f"✓ Synced tags for {len(user_ids)} user(s)")
+
+
+@click.command("reconcile-counters")
+@with_appcontext
+def reconcile_counters():
+    """Rebuild every job's application counters from the applications table"""
+    counters = {job_id: {'id': job_id, 'applications_count': 0,
+                         **{f'{status}_count': 0 for status in APPLICATION_STATUSES}}
+                for (job_id,) in db.session.query(Job.id)}
+
+    rows = db.session.query(Application.job_id, Application.status,
+                            db.func.count(Application.id)).group_by(
+        Application.job_id, Application.status)
+    for job_id, status, total in rows:
+        row = counters.get(job_id)
+        if row is None:
+            continue
+        row['applications_count'] += total
+        if status in APPLICATION_STATUSES:
+            row[f'{status}_count'] = total
+
+    if counters:
+        db.session.execute(db.update(Job), list(counters.values()))
+    db.session.commit()
+    print(f"✓ Reconciled application counters for {len(counters)} job(s)")
+
+
+@click.command("upgrade-db")
+@with_appcontext
+@click.pass_context
+def upgrade_db(ctx):
+    """Bring a database made by an older version up to the current models"""
+    if db.engine.dialect.name != 'sqlite':
+        print("✗ upgrade-db only knows how to alter SQLite databases")
+        raise SystemExit(1)
+    # New tables, and the job search index filled from the existing jobs
+    db.create_all()
+    with db.engine.begin() as connection:
+        try:
+            added = schema_upgrade.add_missing_columns(connection, db.metadata)
+        except schema_upgrade.UnsupportedUpgrade as error:
+            print(f"✗ {error}")
+            raise SystemExit(1)
+        created = index_advisor.create_missing_indexes(connection, db.metadata)
+        dropped = index_advisor.drop_retired_indexes(connection)
+    for name in added:
+        print(f"+ added column {name}")
+    for name in created:
+        print(f"+ created {name}")
+    for name in dropped:
+        print(f"- dropped {name}")
+    # Counters and tags of the rows already there start out empty
+    ctx.invoke(reconcile_counters)
+    ctx.invoke(sync_tags)
+    print("✓ Database is up to date")
+
+
+def index_advisor_catalog():
+    """The filtered lookups the routes run on every request"""
+    return {
+        'progress by learner and course': Progress.query.filter_by(user_id=1, course_id=1),
+        'progress by learner': Progress.query.filter_by(user_id=1),
+        'application by learner and job': Application.query.filter_by(user_id=1, job_id=1),
+        'applicants for a job': Application.query.filter_by(job_id=1),
+        'mentorships by mentor and status': Mentorship.query.filter_by(mentor_id=1, status='pending'),
+        'mentorship by mentee and mentor': Mentorship.query.filter_by(mentee_id=1, mentor_id=1),
+        'places reserved with a mentor': MentorMatch.query.filter_by(mentor_id=1, assigned=True),
+        'mentors': User.query.filter_by(role='mentor'),
+        'user by email': User.query.filter_by(email='someone@example.com'),
+        'active jobs, newest first': Job.query.filter_by(is_active=True).order_by(Job.posted_at.desc()),
+        'jobs by recruiter': Job.query.filter_by(recruiter_id=1),
+    }
+
+
+@click.command("index-advisor")
+@with_appcontext
+@click.option('--create-missing', is_flag=True,
+              help='Create declared indexes that the database does not have yet.')
+def index_advisor_command(create_missing):
+    """EXPLAIN every catalogued query and flag the ones that still scan"""
+    with db.engine.begin() as connection:
+        if create_missing:
+            for name in index_advisor.create_missing_indexes(connection, db.metadata):
+                print(f"+ created {name}")
+
+        plans = index_advisor.advise(connection, index_advisor_catalog())
+
+    for plan in plans:
+        print(f"{'✓' if plan.ok else '✗'} {plan.name}")
+        for step in plan.steps:
+            print(f"    {step}")
+
+    flagged = [plan for plan in plans if not plan.ok]
+    if flagged:
+        print(f"✗ {len(flagged)} of {len(plans)} queries scan or sort without an index")
+        raise SystemExit(1)
+    print(f"✓ All {len(plans)} queries use an index")
+
+
+@click.command("bench-passwords")
+@with_appcontext
+@click.option('--logins', default=200, show_default=True, help='Password checks to run.')
+@click.option('--concurrency', type=int, help='Simultaneous logins [default: 2 per worker].')
+def bench_passwords(logins, concurrency):
+    """Measure login throughput of the password hashing pool"""
+    result = password_hasher.benchmark(passwords, logins, concurrency)
+    print(f"{result['method']}, {result['workers']} worker(s), {result['concurrency']} concurrent")
+    print(f"✓ {result['logins']} logins in {result['seconds']:.2f}s: "
+          f"{result['logins_per_sec']:.1f}/s, {result['logins_per_sec_per_core']:.1f}/s per core")
+    if result['rejected']:
+        print(f"✗ {result['rejected']} rejected by the queue limit (PASSWORD_HASH_MAX_QUEUE)")
+
+
+@click.command("sqlite-stress")
+@with_appcontext
+@click.option('--processes', default=8, show_default=True, help='Concurrent writer processes.')
+@click.option('--transactions', default=200, show_default=True, help='Transactions per process.')
+@click.option('--path', help='Scratch database to hammer; it is deleted first '
+                           '[default: instance/stress.sqlite3].')
+def sqlite_stress(processes, transactions, path):
+    """Compare concurrent write throughput with SQLite defaults and with the tuned settings"""
+    path = path or os.path.join(current_app.instance_path, 'stress.sqlite3')
+    for tuned in (False, True):
+        result = sqlite_tuning.stress(path, processes, transactions, tuned)
+        print(f"{'tuned' if tuned else 'default':>8}: {result['committed']} committed, "
+              f"{result['failed']} locked, {result['commits_per_sec']:.0f} commits/s")
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+@click.command("profile-startup")
+@with_appcontext
+@click.option('--workers', default=4, show_default=True, help='Workers to fork from this process.')
+def profile_startup(workers):
+    """Report cold start time and per-worker memory with and without preloading"""
+    from she.backend.services import startup_profile
+
+    cold = startup_profile.cold_start(cwd=basedir)
+    print(f"cold start: import {cold['import_seconds'] * 1000:.0f} ms, "
+          f"create_app {cold['create_seconds'] * 1000:.0f} ms, "
+          f"process {cold['process_seconds'] * 1000:.0f} ms, max RSS {cold['max_rss_kib'] / 1024:.1f} MiB, "
+          f"{cold['modules']} modules")
+    print(f"heavy modules at startup: {', '.join(cold['heavy_modules']) or 'none'}")
+
+    reports = startup_profile.forked_workers(current_app._get_current_object(), workers)
+    for number, report in enumerate(reports, 1):
+        print(f"preloaded worker {number}: RSS {report['rss_kib'] / 1024:.1f} MiB, "
+              f"shared {report['shared_kib'] / 1024:.1f} MiB, private {report['private_kib'] / 1024:.1f} MiB")
+    if reports:
+        private = sum(report['private_kib'] for report in reports) / len(reports)
+        print(f"✓ each preloaded worker costs ~{private / 1024:.1f} MiB private "
+              f"vs ~{cold['max_rss_kib'] / 1024:.1f} MiB for a worker that loads the app itself")
+
+
+@click.command("warm-recommendations")
+@with_appcontext
+def warm_recommendations():
+    """Score every learner against all courses and jobs and cache their picks"""
+    learners = [(user.id, profile_document(user)) for user in db.session.query(
+        User.id, User.interests, User.education, User.skill_level, User.location)
+        .filter(User.role == 'women')]
+    for kind in ('courses', 'jobs'):
+        started = time.perf_counter()
+        done = recommender.warm(kind, learners)
+        if recommender.available is False:
+            print("✗ NumPy is not installed")
+            raise SystemExit(1)
+        elapsed = time.perf_counter() - started
+        print(f"✓ {kind}: {done} learner(s) in {elapsed:.2f}s "
+              f"({elapsed * 1000 / max(done, 1):.3f} ms each)")
+
+
+@click.command("match-mentors")
+@with_appcontext
+@click.option('--batch-size', default=2048, show_default=True, help='Learners scored per matrix product.')
+def match_mentors(batch_size):
+    """Suggest mentors to every learner without one, within mentor capacity (run nightly)"""
+    from she.backend.services import mentor_matching
+
+    started = time.perf_counter()
+    active = db.session.query(Mentorship.mentee_id, Mentorship.mentor_id).filter(
+        Mentorship.status.in_(ACTIVE_MENTORSHIP_STATUSES)).all()
+    load = {}
+    for _, mentor_id in active:
+        load[mentor_id] = load.get(mentor_id, 0) + 1
+    mentored = {mentee_id for mentee_id, _ in active}
+    capacity = current_app.config['MENTOR_CAPACITY']
+
+    mentors = [(mentor.id, document(mentor.expertise), mentor.experience_years,
+                capacity - load.get(mentor.id, 0))
+               for mentor in db.session.query(User.id, User.expertise, User.experience_years)
+               .filter(User.role == 'mentor')]
+    mentees = [(user.id, document(user.interests), mentor_matching.level(user.skill_level))
+               for user in db.session.query(User.id, User.interests, User.skill_level)
+               .filter(User.role == 'women') if user.id not in mentored]
+    requested = db.session.query(Mentorship.mentee_id, Mentorship.mentor_id).all()
+    loaded = time.perf_counter()
+
+    try:
+        matches = mentor_matching.match(mentees, mentors, exclude=requested,
+                                        suggestions=current_app.config['MENTOR_SUGGESTIONS'],
+                                        batch_size=batch_size)
+    except ImportError:
+        print("✗ NumPy is not installed")
+        raise SystemExit(1)
+    matched = time.perf_counter()
+
+    created_at = datetime.utcnow()
+    rows = [{'mentee_id': mentee_id, 'mentor_id': mentor_id, 'rank': rank, 'score': score,
+             'assigned': assigned, 'created_at': created_at}
+            for mentee_id, picks in matches.items()
+            for rank, (mentor_id, score, assigned) in enumerate(picks)]
+    # Swap the whole table in one transaction; readers see the old or the new run
+    MentorMatch.query.delete()
+    if rows:
+        db.session.execute(insert(MentorMatch), rows)
+    db.session.commit()
+    done = time.perf_counter()
+
+    assigned = sum(1 for picks in matches.values() if picks[0][2])
+    print(f"✓ {len(mentees)} learner(s), {len(mentors)} mentor(s): {assigned} assigned, "
+          f"{len(matches) - assigned} with suggestions only, {len(rows)} suggestion(s)")
+    print(f"  load {loaded - started:.2f}s, match {matched - loaded:.2f}s, write {done - matched:.2f}s")
+
+
+@click.command("rank-applicants")
+@with_appcontext
+@click.option('--all', 'rescore', is_flag=True, help='Rescore every application, not just unscored ones.')
+def rank_applicants(rescore):
+    """Score applications against their job's requirements, one batch per job"""
+    started = time.perf_counter()
+    jobs = Job.query.filter(Job.applications_count > 0).all()
+    scored = 0
+    for job in jobs:
+        scored += job.rank_applications(rescore=rescore)
+        db.session.commit()
+    print(f"✓ Scored {scored} application(s) across {len(jobs)} job(s) "
+          f"in {time.perf_counter() - started:.2f}s")
+
+
+@click.command("seed")
+@with_appcontext
+@click.option('--users', default=1000, show_default=True, help='Users: 5% recruiters, 10% mentors, the rest learners.')
+@click.option('--jobs', default=100, show_default=True)
+@click.option('--courses', default=50, show_default=True)
+@click.option('--applications', default=5000, show_default=True, help='Spread evenly over learners.')
+@click.option('--mentorships', type=int, help='Mentorship requests (default: one per five learners).')
+@click.option('--enrollments', type=int, help='Course enrollments (default: two per learner).')
+@click.option('--seed', 'random_seed', default=1, show_default=True, help='The same seed gives the same data.')
+@click.option('--reset', is_flag=True, help='Drop and recreate every table first.')
+@click.option('--snapshot', type=click.Path(dir_okay=False), help='Also save a compact copy of the database here.')
+def seed(users, jobs, courses, applications, mentorships, enrollments, random_seed, reset, snapshot):
+    """Fill an empty database with deterministic synthetic data for scale testing"""
+    from she.backend.services import job_search, seed_data
+
+    sqlite = db.engine.dialect.name == 'sqlite'
+    if reset:
+        db.drop_all()
+        if sqlite:
+            # Not part of the metadata, so drop_all leaves it behind
+            with db.engine.begin() as connection:
+                connection.exec_driver_sql(f'DROP TABLE IF EXISTS {job_search.FTS_TABLE}')
+    db.create_all()
+    db.session.remove()
+    with db.engine.connect() as connection:
+        populated = seed_data.populated_tables(connection)
+    if populated:
+        # e.g. the sample courses from `flask init-db`
+        print(f"✗ The database already has {', '.join(populated)}; pass --reset to replace everything")
+        raise SystemExit(1)
+
+    def progress(table, count, seconds):
+        print(f"  {table:>16}: {count:>9} in {seconds:6.2f}s")
+
+    started = time.perf_counter()
+    with db.engine.connect() as connection:
+        seeder = seed_data.Seeder(connection, db.metadata, seed=random_seed,
+                                  password_hash=passwords.hash('password'), progress=progress)
+        counts = seeder.run(users=users, jobs=jobs, courses=courses, applications=applications,
+                            mentorships=mentorships, enrollments=enrollments)
+    # The rows went straight to the driver, so no cached page or list saw them change
+    for table in counts:
+        cache.mark(db.session, table)
+    db.session.commit()
+    print(f"✓ Seeded {sum(counts.values())} row(s) in {time.perf_counter() - started:.1f}s; "
+          f"every password is 'password'")
+
+    if snapshot:
+        if not sqlite:
+            print("✗ Snapshots need a SQLite database")
+            raise SystemExit(1)
+        seed_data.snapshot(db.engine.url.database, snapshot)
+        print(f"✓ Snapshot written to {snapshot} ({os.path.getsize(snapshot) / 2 ** 20:.1f} MiB)")
+
+
+@click.command("bench-routes")
+@with_appcontext
+@click.option('--snapshot', type=click.Path(exists=True, dir_okay=False),
+              help='Seeded database to copy (see flask seed --snapshot) [default: this app\'s database].')
+@click.option('--rounds', default=100, show_default=True, help='Timed requests per route.')
+@click.option('--warmup', default=10, show_default=True, help='Untimed requests per route first.')
+@click.option('--route', 'only', multiple=True, help='Only this route (repeatable), e.g. "jobs search".')
+@click.option('--password', default='password', show_default=True, help='Password of the seeded accounts.')
+@click.option('--output', type=click.Path(dir_okay=False), help='Write the results here as JSON.')
+@click.option('--baseline', type=click.Path(dir_okay=False), help='Compare against these stored results.')
+@click.option('--save-baseline', is_flag=True, help='Store the results as the new --baseline.')
+@click.option('--tolerance', default=0.5, show_default=True,
+              help='Growth of p95 latency and peak memory allowed before it counts as a regression.')
+def bench_routes(snapshot, rounds, warmup, only, password, output, baseline, save_baseline, tolerance):
+    """Time the main routes against a copy of a seeded database and catch regressions"""
+    from she.backend.services import route_bench, seed_data
+
+    if db.engine.dialect.name != 'sqlite':
+        print("✗ The benchmark copies a SQLite database")
+        raise SystemExit(1)
+    if save_baseline and not baseline:
+        print("✗ --save-baseline needs --baseline PATH")
+        raise SystemExit(1)
+
+    # A scratch copy, so update-progress and rescoring don't touch the real data,
+    # with its own shared cache file so its entries can't leak into the app's
+    scratch = os.path.join(current_app.instance_path, 'bench.sqlite3')
+    scratch_cache = os.path.join(current_app.instance_path, 'bench-cache.sqlite3')
+    for path in (scratch, scratch_cache):
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    seed_data.restore(snapshot or db.engine.url.database, scratch)
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{scratch}', 'CACHE_SHARED_PATH': scratch_cache,
+                      'TESTING': True, 'QUERY_BUDGET_ENABLED': True})
+    try:
+        results = route_bench.run(app, password, rounds=rounds, warmup=warmup, only=set(only))
+    except route_bench.BenchmarkError as error:
+        print(f"✗ {error}")
+        raise SystemExit(1)
+
+    meta = results['meta']
+    print(f"{meta['users']} users, {meta['jobs']} jobs, {meta['applications']} applications; "
+          f"{rounds} rounds per route")
+    print(f"{'route':>22}  {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>7} {'peak KiB':>9}")
+    for name, route_result in results['routes'].items():
+        print(f"{name:>22}  {route_result['p50_ms']:8.2f} {route_result['p95_ms']:8.2f} "
+              f"{route_result['p99_ms']:8.2f} {route_result['queries']:7d} {route_result['peak_kib']:9.1f}")
+    if output:
+        route_bench.save(results, output)
+        print(f"✓ Results written to {output}")
+
+    if baseline and save_baseline:
+        route_bench.save(results, baseline)
+        print(f"✓ Baseline saved to {baseline}")
+    elif baseline:
+        if not os.path.exists(baseline):
+            print(f"✗ No baseline at {baseline}; create one with --save-baseline")
+            raise SystemExit(1)
+        regressions = route_bench.compare(results, route_bench.load(baseline), tolerance)
+        for name, metric, before, after in regressions:
+            print(f"✗ {name}: {metric} {before} -> {after}")
+        if regressions:
+            print(f"✗ {len(regressions)} regression(s) against {baseline}")
+            raise SystemExit(1)
+        print(f"✓ No regressions against {baseline}")
+
+
+@click.command("build-assets")
+@with_appcontext
+def build_assets():
+    """Minify, fingerprint and precompress the CSS/JS under static/src"""
+    manifest = assets.build()
+    for name, filename in sorted(manifest.items()):
+        path = os.path.join(assets.output_dir, filename)
+        variants = [f"{suffix} {os.path.getsize(path + suffix)} B" for suffix in ('.gz', '.br')
+                    if os.path.exists(path + suffix)]
+        print(f"{name:>30} -> {filename}  {os.path.getsize(path)} B  {'  '.join(variants)}")
+    print(f"✓ Built {len(manifest)} asset(s) into {assets.output_dir}")
+
+
+@click.group("templates")
+def templates_cli():
+    """Manage compiled Jinja templates"""
+
+
+@templates_cli.command("compile")
+@with_appcontext
+@click.option('--clear', is_flag=True, help='Drop the bytecode cache first and compile from source.')
+def compile_templates(clear):
+    """Compile every template into the bytecode cache"""
+    if clear:
+        templates.clear(current_app)
+    timings = templates.compile_all(current_app)
+    for name, seconds in sorted(timings, key=lambda timing: -timing[1]):
+        print(f"{seconds * 1000:8.1f} ms  {name}")
+    cache_dir = current_app.config['TEMPLATE_BYTECODE_CACHE'] or 'memory only'
+    print(f"✓ Compiled {len(timings)} template(s) in {sum(t for _, t in timings) * 1000:.0f} ms "
+          f"({cache_dir})")
+
+
+COMMANDS = (init_db, upgrade_db, sync_tags, reconcile_counters, index_advisor_command,
+            bench_passwords, sqlite_stress, profile_startup, build_assets, templates_cli,
+            warm_recommendations, match_mentors, rank_applicants, seed, bench_routes)
+
+
+# ── APPLICATION FACTORY ──────────────────────────────────────────────────────
+
+def create_app(config=None):
+    """Build the app. `config` is a mapping or an object/import path of settings.
+
+    Nothing heavy happens here: ReportLab is only imported by the
+    certificate worker and no database connection is opened, so the app
+    can be created once in a gunicorn master (--preload) and shared
+    copy-on-write by every worker.
+    """
+    app = Flask(
+        __name__,
+        template_folder=os.path.join(basedir, 'she', 'frontend', 'templates'),
+        static_folder=os.path.join(basedir, 'she', 'frontend', 'static')
+    )
+    app.config.from_mapping(DEFAULT_CONFIG)
+    if isinstance(config, Mapping):
+        app.config.from_mapping(config)
+    elif config is not None:
+        app.config.from_object(config)
+
+    db.init_app(app)
+    login_manager.init_app(app)
+    sqlite_settings.init_app(app, db)
+    query_counter.init_app(app)
+    cache.init_app(app)
+    identity_cache.init_app(app)
+    recommender.init_app(app)
+    assets.init_app(app)
+    templates.init_app(app)
+    http_cache.init_app(app)
+    fragments.init_app(app)
+    # Password hashes are computed in a bounded process pool, off the request threads
+    passwords.init_app(app)
+
+    with app.app_context():
+        _engines.update(db.engines.values())
+
+    for rule, view, options in _routes:
+        app.add_url_rule(rule, view_func=view, **options)
+    app.register_error_handler(HashingBusy, hashing_busy)
+
+    # Blueprints hold the job listing/import pages and certificate downloads,
+    # with their `flask jobs` and `flask certificates` commands
+    for blueprint in (jobs_bp, certificates_bp):
+        app.register_blueprint(blueprint)
+
+    if app.config['TEMPLATE_PRELOAD']:
+        templates.compile_all(app)
+
+    for command in COMMANDS:
+        app.cli.add_command(command)
+    return app
+
+
 if __name__ == '__main__':
+    app = create_app()
     with app.app_context():
         db.create_all()
     app.run(debug=True)
\ No newline at end of file
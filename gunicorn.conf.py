@@ -0,0 +1,22 @@
+# gunicorn -c gunicorn.conf.py 'app:create_app()'
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# Build the app once in the master; workers are forked from it and share its
+# memory copy-on-write instead of each importing and configuring everything
+preload_app = True
+
+
+def when_ready(server):
+    # Index the recommendable courses and jobs once, here, so every worker
+    # starts with them instead of building its own
+    app = server.app.wsgi()
+    with app.app_context():
+        app.extensions['recommender'].load_all()
+    # Move everything created so far out of the collector's reach, so garbage
+    # collection in a worker doesn't write to (and un-share) inherited pages
+    gc.freeze()
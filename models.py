@@ -1,11 +1,25 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from datetime import datetime
+from sqlalchemy import update
+import logging
+from she.backend.services import applicant_ranking, job_search
+from she.backend.services.password_hasher import passwords
+from she.backend.services.tags import TAG_COLUMNS, parse_tags
 
 db = SQLAlchemy()
 
+logger = logging.getLogger(__name__)
+
+APPLICATION_STATUSES = ('pending', 'reviewed', 'shortlisted', 'rejected')
+# Mentorships that take up one of the mentor's places
+ACTIVE_MENTORSHIP_STATUSES = ('pending', 'accepted')
+
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('ix_users_role', 'role'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -38,14 +52,40 @@ class User(UserMixin, db.Model):
     progress = db.relationship('Progress', backref='user', lazy=True)
     certificates = db.relationship('Certificate', backref='user', lazy=True)
     applications = db.relationship('Application', backref='user', lazy=True)
+    tag_links = db.relationship('UserTag', backref='user', lazy=True, cascade='all, delete-orphan')
     
     def set_password(self, password):
-        from werkzeug.security import generate_password_hash
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = passwords.hash(password)
     
     def check_password(self, password):
-        from werkzeug.security import check_password_hash
-        return check_password_hash(self.password_hash, password)
+        return passwords.verify(self.password_hash, password)
+    
+    def rehash_password(self, password):
+        """Re-hash with the configured method after a successful login; True if changed"""
+        if not passwords.needs_rehash(self.password_hash):
+            return False
+        self.set_password(password)
+        return True
+    
+    def sync_tags(self):
+        """Mirror the free-text expertise/interests/completed_courses columns into user_tags"""
+        wanted = {(kind, name) for kind, names in self.tag_sets().items() for name in names}
+        current = {(link.kind, link.tag.name): link for link in self.tag_links}
+        for key in current.keys() - wanted:
+            self.tag_links.remove(current[key])
+    
+        missing = sorted(wanted - current.keys())
+        names = {name for _, name in missing}
+        tags = {tag.name: tag for tag in Tag.query.filter(Tag.name.in_(names))} if names else {}
+        for kind, name in missing:
+            if name not in tags:
+                tags[name] = Tag(name=name)
+            self.tag_links.append(UserTag(tag=tags[name], kind=kind))
+    
+    def tag_sets(self):
+        """Normalized tags per kind, parsed from the profile columns"""
+        return {kind: parse_tags(getattr(self, column))
+                for kind, column in TAG_COLUMNS.items()}
 
 class Course(db.Model):
     __tablename__ = 'courses'
@@ -67,6 +107,10 @@ class Course(db.Model):
 
 class Job(db.Model):
     __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_active_posted', 'is_active', 'posted_at'),
+        db.Index('ix_jobs_recruiter', 'recruiter_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -79,11 +123,79 @@ class Job(db.Model):
     posted_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     
+    # Application counters, kept current by record_application/move_application
+    # so recruiter pages never have to load every Application just to count it.
+    applications_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    pending_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    reviewed_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    shortlisted_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rejected_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
     # Relationships
     applications = db.relationship('Application', backref='job', lazy=True)
 
+    def record_application(self, status='pending'):
+        """Count a newly submitted application"""
+        self.applications_count = Job.applications_count + 1
+        self._bump_status(status, 1)
+    
+    def move_application(self, old_status, new_status):
+        """Move one application between status counters"""
+        if old_status == new_status:
+            return
+        self._bump_status(old_status, -1)
+        self._bump_status(new_status, 1)
+    
+    def _bump_status(self, status, delta):
+        # Legacy statuses have no counter; reconcile-counters leaves them
+        # in applications_count only, so there is nothing to move here
+        if status not in APPLICATION_STATUSES:
+            return
+        # Increment in SQL so concurrent requests can't lose updates
+        column = getattr(Job, f'{status}_count')
+        setattr(self, column.key, column + delta)
+    
+    def rank_applications(self, rescore=False):
+        """Score this job's applications against its requirements, in one batch.
+        
+        Runs only when some application has no score yet (or with
+        `rescore`), and then scores all of them together so scores stay
+        comparable. Returns the number of applications scored; the caller
+        commits.
+        """
+        if not rescore and db.session.query(Application.id).filter(
+                Application.job_id == self.id, Application.match_score.is_(None)).first() is None:
+            return 0
+        
+        applicants = (db.session.query(Application.id, User.id.label('user_id'), User.interests, User.education,
+                                       User.skill_level, User.completed_courses)
+                      .join(User, Application.user_id == User.id)
+                      .filter(Application.job_id == self.id).all())
+        completed = {}
+        for user_id, title in (db.session.query(Progress.user_id, Course.title)
+                               .join(Course, Progress.course_id == Course.id)
+                               .join(Application, Application.user_id == Progress.user_id)
+                               .filter(Application.job_id == self.id, Progress.completed.is_(True))):
+            completed.setdefault(user_id, []).append(title)
+        
+        try:
+            scores = applicant_ranking.score(
+                applicant_ranking.requirements(self),
+                [(row.id, applicant_ranking.profile(row, completed.get(row.user_id, ()))) for row in applicants])
+        except ImportError:
+            logger.warning('NumPy is not installed, applicants are listed unranked')
+            scores = {row.id: 0.0 for row in applicants}
+        if scores:
+            db.session.execute(update(Application), [
+                {'id': application_id, 'match_score': value} for application_id, value in scores.items()])
+        return len(scores)
+
 class Application(db.Model):
     __tablename__ = 'applications'
+    __table_args__ = (
+        db.Index('ix_applications_user_job', 'user_id', 'job_id'),
+        db.Index('ix_applications_job_score', 'job_id', 'match_score', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
@@ -92,9 +204,15 @@ class Application(db.Model):
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
     resume = db.Column(db.String(200))
     cover_letter = db.Column(db.Text)
+    # Fit with the job's requirements (0-1), set by Job.rank_applications; NULL until scored
+    match_score = db.Column(db.Float)
 
 class Mentorship(db.Model):
     __tablename__ = 'mentorships'
+    __table_args__ = (
+        db.Index('ix_mentorships_mentor_status', 'mentor_id', 'status'),
+        db.Index('ix_mentorships_mentee_mentor', 'mentee_id', 'mentor_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     mentee_id = db.Column(db.Integer, db.ForeignKey('users.id'))
@@ -105,8 +223,29 @@ class Mentorship(db.Model):
     feedback = db.Column(db.Text)
     session_notes = db.Column(db.Text)
 
+class MentorMatch(db.Model):
+    __tablename__ = 'mentor_matches'
+    __table_args__ = (
+        db.Index('ix_mentor_matches_mentee_rank', 'mentee_id', 'rank'),
+        # Places reserved with a mentor, counted against their capacity
+        db.Index('ix_mentor_matches_mentor_assigned', 'mentor_id', 'assigned'),
+    )
+    
+    # Rewritten as a whole by `flask match-mentors`; `assigned` marks the mentor
+    # the run reserved a place with, ranked first
+    id = db.Column(db.Integer, primary_key=True)
+    mentee_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    mentor_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    rank = db.Column(db.Integer, nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    assigned = db.Column(db.Boolean, nullable=False, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
 class Progress(db.Model):
     __tablename__ = 'progress'
+    __table_args__ = (
+        db.Index('ix_progress_user_course', 'user_id', 'course_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
@@ -120,10 +259,55 @@ class Progress(db.Model):
 
 class Certificate(db.Model):
     __tablename__ = 'certificates'
+    __table_args__ = (
+        # Downloads look up the requesting learner's certificate by its URL
+        db.Index('ix_certificates_user_download', 'user_id', 'download_url'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
     course_id = db.Column(db.Integer, db.ForeignKey('courses.id'))
     certificate_number = db.Column(db.String(100), unique=True)
     issued_date = db.Column(db.DateTime, default=datetime.utcnow)
-    download_url = db.Column(db.String(200))
\ No newline at end of file
+    download_url = db.Column(db.String(200))
+
+class CertificateJob(db.Model):
+    __tablename__ = 'certificate_jobs'
+    __table_args__ = (
+        db.Index('ix_certificate_jobs_due', 'status', 'run_after'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    certificate_id = db.Column(db.Integer, db.ForeignKey('certificates.id'), nullable=False, unique=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    run_after = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = db.Column(db.String(100))
+    locked_until = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    
+    certificate = db.relationship('Certificate', backref=db.backref('job', uselist=False))
+
+class Tag(db.Model):
+    __tablename__ = 'tags'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+
+class UserTag(db.Model):
+    __tablename__ = 'user_tags'
+    __table_args__ = (
+        db.Index('ix_user_tags_tag_kind', 'tag_id', 'kind'),
+    )
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tags.id'), primary_key=True)
+    kind = db.Column(db.String(20), primary_key=True)  # expertise, interest, course
+    
+    tag = db.relationship('Tag', lazy='joined')
+    # .user backref comes from User.tag_links
+
+# Full-text index over jobs, created alongside the tables by db.create_all()
+job_search.register(db.metadata)
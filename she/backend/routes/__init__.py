@@ -0,0 +1,9 @@
+# This file makes the routes directory a Python package
+from flask import Blueprint
+
+# Create blueprints for different route modules
+jobs_bp = Blueprint('jobs', __name__, cli_group='jobs')
+certificates_bp = Blueprint('certificates', __name__, cli_group='certificates')
+
+# Import routes to register them with blueprints
+from . import jobs, certificates
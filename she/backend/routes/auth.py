@@ -1,132 +0,0 @@
-from flask import render_template, redirect, url_for, flash, request
-from flask_login import login_user, logout_user, current_user
-from models import User, db
-from . import auth_bp
-import re
-
-def is_valid_email(email):
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
-
-@auth_bp.route('/login', methods=['GET', 'POST'])
-def login():
-    if current_user.is_authenticated:
-        return redirect(url_for('dashboard.index'))
-    
-    if request.method == 'POST':
-        email = request.form.get('email', '').strip()
-        password = request.form.get('password', '')
-        
-        if not email or not password:
-            flash('Please fill in all fields', 'error')
-            return render_template('login.html')
-        
-        if not is_valid_email(email):
-            flash('Please enter a valid email address', 'error')
-            return render_template('login.html')
-        
-        user = User.query.filter_by(email=email).first()
-        
-        if user and user.check_password(password):
-            login_user(user)
-            flash('Login successful!', 'success')
-            return redirect(url_for('dashboard.index'))
-        else:
-            flash('Invalid email or password', 'error')
-            return render_template('login.html')
-    
-    return render_template('login.html')
-
-@auth_bp.route('/signup', methods=['GET', 'POST'])
-def signup():
-    if current_user.is_authenticated:
-        return redirect(url_for('dashboard.index'))
-    
-    if request.method == 'POST':
-        name = request.form.get('name', '').strip()
-        email = request.form.get('email', '').strip()
-        password = request.form.get('password', '')
-        confirm_password = request.form.get('confirm_password', '')
-        phone = request.form.get('phone', '').strip()
-        location = request.form.get('location', '').strip()
-        role = request.form.get('role', 'women')
-        
-        if not all([name, email, password, confirm_password, phone, location]):
-            flash('Please fill in all fields', 'error')
-            return render_template('signup.html')
-        
-        if not is_valid_email(email):
-            flash('Please enter a valid email address', 'error')
-            return render_template('signup.html')
-        
-        if password != confirm_password:
-            flash('Passwords do not match', 'error')
-            return render_template('signup.html')
-        
-        if len(password) < 6:
-            flash('Password must be at least 6 characters long', 'error')
-            return render_template('signup.html')
-        
-        if User.query.filter_by(email=email).first():
-            flash('Email already registered. Please login.', 'error')
-            return render_template('signup.html')
-        
-        new_user = User(
-            name=name,
-            email=email,
-            phone=phone,
-            location=location,
-            role=role
-        )
-        new_user.set_password(password)
-        
-        # Additional fields based on role
-        if role == 'mentor':
-            new_user.expertise = request.form.get('expertise', '')
-            new_user.experience_years = int(request.form.get('experience_years', 0))
-        elif role == 'recruiter':
-            new_user.company = request.form.get('company', '')
-            new_user.position = request.form.get('position', '')
-        
-        try:
-            db.session.add(new_user)
-            db.session.commit()
-            flash('Registration successful! Please login.', 'success')
-            return redirect(url_for('auth.login'))
-        except Exception as e:
-            db.session.rollback()
-            flash('An error occurred. Please try again.', 'error')
-            return render_template('signup.html')
-    
-    return render_template('signup.html')
-
-@auth_bp.route('/forgot-password', methods=['GET', 'POST'])
-def forgot_password():
-    if request.method == 'POST':
-        email = request.form.get('email', '').strip()
-        
-        if not email:
-            flash('Please enter your email address', 'error')
-            return render_template('forgot_password.html')
-        
-        if not is_valid_email(email):
-            flash('Please enter a valid email address', 'error')
-            return render_template('forgot_password.html')
-        
-        user = User.query.filter_by(email=email).first()
-        
-        if user:
-            # In a real application, you would send an email here
-            flash('Password reset instructions have been sent to your email', 'success')
-        else:
-            flash('If this email is registered, you will receive reset instructions', 'info')
-        
-        return redirect(url_for('auth.login'))
-    
-    return render_template('forgot_password.html')
-
-@auth_bp.route('/logout')
-def logout():
-    logout_user()
-    flash('You have been logged out', 'info')
-    return redirect(url_for('main.index'))
\ No newline at end of file
@@ -0,0 +1,171 @@
+from flask import current_app, request, send_file, Response, abort, stream_with_context
+from flask_login import login_required, current_user
+from models import User, Course, Certificate, CertificateJob, db
+from she.backend.services import bulk_certificates, certificate_queue
+from she.backend.services.certificate_store import CertificateStore
+from . import certificates_bp
+import click
+import os
+
+def get_queue():
+    config = current_app.config
+    return certificate_queue.CertificateQueue(
+        db.session, CertificateJob,
+        max_attempts=config.get('CERTIFICATE_MAX_ATTEMPTS', 5),
+        retry_delay=config.get('CERTIFICATE_RETRY_DELAY', 30),
+        lease=config.get('CERTIFICATE_LEASE', 300),
+    )
+
+def get_store():
+    root = current_app.config.get('CERTIFICATE_STORAGE') or os.path.join(
+        current_app.instance_path, 'certificates')
+    return CertificateStore(root)
+
+def download_url(key):
+    # Built by hand because the worker has no request to build URLs from
+    return f"/certificates/{key}.pdf"
+
+def render_certificate(job):
+    """Store the PDF for a queued certificate and record where to download it"""
+    # ReportLab is only needed by the worker, not by the web processes
+    from she.backend.services.certificate_generator import FastCertificateGenerator
+
+    certificate = job.certificate
+    pdf = FastCertificateGenerator(output_dir=None).render(
+        certificate.user.name, certificate.course.title, certificate.issued_date,
+        certificate.certificate_number)
+    certificate.download_url = download_url(get_store().put(pdf))
+
+@certificates_bp.route('/certificates/<key>.pdf')
+@login_required
+def download_certificate(key):
+    """Serve a stored certificate to the learner it was issued to.
+
+    The key is the SHA-256 of the file. It names the file but is not a
+    secret, so the owner is checked on every request and only the
+    browser may cache the response; the content never changes, so that
+    copy never expires. With CERTIFICATE_SENDFILE set to
+    'x-accel-redirect' (nginx) or 'x-sendfile' (Apache, lighttpd) the
+    front-end server sends the bytes instead of us.
+    """
+    store = get_store()
+    if not store.is_key(key):
+        abort(404)
+    owned = db.session.query(Certificate.id).filter_by(
+        user_id=current_user.id, download_url=download_url(key)).first()
+    if owned is None:
+        abort(404)
+
+    if request.if_none_match.contains(key):
+        response = Response(status=304)
+    elif not store.exists(key):
+        abort(404)
+    else:
+        mode = current_app.config.get('CERTIFICATE_SENDFILE')
+        if mode == 'x-accel-redirect':
+            prefix = current_app.config.get('CERTIFICATE_ACCEL_PREFIX', '/protected-certificates/')
+            response = Response(mimetype='application/pdf', headers={
+                'X-Accel-Redirect': prefix.rstrip('/') + '/' + store.relative_path(key)})
+        elif mode == 'x-sendfile':
+            response = Response(mimetype='application/pdf', headers={
+                'X-Sendfile': os.path.abspath(store.path(key))})
+        else:
+            response = send_file(store.path(key), mimetype='application/pdf', etag=False,
+                                 conditional=True)
+        response.headers['Content-Disposition'] = 'inline; filename=certificate.pdf'
+
+    response.set_etag(key)
+    response.headers['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return response
+
+def course_completions(course_id):
+    """Issued certificates of a course as render inputs, oldest first"""
+    rows = db.session.query(
+        Certificate.certificate_number, Certificate.user_id, Certificate.issued_date,
+        User.name, Course.title,
+    ).join(User, Certificate.user_id == User.id).join(
+        Course, Certificate.course_id == Course.id,
+    ).filter(Certificate.course_id == course_id).order_by(Certificate.id).yield_per(1000)
+    for number, user_id, issued_date, user_name, course_name in rows:
+        yield {'certificate_number': number, 'user_id': user_id, 'user_name': user_name,
+               'course_name': course_name, 'completion_date': issued_date}
+
+@certificates_bp.route('/courses/<int:course_id>/certificates.zip')
+@login_required
+def download_course_certificates(course_id):
+    course = db.session.get(Course, course_id) or abort(404)
+    if current_user.role != 'mentor' or course.mentor_id != current_user.id:
+        abort(403)
+
+    chunks = bulk_certificates.stream_zip(
+        course_completions(course_id),
+        workers=current_app.config.get('CERTIFICATE_BULK_WORKERS'),
+        chunk_size=current_app.config.get('CERTIFICATE_BULK_CHUNK_SIZE', 64),
+    )
+    return Response(stream_with_context(chunks), mimetype='application/zip', headers={
+        'Content-Disposition': f'attachment; filename=course_{course_id}_certificates.zip',
+    })
+
+@certificates_bp.cli.command('worker')
+@click.option('--once', is_flag=True, help='Exit when no job is due instead of polling.')
+@click.option('--poll', default=1.0, show_default=True, help='Seconds to wait when the queue is empty.')
+@click.option('--max-jobs', type=int, help='Exit after completing this many jobs.')
+def worker(once, poll, max_jobs):
+    """Render queued certificates into PDFs"""
+    done = certificate_queue.work(get_queue(), render_certificate,
+                                  once=once, poll=poll, max_jobs=max_jobs)
+    print(f"✓ Rendered {done} certificate(s)")
+
+@certificates_bp.cli.command('bulk')
+@click.argument('course_id', type=int)
+@click.argument('output', type=click.Path(dir_okay=False))
+@click.option('--workers', type=int, help='Render processes [default: one per core].')
+@click.option('--chunk-size', default=64, show_default=True, help='Certificates per pool task.')
+@click.option('--restart', is_flag=True, help='Start over instead of resuming an interrupted run.')
+def bulk(course_id, output, workers, chunk_size, restart):
+    """Render every certificate of a course into a ZIP archive"""
+    total = Certificate.query.filter_by(course_id=course_id).count()
+
+    def progress(done, elapsed):
+        print(f"  {done}/{total} ({done * 100 // max(total, 1)}%)  {done / max(elapsed, 1e-9):.0f}/s")
+
+    count = bulk_certificates.write_zip(output, course_completions(course_id), workers=workers,
+                                        chunk_size=chunk_size, progress=progress, resume=not restart)
+    print(f"✓ Wrote {count} certificate(s) to {output}")
+
+@certificates_bp.cli.command('migrate-storage')
+def migrate_storage():
+    """Move certificates rendered under static/certificates into the content-addressed store"""
+    store, prefix, moved = get_store(), f"{current_app.static_url_path}/certificates/", []
+    for certificate in Certificate.query.filter(Certificate.download_url.startswith(prefix)):
+        path = os.path.join(current_app.static_folder, 'certificates',
+                            certificate.download_url[len(prefix):])
+        if not os.path.exists(path):
+            continue
+        with open(path, 'rb') as f:
+            certificate.download_url = download_url(store.put(f.read()))
+        moved.append(path)
+    db.session.commit()
+    for path in moved:
+        os.remove(path)
+    print(f"✓ Moved {len(moved)} certificate(s) into {store.root}")
+
+@certificates_bp.cli.command('status')
+def status():
+    """Show how many certificate jobs are in each state"""
+    for state, count in get_queue().counts().items():
+        print(f"{state:>8}  {count}")
+
+@certificates_bp.cli.command('retry-failed')
+def retry_failed():
+    """Queue every failed certificate job again"""
+    print(f"✓ Re-queued {get_queue().requeue_failed()} job(s)")
+
+@certificates_bp.cli.command('bench')
+@click.option('--count', default=200, show_default=True, help='Certificates to render per generator.')
+def bench(count):
+    """Compare certificates/sec and PDF size of the story and canvas renderers"""
+    from she.backend.services.certificate_generator import benchmark
+
+    for name, result in benchmark(count).items():
+        print(f"{name:>26}  {result['per_sec']:8.1f} certs/s  {result['bytes']:8.0f} bytes/PDF")
@@ -1,124 +1,104 @@
-from flask import render_template, redirect, url_for, flash, request
+from flask import current_app, render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
-from models import Job, Application, User, db
+from models import Job, User, db
+from sqlalchemy import func
+from she.backend.services.query_budget import query_budget
+from she.backend.services import job_import, job_search
+from she.backend.services.http_cache import conditional, table_version
+from she.backend.services.pagination import KeysetPage, decode_cursor, page_size, paginate
 from . import jobs_bp
-from datetime import datetime
+from contextlib import contextmanager, nullcontext
+import click
+
+def jobs_version():
+    return table_version('jobs', db.session.query(func.count(Job.id), func.max(Job.posted_at))
+                         .filter(Job.is_active.is_(True)))
 
 @jobs_bp.route('/jobs')
 @login_required
+@conditional(jobs_version)
+@query_budget(4)
 def list_jobs():
-    location = request.args.get('location', '')
-    jobs = Job.query.filter_by(is_active=True)
-    
-    if location:
-        jobs = jobs.filter(Job.location.contains(location))
-    
-    jobs = jobs.order_by(Job.posted_at.desc()).all()
-    return render_template('jobs.html', jobs=jobs)
-
-@jobs_bp.route('/job/<int:job_id>')
-@login_required
-def job_detail(job_id):
-    job = Job.query.get_or_404(job_id)
-    has_applied = False
-    
-    if current_user.role == 'women':
-        has_applied = Application.query.filter_by(user_id=current_user.id, job_id=job_id).first() is not None
-    
-    return render_template('job_detail.html', job=job, has_applied=has_applied)
+    q = request.args.get('q', '').strip()
+    location = request.args.get('location', '').strip()
+    hits = {}
+    
+    if (q or location) and job_search.is_available(db.session):
+        # Ranked full-text search; jobs come back in BM25 order and the
+        # cursor is the (bm25 score, id) of the last hit on the page
+        per_page = page_size()
+        cursor = request.args.get('cursor')
+        after = decode_cursor(cursor) if cursor else None
+        hits = job_search.search(db.session, q, location, limit=per_page + 1, after=after)
+        page = KeysetPage.from_rows(list(hits.values()), per_page,
+                                    lambda hit: [-hit.score, hit.job_id])
+        jobs = {job.id: job for job in Job.query.filter(Job.id.in_([hit.job_id for hit in page.items]))}
+        page.items = [jobs[hit.job_id] for hit in page.items if hit.job_id in jobs]
+    else:
+        jobs = Job.query.filter_by(is_active=True)
+        if location:
+            jobs = jobs.filter(Job.location.contains(location))
+        page = paginate(jobs, Job.posted_at, Job.id, descending=True)
+    
+    return render_template('jobs.html', jobs=page.items, page=page, hits=hits, q=q, location=location)
 
-@jobs_bp.route('/apply-job/<int:job_id>', methods=['POST'])
-@login_required
-def apply_job(job_id):
-    if current_user.role != 'women':
-        flash('Only women can apply for jobs', 'error')
-        return redirect(url_for('jobs.job_detail', job_id=job_id))
-    
-    job = Job.query.get_or_404(job_id)
-    
-    # Check if already applied
-    existing = Application.query.filter_by(user_id=current_user.id, job_id=job_id).first()
-    if existing:
-        flash('You have already applied for this job', 'info')
-        return redirect(url_for('jobs.job_detail', job_id=job_id))
-    
-    application = Application(
-        user_id=current_user.id,
-        job_id=job_id,
-        resume=request.form.get('resume', ''),
-        cover_letter=request.form.get('cover_letter', '')
-    )
-    
-    db.session.add(application)
-    db.session.commit()
-    flash('Application submitted successfully!', 'success')
-    return redirect(url_for('jobs.job_detail', job_id=job_id))
+def run_import(stream, file_format, recruiter, **options):
+    """Stream a CSV/JSON upload of postings into the jobs table for `recruiter`"""
+    rows = job_import.read_json(stream) if file_format == 'json' else job_import.read_csv(stream)
+    defaults = {'recruiter_id': recruiter.id, 'company': recruiter.company}
+    search_index = job_search.is_available(db.session)
+    cache = current_app.extensions.get('cache')
 
-# Recruiter routes
-@jobs_bp.route('/post-job', methods=['GET', 'POST'])
-@login_required
-def post_job():
-    if current_user.role != 'recruiter':
-        flash('Access denied', 'error')
-        return redirect(url_for('dashboard.index'))
-    
-    if request.method == 'POST':
-        job = Job(
-            title=request.form.get('title'),
-            description=request.form.get('description'),
-            company=current_user.company,
-            location=request.form.get('location'),
-            requirements=request.form.get('requirements'),
-            salary_range=request.form.get('salary_range'),
-            recruiter_id=current_user.id
-        )
-        db.session.add(job)
-        db.session.commit()
-        flash('Job posted successfully!', 'success')
-        return redirect(url_for('dashboard.index'))
-    
-    return render_template('post_job.html')
+    @contextmanager
+    def import_transaction(session):
+        # The inserts bypass the ORM, so the jobs caches are marked by hand
+        if cache is not None:
+            cache.mark(session, Job.__tablename__)
+        with job_search.deferred_indexing(session) if search_index else nullcontext():
+            yield
 
-@jobs_bp.route('/my-job-listings')
-@login_required
-def my_job_listings():
-    if current_user.role != 'recruiter':
-        flash('Access denied', 'error')
-        return redirect(url_for('dashboard.index'))
-    
-    jobs = Job.query.filter_by(recruiter_id=current_user.id).all()
-    return render_template('my_job_listings.html', jobs=jobs)
+    return job_import.import_jobs(db.session, Job, rows, defaults, wrap_transaction=import_transaction,
+                                  **options)
 
-@jobs_bp.route('/view-applicants/<int:job_id>')
+@jobs_bp.route('/import-jobs', methods=['GET', 'POST'])
 @login_required
-def view_applicants(job_id):
+# One executemany per JOB_IMPORT_BATCH_SIZE rows, up to JOB_IMPORT_MAX_ROWS
+@query_budget(64)
+def import_jobs():
     if current_user.role != 'recruiter':
         flash('Access denied', 'error')
-        return redirect(url_for('dashboard.index'))
-    
-    job = Job.query.get_or_404(job_id)
-    if job.recruiter_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('dashboard.index'))
+        return redirect(url_for('dashboard'))
     
-    applications = Application.query.filter_by(job_id=job_id).all()
-    return render_template('view_applicants.html', job=job, applications=applications)
+    report = None
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        if upload is None or not upload.filename:
+            flash('Please choose a CSV or JSON file', 'error')
+            return render_template('import_jobs.html', report=None)
+        config = current_app.config
+        report = run_import(upload.stream, job_import.detect_format(upload.filename), current_user,
+                            batch_size=config.get('JOB_IMPORT_BATCH_SIZE', 1000),
+                            max_rows=config.get('JOB_IMPORT_MAX_ROWS', 50000))
+    return render_template('import_jobs.html', report=report)
 
-@jobs_bp.route('/update-application/<int:app_id>/<string:status>')
-@login_required
-def update_application(app_id, status):
-    if current_user.role != 'recruiter':
-        flash('Access denied', 'error')
-        return redirect(url_for('dashboard.index'))
-    
-    application = Application.query.get_or_404(app_id)
-    job = Job.query.get(application.job_id)
-    
-    if job.recruiter_id != current_user.id:
-        flash('Access denied', 'error')
-        return redirect(url_for('dashboard.index'))
-    
-    application.status = status
-    db.session.commit()
-    flash(f'Application status updated to {status}', 'success')
-    return redirect(url_for('jobs.view_applicants', job_id=job.id))
\ No newline at end of file
+@jobs_bp.cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False, allow_dash=True))
+@click.option('--recruiter', 'email', required=True, help='Email of the recruiter posting the jobs.')
+@click.option('--format', 'file_format', type=click.Choice(job_import.FORMATS),
+              help='File format; guessed from the extension by default.')
+@click.option('--batch-size', default=1000, show_default=True, help='Rows per executemany.')
+def import_jobs_command(path, email, file_format, batch_size):
+    """Bulk-load job postings from a CSV or JSON file"""
+    recruiter = User.query.filter_by(email=email, role='recruiter').first()
+    if recruiter is None:
+        print(f"✗ No recruiter with email {email}")
+        raise SystemExit(1)
+    with click.open_file(path, 'rb') as stream:
+        report = run_import(stream, file_format or job_import.detect_format(path), recruiter,
+                            batch_size=batch_size)
+    for number, message in report.errors:
+        print(f"  {'row ' + str(number) if number is not None else 'file'}: {message}")
+    if report.failed > len(report.errors):
+        print(f"  … and {report.failed - len(report.errors)} more")
+    print(f"✓ Imported {report.inserted} job(s), {report.failed} rejected, "
+          f"in {report.seconds:.2f}s ({report.rate:.0f} rows/s)")
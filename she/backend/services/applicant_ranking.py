@@ -0,0 +1,29 @@
+from .recommender import ItemIndex, document
+
+
+def requirements(job):
+    """What a job asks for: its title and requirements"""
+    return document(job.title, job.requirements)
+
+
+def profile(user, completed=()):
+    """What an applicant brings: profile fields plus the titles of courses they completed"""
+    return document(user.interests, user.education, user.skill_level, user.completed_courses, *completed)
+
+
+def score(job_text, profiles, dimensions=1024):
+    """Cosine similarity of each (id, profile text) to `job_text`, as {id: score}.
+
+    IDF weights come from the job's own applicants, so a skill every
+    applicant lists counts for less than a rarer one the job asks for.
+    All profiles are scored in one matrix-vector product. Raises
+    ImportError without NumPy.
+    """
+    index = ItemIndex(profiles, dimensions)
+    np = index.np
+    if not len(index):
+        return {}
+    idf, matrix = index.dense()
+    query = index.vector(job_text) * idf
+    query /= max(float(np.linalg.norm(query)), 1e-12)
+    return {item_id: round(value, 4) for item_id, value in zip(index.ids, (matrix @ query).tolist())}
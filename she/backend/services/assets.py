@@ -0,0 +1,223 @@
+from flask import request, abort, send_from_directory, url_for
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import tempfile
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip variants are built
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+ONE_YEAR = 31536000
+
+CSS_TOKENS = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|(/\*.*?\*/)|(\s+)|([^"'/\s]+|/)''', re.S)
+# No space is needed next to these in CSS. ':' is left alone on its left side,
+# where 'a :hover' and 'a:hover' mean different things.
+CSS_TIGHT = set('{};,>')
+
+
+def minify_css(text):
+    """Drop comments and collapse whitespace, leaving strings untouched"""
+    pieces = []
+    for string, comment, space, other in CSS_TOKENS.findall(text):
+        if comment:
+            continue
+        if space:
+            if pieces and pieces[-1] != ' ':
+                pieces.append(' ')
+            continue
+        if pieces and pieces[-1] == ' ':
+            before = pieces[-2][-1] if len(pieces) > 1 else '{'
+            if (string or other)[0] in CSS_TIGHT or before in CSS_TIGHT or before == ':':
+                pieces.pop()
+        if other.startswith('}') and pieces and pieces[-1].endswith(';') and pieces[-1][0] not in '"\'':
+            pieces[-1] = pieces[-1][:-1]
+        pieces.append(string or other.replace(';}', '}'))
+    return ''.join(pieces).strip() + '\n'
+
+
+def minify_js(text):
+    """Strip indentation, blank lines and whole-line // comments.
+
+    Deliberately conservative: line breaks are kept, so automatic semicolon
+    insertion still sees the code it was written for, and nothing inside a
+    line is touched, where a // could belong to a string or a URL. Most of
+    the transfer saving comes from the compressed variants anyway.
+    """
+    lines = (line.strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//')) + '\n'
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def sources(source_dir):
+    """Every .css/.js file under source_dir, as sorted relative paths"""
+    found = []
+    for root, _, files in os.walk(source_dir):
+        for name in files:
+            if os.path.splitext(name)[1] in MINIFIERS:
+                found.append(os.path.relpath(os.path.join(root, name), source_dir).replace(os.sep, '/'))
+    return sorted(found)
+
+
+def build(source_dir, output_dir, bundles=None):
+    """Minify, fingerprint and precompress the assets under source_dir.
+
+    `bundles` maps an output name to the source files concatenated into it;
+    every source not named in a bundle becomes a bundle of its own. Each
+    bundle is written as <name>.<hash>.<ext> plus .gz (and .br, with the
+    brotli package) variants, and manifest.json maps bundle names to those
+    files. Outputs of earlier builds are removed. Returns the manifest.
+    """
+    bundles = dict(bundles or {})
+    bundled = {path for members in bundles.values() for path in members}
+    for path in sources(source_dir):
+        if path not in bundled:
+            bundles.setdefault(path, [path])
+
+    manifest = {}
+    for name, members in sorted(bundles.items()):
+        stem, ext = os.path.splitext(name)
+        text = '\n'.join(open(os.path.join(source_dir, member), encoding='utf-8').read()
+                         for member in members)
+        data = MINIFIERS[ext](text).encode('utf-8')
+        filename = f'{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}'
+        manifest[name] = filename
+
+        path = os.path.join(output_dir, filename)
+        if os.path.exists(path):
+            continue
+        _write_atomic(path, data)
+        # mtime=0 keeps the .gz bytes identical across builds of the same input
+        variants = {'.gz': gzip.compress(data, 9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(data, quality=11)
+        for suffix, compressed in variants.items():
+            if len(compressed) < len(data):
+                _write_atomic(path + suffix, compressed)
+
+    _write_atomic(os.path.join(output_dir, MANIFEST),
+                  json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+    keep = set(manifest.values()) | {MANIFEST}
+    for root, _, files in os.walk(output_dir):
+        for name in files:
+            relative = os.path.relpath(os.path.join(root, name), output_dir).replace(os.sep, '/')
+            if re.sub(r'\.(gz|br)$', '', relative) not in keep:
+                os.remove(os.path.join(root, name))
+    return manifest
+
+
+class Assets:
+    """Serves built assets under /assets with far-future cache headers.
+
+    Templates keep writing url_for('assets', filename='css/base.css'): a URL
+    defaults hook swaps the name for its fingerprinted file, so the URL
+    changes whenever the content does and the old one can be cached for a
+    year. Clients that accept br or gzip get the precompressed variant.
+
+    Sources live in <static>/src and are built into <static>/dist by
+    `flask build-assets`; a missing manifest is built at startup, and with
+    ASSETS_AUTO_BUILD (on in debug mode) edited sources are rebuilt on the
+    next request.
+    """
+
+    def __init__(self, app=None):
+        self.manifest = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('ASSETS_SOURCE', os.path.join(app.static_folder, 'src'))
+        app.config.setdefault('ASSETS_OUTPUT', os.path.join(app.static_folder, 'dist'))
+        app.config.setdefault('ASSETS_URL_PATH', '/assets')
+        app.config.setdefault('ASSETS_BUNDLES', {})
+        app.config.setdefault('ASSETS_AUTO_BUILD', app.debug)
+
+        self.source_dir = app.config['ASSETS_SOURCE']
+        self.output_dir = app.config['ASSETS_OUTPUT']
+        self.bundles = app.config['ASSETS_BUNDLES']
+        self.manifest = self.load()
+        if not self.manifest:
+            self.build()
+
+        app.add_url_rule(app.config['ASSETS_URL_PATH'].rstrip('/') + '/<path:filename>',
+                         'assets', self.send_asset)
+        app.url_defaults(self._fingerprint)
+        if app.config['ASSETS_AUTO_BUILD']:
+            app.before_request(self._rebuild_if_changed)
+        app.extensions['assets'] = self
+
+    def load(self):
+        try:
+            with open(os.path.join(self.output_dir, MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def build(self):
+        self.manifest = build(self.source_dir, self.output_dir, self.bundles)
+        return self.manifest
+
+    def _rebuild_if_changed(self):
+        try:
+            built = os.path.getmtime(os.path.join(self.output_dir, MANIFEST))
+        except OSError:
+            built = 0
+        if any(os.path.getmtime(os.path.join(self.source_dir, path)) > built
+               for path in sources(self.source_dir)):
+            logger.info('Asset sources changed, rebuilding')
+            self.build()
+
+    def _fingerprint(self, endpoint, values):
+        if endpoint == 'assets' and values.get('filename') in self.manifest:
+            values['filename'] = self.manifest[values['filename']]
+
+    def send_asset(self, filename):
+        # Only fingerprinted files are served, so every response is immutable
+        if filename not in self.manifest.values():
+            abort(404)
+
+        mimetype = mimetypes.guess_type(filename)[0]
+        encoding, suffix = None, ''
+        for candidate, candidate_suffix in (('br', '.br'), ('gzip', '.gz')):
+            if (request.accept_encodings.quality(candidate) > 0
+                    and os.path.exists(os.path.join(self.output_dir, filename + candidate_suffix))):
+                encoding, suffix = candidate, candidate_suffix
+                break
+
+        response = send_from_directory(self.output_dir, filename + suffix, mimetype=mimetype,
+                                       max_age=ONE_YEAR, conditional=True)
+        if encoding:
+            response.content_encoding = encoding
+        response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+
+def asset_url(filename):
+    """Fingerprinted URL of a built asset, usable outside templates"""
+    return url_for('assets', filename=filename)
@@ -0,0 +1,178 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+import json
+import os
+import re
+import time
+import zipfile
+
+
+def arcname(completion):
+    """File name of a certificate inside the archive"""
+    stem = completion.get('certificate_number') or f"user_{completion['user_id']}"
+    return re.sub(r'[^A-Za-z0-9._-]', '_', stem) + '.pdf'
+
+
+def render_chunk(chunk):
+    """Render a list of completions in a pool process; returns [(arcname, pdf bytes)]"""
+    from .certificate_generator import FastCertificateGenerator
+
+    generator = FastCertificateGenerator(output_dir=None)
+    return [(arcname(completion),
+             generator.render(completion['user_name'], completion['course_name'],
+                              completion['completion_date'], completion.get('certificate_number')))
+            for completion in chunk]
+
+
+def chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def render_parallel(completions, workers=None, chunk_size=64):
+    """Yield rendered chunks in input order, rendering across a process pool.
+
+    At most two chunks per worker are in flight, so memory stays flat no
+    matter how many completions are streamed through.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in chunks(completions, chunk_size):
+            pending.append(pool.submit(render_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+class Journal:
+    """Checkpoints of a ZIP being written, next to it as `<zip>.journal`.
+
+    After every chunk the archive is flushed and one JSON line records its
+    length and the entries written so far. A crashed run leaves a ZIP with
+    no central directory; resuming truncates it to the last checkpoint and
+    rebuilds the directory from the journal.
+    """
+
+    FIELDS = ('header_offset', 'CRC', 'compress_size', 'file_size', 'compress_type', 'flag_bits')
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        """Return (offset, [ZipInfo]) of the last complete checkpoint"""
+        offset, entries = 0, []
+        if not os.path.exists(self.path):
+            return offset, entries
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    checkpoint = json.loads(line)
+                except ValueError:
+                    break  # torn write of the last line
+                offset = checkpoint['offset']
+                for entry in checkpoint['entries']:
+                    info = zipfile.ZipInfo(entry['name'], tuple(entry['date_time']))
+                    for field in self.FIELDS:
+                        setattr(info, field, entry[field])
+                    entries.append(info)
+        return offset, entries
+
+    def record(self, offset, infos):
+        entries = [{'name': info.filename, 'date_time': list(info.date_time),
+                    **{field: getattr(info, field) for field in self.FIELDS}}
+                   for info in infos]
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({'offset': offset, 'entries': entries}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def write_zip(path, completions, workers=None, chunk_size=64, progress=None, resume=True):
+    """Render `completions` into the ZIP at `path`, resuming a crashed run.
+
+    `completions` must come in the same order on every run. `progress` is
+    called as progress(done, elapsed_seconds) after each chunk. Returns the
+    number of certificates in the archive.
+    """
+    journal = Journal(path + '.journal')
+    offset, done_entries = journal.load() if resume and os.path.exists(path) else (0, [])
+    if not done_entries:
+        journal.remove()
+        offset = 0
+    done_names = {info.filename for info in done_entries}
+
+    with open(path, 'r+b' if offset else 'wb') as f:
+        f.truncate(offset)
+        f.seek(offset)
+        # Appending to a file with no central directory starts a fresh one
+        # at the end; the entries already on disk are put back into it. If
+        # this run fails, closing still leaves a readable partial archive.
+        with zipfile.ZipFile(f, 'a' if offset else 'w', zipfile.ZIP_STORED) as archive:
+            for info in done_entries:
+                archive.filelist.append(info)
+                archive.NameToInfo[info.filename] = info
+
+            remaining = (completion for completion in completions
+                         if arcname(completion) not in done_names)
+            started, done = time.perf_counter(), len(done_entries)
+            timestamp = datetime.now().timetuple()[:6]
+            for chunk in render_parallel(remaining, workers, chunk_size):
+                infos = []
+                for name, pdf in chunk:
+                    info = zipfile.ZipInfo(name, timestamp)
+                    archive.writestr(info, pdf)
+                    infos.append(info)
+                f.flush()
+                journal.record(f.tell(), infos)
+                done += len(chunk)
+                if progress:
+                    progress(done, time.perf_counter() - started)
+
+    journal.remove()
+    return done
+
+
+class _Sink:
+    """Write-only file object that hands written bytes to a generator"""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data, self.parts = b''.join(self.parts), []
+        return data
+
+
+def stream_zip(completions, workers=None, chunk_size=64):
+    """Yield a ZIP of rendered certificates piece by piece, for an HTTP response"""
+    sink = _Sink()
+    timestamp = datetime.now().timetuple()[:6]
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as archive:
+        for chunk in render_parallel(completions, workers, chunk_size):
+            for name, pdf in chunk:
+                archive.writestr(zipfile.ZipInfo(name, timestamp), pdf)
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,257 @@
+from collections import OrderedDict
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+import logging
+import os
+import pickle
+import random
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def as_dict(instance, *columns):
+    """Plain column values of a model instance, safe to cache and pickle.
+
+    Pass column names to project only those, e.g. to keep password hashes
+    out of the cache.
+    """
+    columns = columns or [column.key for column in instance.__table__.columns]
+    return {column: getattr(instance, column) for column in columns}
+
+
+class LocalLRU:
+    """Per-process tier: a bounded LRU of (expires, value) pairs"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedCache:
+    """Cross-worker tier: pickled values and namespace versions in a SQLite file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        # One connection per thread and per process, so forked workers never
+        # reuse a connection opened before the fork
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS cache_entries '
+                               '(key TEXT PRIMARY KEY, value BLOB, expires REAL)')
+            connection.execute('CREATE TABLE IF NOT EXISTS cache_versions '
+                               '(namespace TEXT PRIMARY KEY, version INTEGER NOT NULL)')
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    def version(self, namespace):
+        row = self._connection().execute(
+            'SELECT version FROM cache_versions WHERE namespace = ?', (namespace,)).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, namespace):
+        self._connection().execute(
+            'INSERT INTO cache_versions (namespace, version) VALUES (?, 1) '
+            'ON CONFLICT(namespace) DO UPDATE SET version = version + 1', (namespace,))
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT value, expires FROM cache_entries WHERE key = ?', (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[1], pickle.loads(row[0])
+
+    def set(self, key, value, ttl):
+        connection = self._connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO cache_entries (key, value, expires) VALUES (?, ?, ?)',
+            (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time() + ttl))
+        if random.random() < 0.01:
+            connection.execute('DELETE FROM cache_entries WHERE expires < ?', (time.time(),))
+
+
+class VersionedCache:
+    """Read-through cache for reference data, in front of the database.
+
+    Lookups go per-process LRU -> shared SQLite file -> loader. Every key
+    is namespaced by a version number kept in the shared tier; committing
+    a change to a watched table bumps the version of its namespaces, so
+    all workers stop serving the old entries at once.
+    """
+
+    def __init__(self, app=None):
+        self.local = None
+        self.shared = None
+        self.enabled = False
+        self.default_ttl = 300
+        self._table_namespaces = {}
+        self._column_namespaces = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('CACHE_ENABLED', True)
+        app.config.setdefault('CACHE_LRU_SIZE', 256)
+        app.config.setdefault('CACHE_DEFAULT_TTL', 300)
+        app.config.setdefault('CACHE_SHARED_PATH', os.path.join(app.instance_path, 'cache.sqlite3'))
+
+        self.enabled = app.config['CACHE_ENABLED']
+        self.default_ttl = app.config['CACHE_DEFAULT_TTL']
+        self.local = LocalLRU(app.config['CACHE_LRU_SIZE'])
+        self.shared = SharedCache(app.config['CACHE_SHARED_PATH'])
+        app.extensions['cache'] = self
+
+    def watch(self, table_namespaces):
+        """Bump namespaces after any commit that wrote to the mapped tables.
+
+        `table_namespaces` maps a table name to the namespaces built from it.
+        """
+        self._listen()
+        for table, namespaces in table_namespaces.items():
+            self._table_namespaces.setdefault(table, set()).update(namespaces)
+
+    def watch_columns(self, table, columns, namespaces):
+        """Bump namespaces only after commits that changed `columns` of `table`.
+
+        For data derived from a few columns of a busy table: updates to
+        its other columns leave these namespaces alone. Inserts, deletes
+        and writes whose columns can't be told still bump them.
+        """
+        self._listen()
+        self._column_namespaces.setdefault(table, []).append((frozenset(columns), tuple(namespaces)))
+
+    def _listen(self):
+        if not event.contains(Session, 'after_flush', self._track_flush):
+            event.listen(Session, 'after_flush', self._track_flush)
+            event.listen(Session, 'do_orm_execute', self._track_execute)
+            event.listen(Session, 'after_commit', self._after_commit)
+            event.listen(Session, 'after_soft_rollback', self._after_rollback)
+
+    def get_or_set(self, namespace, key, loader, ttl=None):
+        if not self.enabled:
+            return loader()
+        ttl = ttl or self.default_ttl
+
+        try:
+            versioned_key = f'{namespace}:{self.shared.version(namespace)}:{key}'
+        except sqlite3.Error:
+            logger.exception('Shared cache unavailable, loading %s directly', namespace)
+            return loader()
+
+        entry = self.local.get(versioned_key)
+        if entry is not None:
+            return entry[1]
+
+        try:
+            entry = self.shared.get(versioned_key)
+        except sqlite3.Error:
+            entry = None
+        if entry is not None:
+            expires, value = entry
+            self.local.set(versioned_key, value, max(expires - time.time(), 0))
+            return value
+
+        value = loader()
+        self.local.set(versioned_key, value, ttl)
+        try:
+            self.shared.set(versioned_key, value, ttl)
+        except sqlite3.Error:
+            logger.exception('Could not store %s in the shared cache', versioned_key)
+        return value
+
+    def version(self, namespace):
+        """Current version of a namespace, or None if the shared tier is unavailable"""
+        try:
+            return self.shared.version(namespace)
+        except sqlite3.Error:
+            logger.exception('Shared cache unavailable, no version for %s', namespace)
+            return None
+
+    def bump(self, *namespaces):
+        for namespace in namespaces:
+            try:
+                self.shared.bump(namespace)
+            except sqlite3.Error:
+                logger.exception('Could not bump cache namespace %s', namespace)
+                self.local.clear()
+
+    def mark(self, session, table, columns=None):
+        """Bump `table`'s namespaces when `session` next commits.
+
+        Writes through the ORM are tracked automatically; call this for
+        statements sent straight to the connection. Pass the `columns`
+        written, if known, to leave namespaces watching other columns alone.
+        """
+        namespaces = set(self._table_namespaces.get(table, ()))
+        for watched, column_namespaces in self._column_namespaces.get(table, ()):
+            if columns is None or not watched.isdisjoint(columns):
+                namespaces.update(column_namespaces)
+        if namespaces:
+            session.info.setdefault('cache_namespaces', set()).update(namespaces)
+
+    def _track_flush(self, session, flush_context):
+        for instance in [*session.new, *session.deleted]:
+            table = getattr(instance, '__tablename__', None)
+            if table:
+                self.mark(session, table)
+        for instance in session.dirty:
+            table = getattr(instance, '__tablename__', None)
+            if table in self._column_namespaces:
+                state = inspect(instance)
+                self.mark(session, table, [attribute.key for attribute in state.mapper.column_attrs
+                                           if state.attrs[attribute.key].history.has_changes()])
+            elif table:
+                self.mark(session, table)
+
+    def _track_execute(self, state):
+        if (state.is_insert or state.is_update or state.is_delete) and state.bind_mapper is not None:
+            columns = None
+            if state.is_update and isinstance(state.parameters, list):
+                # Bulk UPDATE by primary key: every row dict names its columns
+                columns = {key for row in state.parameters for key in row}
+            self.mark(state.session, state.bind_mapper.local_table.name, columns)
+
+    def _after_commit(self, session):
+        namespaces = session.info.pop('cache_namespaces', None)
+        if namespaces:
+            self.bump(*namespaces)
+
+    def _after_rollback(self, session, previous_transaction):
+        if previous_transaction.parent is None:
+            session.info.pop('cache_namespaces', None)
@@ -1,23 +1,25 @@
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+# ReportLab is imported inside the methods that use it: it adds ~20 MB and
+# ~200 ms to any process that loads it, and only certificate workers need it.
+import io
 import os
+import time
+import tempfile
 from datetime import datetime
 import uuid
 
 class CertificateGenerator:
-    def __init__(self):
-        self.output_dir = 'static/certificates'
-        if not os.path.exists(self.output_dir):
+    def __init__(self, output_dir='static/certificates'):
+        self.output_dir = output_dir
+        if output_dir and not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
     
     def generate_certificate(self, user_name, course_name, completion_date):
         """Generate a PDF certificate for course completion"""
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter, landscape
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
         
         # Generate unique filename
         filename = f"cert_{uuid.uuid4().hex[:8]}.pdf"
@@ -132,6 +134,122 @@ class CertificateGenerator:
             })
         return certificates
 
+class FastCertificateGenerator(CertificateGenerator):
+    """Draws certificates straight onto a canvas instead of laying out a story.
+
+    The page layout never changes, so the fixed lines are measured once per
+    process and drawn into a form XObject that the page then places with a
+    single Do operator; viewers and printers can cache that artwork, and a
+    document with several pages would reuse it. Only the name, course, date
+    and certificate number are measured and drawn per call. Output is
+    byte-for-byte reproducible for the same input.
+    """
+
+    PAGE_SIZE = (792.0, 612.0)  # landscape letter
+    MARGIN = 72
+    PINK = '#ff1493'
+    LIGHT_PINK = '#ff69b4'
+
+    # (text, font, size, colour, baseline) of the fixed lines
+    STATIC_LINES = (
+        ("Certificate of Completion", 'Helvetica-Bold', 36, PINK, 480),
+        ("This is to certify that", 'Helvetica', 24, LIGHT_PINK, 400),
+        ("has successfully completed the course", 'Helvetica', 16, 'black', 280),
+    )
+    # (font, size, colour, baseline) of the per-certificate fields
+    NAME = ('Helvetica-Bold', 28, PINK, 335)
+    COURSE = ('Helvetica-Bold', 20, LIGHT_PINK, 240)
+    DATE = ('Helvetica', 16, 'black', 180)
+    NUMBER = ('Helvetica', 10, 'black', 100)
+
+    BACKGROUND_FORM = 'background'
+
+    _background = None
+
+    @classmethod
+    def background(cls):
+        """The fixed lines with their x offsets worked out, measured once per process"""
+        if cls._background is None:
+            from reportlab.pdfbase.pdfmetrics import stringWidth
+
+            width = cls.PAGE_SIZE[0]
+            cls._background = tuple(
+                (text, font, size, colour, (width - stringWidth(text, font, size)) / 2, y)
+                for text, font, size, colour, y in cls.STATIC_LINES)
+        return cls._background
+
+    def render(self, user_name, course_name, completion_date, certificate_number=None):
+        """Return the certificate as PDF bytes"""
+        from reportlab.pdfgen import canvas
+
+        buffer = io.BytesIO()
+        page = canvas.Canvas(buffer, pagesize=self.PAGE_SIZE, invariant=1)
+        page.setTitle('Certificate of Completion')
+
+        self._draw_background(page)
+        self._draw_field(page, user_name, *self.NAME)
+        self._draw_field(page, course_name, *self.COURSE)
+        self._draw_field(page, f"Completed on: {completion_date.strftime('%B %d, %Y')}", *self.DATE)
+        if certificate_number:
+            self._draw_field(page, f"Certificate No. {certificate_number}", *self.NUMBER)
+
+        page.showPage()
+        page.save()
+        return buffer.getvalue()
+
+    def _draw_background(self, page):
+        # Forms belong to one document, so each canvas defines it once and
+        # every page that needs the artwork refers to it
+        if not page.hasForm(self.BACKGROUND_FORM):
+            page.beginForm(self.BACKGROUND_FORM, lowerx=0, lowery=0,
+                           upperx=self.PAGE_SIZE[0], uppery=self.PAGE_SIZE[1])
+            for text, font, size, colour, x, y in self.background():
+                page.setFont(font, size)
+                page.setFillColor(colour)
+                page.drawString(x, y, text)
+            page.endForm()
+        page.doForm(self.BACKGROUND_FORM)
+
+    def _draw_field(self, page, text, font, size, colour, y):
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        # Long names and titles shrink to fit between the margins instead of wrapping
+        width, limit = self.PAGE_SIZE[0], self.PAGE_SIZE[0] - 2 * self.MARGIN
+        text_width = stringWidth(text, font, size)
+        if text_width > limit:
+            size = size * limit / text_width
+            text_width = limit
+        page.setFont(font, size)
+        page.setFillColor(colour)
+        page.drawString((width - text_width) / 2, y, text)
+
+    def generate_certificate(self, user_name, course_name, completion_date):
+        """Generate a PDF certificate for course completion"""
+        filename = f"cert_{uuid.uuid4().hex[:8]}.pdf"
+        with open(os.path.join(self.output_dir, filename), 'wb') as f:
+            f.write(self.render(user_name, course_name, completion_date))
+        return filename
+
+
+def benchmark(count=200):
+    """Render `count` certificates with each generator into a scratch directory.
+
+    Returns {generator name: {'per_sec': ..., 'bytes': average PDF size}}.
+    """
+    completion_date = datetime(2024, 3, 8)
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for generator in (CertificateGenerator(output_dir), FastCertificateGenerator(output_dir)):
+            generator.generate_certificate('Warm Up', 'Warm Up', completion_date)
+            started = time.perf_counter()
+            filenames = [generator.generate_certificate(f'Learner {i}', 'Introduction to Baking',
+                                                        completion_date)
+                         for i in range(count)]
+            elapsed = time.perf_counter() - started
+            size = sum(os.path.getsize(os.path.join(output_dir, name)) for name in filenames)
+            results[type(generator).__name__] = {'per_sec': count / elapsed, 'bytes': size / count}
+    return results
+
 # Simple certificate generator without reportlab (fallback)
 class SimpleCertificateGenerator:
     def generate_certificate(self, user_name, course_name, completion_date):
@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, or_
+import logging
+import os
+import socket
+import time
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+JOB_STATUSES = (QUEUED, RUNNING, DONE, FAILED)
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class CertificateQueue:
+    """Durable certificate jobs kept in a table of the application database.
+
+    Jobs are added in the same transaction as the certificate they render,
+    so a committed certificate always has a job and a rolled back one
+    never does. Workers claim a job by leasing it for `lease` seconds; a
+    job whose worker died is picked up again once its lease runs out,
+    which counts as an attempt. Failed jobs are retried with exponential
+    backoff until `max_attempts`, then parked as failed; so is a job whose
+    lease ran out on its last attempt, so a job that kills its worker
+    can't be reclaimed forever.
+    """
+
+    def __init__(self, session, model, max_attempts=5, retry_delay=30, lease=300):
+        self.session = session
+        self.model = model
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease = lease
+
+    def enqueue(self, certificate):
+        """Queue a render of `certificate`; committed along with the caller's session"""
+        job = self.model(certificate=certificate, status=QUEUED, attempts=0,
+                         run_after=datetime.utcnow())
+        self.session.add(job)
+        return job
+
+    def _due(self, now):
+        model = self.model
+        return or_(and_(model.status == QUEUED, model.run_after <= now),
+                   and_(model.status == RUNNING, model.locked_until < now,
+                        model.attempts < self.max_attempts))
+
+    def _fail_exhausted(self, now):
+        """Park jobs whose lease ran out on their last attempt as failed"""
+        model = self.model
+        exhausted = and_(model.status == RUNNING, model.locked_until < now,
+                         model.attempts >= self.max_attempts)
+        # Checked with a read first, so an idle worker's polls never take the write lock
+        if self.session.query(model.id).filter(exhausted).first() is None:
+            return 0
+        failed = self.session.query(model).filter(exhausted).update({
+            model.status: FAILED,
+            model.last_error: f'Lease expired on attempt {self.max_attempts} of '
+                              f'{self.max_attempts}; the worker likely died running it',
+            model.locked_by: None,
+            model.locked_until: None,
+            model.finished_at: now,
+        }, synchronize_session=False)
+        self.session.commit()
+        if failed:
+            logger.error('%s certificate job(s) failed: lease expired on the last attempt', failed)
+        return failed
+
+    def claim(self, worker):
+        """Lease the next due job to `worker`, or return None when there is none"""
+        model = self.model
+        now = datetime.utcnow()
+        self._fail_exhausted(now)
+        candidates = [job_id for (job_id,) in self.session.query(model.id).filter(
+            self._due(now)).order_by(model.run_after, model.id).limit(10)]
+        self.session.rollback()
+
+        for job_id in candidates:
+            # The conditional UPDATE is the lock: only one worker's matches
+            claimed = self.session.query(model).filter(
+                model.id == job_id, self._due(now)).update({
+                    model.status: RUNNING,
+                    model.locked_by: worker,
+                    model.locked_until: now + timedelta(seconds=self.lease),
+                    model.attempts: model.attempts + 1,
+                }, synchronize_session=False)
+            self.session.commit()
+            if claimed:
+                return self.session.get(model, job_id)
+        return None
+
+    def complete(self, job):
+        job.status = DONE
+        job.locked_by = job.locked_until = None
+        job.last_error = None
+        job.finished_at = datetime.utcnow()
+        self.session.commit()
+
+    def retry(self, job, error):
+        """Record a failed attempt and schedule the next one, or give up"""
+        job.last_error = error[-2000:]
+        job.locked_by = job.locked_until = None
+        if job.attempts >= self.max_attempts:
+            job.status = FAILED
+            job.finished_at = datetime.utcnow()
+        else:
+            job.status = QUEUED
+            delay = self.retry_delay * 2 ** max(job.attempts - 1, 0)
+            job.run_after = datetime.utcnow() + timedelta(seconds=delay)
+        self.session.commit()
+
+    def requeue_failed(self):
+        """Give every failed job a fresh set of attempts; returns how many"""
+        model = self.model
+        count = self.session.query(model).filter(model.status == FAILED).update({
+            model.status: QUEUED,
+            model.attempts: 0,
+            model.run_after: datetime.utcnow(),
+            model.finished_at: None,
+        }, synchronize_session=False)
+        self.session.commit()
+        return count
+
+    def counts(self):
+        rows = self.session.query(self.model.status, func.count(self.model.id)).group_by(
+            self.model.status)
+        counts = dict.fromkeys(JOB_STATUSES, 0)
+        counts.update(rows)
+        return counts
+
+
+def work(queue, handler, worker=None, once=False, poll=1.0, max_jobs=None):
+    """Run jobs from `queue` through `handler(job)` until stopped.
+
+    With `once`, return as soon as the queue has nothing due. Returns the
+    number of jobs that completed.
+    """
+    worker = worker or worker_name()
+    done = 0
+    while max_jobs is None or done < max_jobs:
+        job = queue.claim(worker)
+        if job is None:
+            if once:
+                break
+            time.sleep(poll)
+            continue
+
+        try:
+            handler(job)
+        except Exception as error:
+            logger.exception('Certificate job %s failed (attempt %s)', job.id, job.attempts)
+            queue.session.rollback()
+            queue.retry(job, f'{type(error).__name__}: {error}')
+            continue
+        queue.complete(job)
+        done += 1
+    return done
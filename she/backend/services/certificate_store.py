@@ -0,0 +1,53 @@
+import hashlib
+import os
+import re
+import tempfile
+
+KEY_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class CertificateStore:
+    """Content-addressed PDF storage: files are named by their SHA-256.
+
+    A certificate lives at <root>/<k[0:2]>/<k[2:4]>/<k>.pdf, so no directory
+    grows past a few hundred files and identical PDFs are stored once. The
+    bytes behind a key never change, which is what lets downloads be served
+    as immutable and validated with the key as a strong ETag.
+    """
+
+    def __init__(self, root):
+        self.root = root
+
+    @staticmethod
+    def is_key(key):
+        return bool(KEY_PATTERN.match(key or ''))
+
+    def relative_path(self, key):
+        return f'{key[:2]}/{key[2:4]}/{key}.pdf'
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key[2:4], f'{key}.pdf')
+
+    def exists(self, key):
+        return self.is_key(key) and os.path.exists(self.path(key))
+
+    def put(self, data):
+        """Store PDF bytes and return their key"""
+        key = hashlib.sha256(data).hexdigest()
+        path = self.path(key)
+        if os.path.exists(path):
+            return key
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write beside the target and rename, so readers never see half a file
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(temp_path, 0o644)  # mkstemp's 0600 would hide it from the front-end server
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return key
@@ -0,0 +1,132 @@
+from flask import current_app, request, session, make_response
+from flask_login import current_user
+from functools import wraps
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+import hashlib
+
+
+def _versioned_key(key, namespaces):
+    """`key` qualified by the release and the current version of each namespace.
+
+    Returns None when a version can't be read, in which case nothing
+    should be served from or stored in the cache.
+    """
+    cache = current_app.extensions['cache']
+    versions = []
+    for namespace in namespaces:
+        version = cache.version(namespace)
+        if version is None:
+            return None
+        versions.append((namespace, version))
+    http_cache = current_app.extensions.get('http_cache')
+    release = http_cache.release() if http_cache is not None else None
+    digest = hashlib.sha1(repr((release, versions)).encode()).hexdigest()[:16]
+    return f'{key}:{digest}'
+
+
+class CacheExtension(Extension):
+    """{% cache key[, ttl[, namespace, ...]] %} ... {% endcache %}
+
+    Stores the rendered block in the shared VersionedCache for `ttl`
+    seconds (default CACHE_DEFAULT_TTL). Listing the cache namespaces the
+    block is built from makes any commit to their tables render it anew.
+    Only cache blocks that look the same for everyone who sees them.
+    """
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', [nodes.List(args)]),
+                               [], [], body).set_lineno(lineno)
+
+    def _render(self, args, caller):
+        key, ttl, namespaces = args[0], args[1] if len(args) > 1 else None, args[2:]
+        extension = current_app.extensions.get('fragment_cache')
+        versioned_key = extension and extension.enabled and _versioned_key(key, namespaces)
+        if not versioned_key:
+            return caller()
+        html = current_app.extensions['cache'].get_or_set(
+            'fragments', versioned_key, lambda: str(caller()), ttl)
+        return Markup(html)
+
+
+class _Uncacheable(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+def page_cache(*namespaces, ttl=None, params=()):
+    """Serve a view's whole page from the shared cache to anonymous visitors.
+
+    The page is keyed on the path, the values of the query `params` the
+    view reads, the release and the versions of `namespaces`, and kept
+    for `ttl` seconds (default PAGE_CACHE_TTL). A request with any other
+    query parameter is rendered without the cache, so made-up parameters
+    can't fill it with copies of one page. Signed-in users, pages with
+    flashed messages and anything but a 200 are rendered normally and
+    never stored.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            extension = current_app.extensions.get('fragment_cache')
+            if (extension is None or not extension.enabled or request.method != 'GET'
+                    or current_user.is_authenticated or session.get('_flashes')
+                    or not set(request.args) <= set(params)):
+                return view(*args, **kwargs)
+            query = [(name, request.args.getlist(name)) for name in params if name in request.args]
+            query_digest = hashlib.sha1(repr(query).encode()).hexdigest()[:16]
+            versioned_key = _versioned_key(f'page:{request.path}:{query_digest}', namespaces)
+            if versioned_key is None:
+                return view(*args, **kwargs)
+
+            def render():
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed or session.get('_flashes'):
+                    raise _Uncacheable(response)
+                return response.get_data(), response.mimetype
+
+            try:
+                body, mimetype = current_app.extensions['cache'].get_or_set(
+                    'pages', versioned_key, render, ttl or extension.page_ttl)
+            except _Uncacheable as uncacheable:
+                return uncacheable.response
+            return current_app.response_class(body, mimetype=mimetype)
+        return wrapper
+    return decorator
+
+
+class FragmentCache:
+    """Enables the {% cache %} template tag and @page_cache.
+
+    Both store rendered HTML in the VersionedCache, so every worker shares
+    one copy and commits to the watched tables invalidate it. Set
+    FRAGMENT_CACHE_ENABLED to False to always render.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.page_ttl = 300
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('FRAGMENT_CACHE_ENABLED', True)
+        app.config.setdefault('PAGE_CACHE_TTL', 300)
+
+        self.enabled = app.config['FRAGMENT_CACHE_ENABLED']
+        self.page_ttl = app.config['PAGE_CACHE_TTL']
+        # jinja_options is only read when app.jinja_env is first built
+        if 'jinja_env' in app.__dict__:
+            app.jinja_env.add_extension(CacheExtension)
+        else:
+            app.jinja_options = {**app.jinja_options, 'extensions': [
+                *app.jinja_options.get('extensions', ()), CacheExtension]}
+        app.extensions['fragment_cache'] = self
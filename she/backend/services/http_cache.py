@@ -0,0 +1,148 @@
+from flask import current_app, request, session, make_response
+from flask_login import current_user
+from functools import wraps
+from werkzeug.http import is_resource_modified
+import gzip
+import hashlib
+import os
+
+try:
+    import brotli
+except ImportError:  # optional: without it responses are only gzipped
+    brotli = None
+
+COMPRESSIBLE = {'text/html', 'text/css', 'text/plain', 'text/javascript', 'application/javascript',
+                'application/json', 'image/svg+xml'}
+
+
+def table_version(namespace, query):
+    """Validator for a page listing a table the VersionedCache watches.
+
+    `query` selects one (count, newest timestamp) row of what the page
+    lists; it is cached until the namespace is bumped, so an unchanged
+    table costs no query. The namespace version is part of the tag because
+    count and newest row alone miss edits and deletions. Returns
+    (tag, last_modified), or None when no version can be had.
+    """
+    cache = current_app.extensions.get('cache')
+    version = cache.version(namespace) if cache is not None else None
+    if version is None:
+        return None
+    count, newest = cache.get_or_set(namespace, 'table-version', lambda: tuple(query.one()))
+    return (namespace, version, count, newest), newest
+
+
+def conditional(validator):
+    """Answer If-None-Match/If-Modified-Since with 304 before running the view.
+
+    `validator()` returns (tag, last_modified) for the data the page shows,
+    or None to skip validation. The weak ETag also covers who is looking
+    (the navbar is per user) and the deployed templates and assets. Pages
+    carrying flashed messages are never validated, since a revisit must not
+    bring the message back from the browser cache.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            extension = current_app.extensions.get('http_cache')
+            if (extension is None or not extension.conditional or request.method not in ('GET', 'HEAD')
+                    or session.get('_flashes')):
+                return view(*args, **kwargs)
+            validation = validator()
+            if validation is None:
+                return view(*args, **kwargs)
+
+            tag, last_modified = validation
+            viewer = ((current_user.id, current_user.role, current_user.name)
+                      if current_user.is_authenticated else None)
+            etag = hashlib.sha1(repr((extension.release(), viewer, tag)).encode()).hexdigest()[:24]
+
+            if not is_resource_modified(request.environ, etag, last_modified=last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or session.get('_flashes'):
+                    return response
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            # Cacheable by this browser only, and revalidated on every visit
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+
+class HTTPCache:
+    """Conditional GET for @conditional views, and compression of text responses.
+
+    Text responses of at least HTTP_COMPRESS_MIN_SIZE bytes are sent with
+    brotli (when the package is installed) or gzip, whichever the client
+    accepts. Responses that are streamed, sent from files or already
+    encoded are left alone. Conditional GET is off in debug mode, where
+    templates change under a running process.
+    """
+
+    def __init__(self, app=None):
+        self._templates = ''
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('HTTP_CONDITIONAL_GET', not app.debug)
+        app.config.setdefault('HTTP_COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('HTTP_COMPRESS_LEVEL', 6)
+        app.config.setdefault('HTTP_BROTLI_QUALITY', 5)
+
+        self.conditional = app.config['HTTP_CONDITIONAL_GET']
+        self.min_size = app.config['HTTP_COMPRESS_MIN_SIZE']
+        self.level = app.config['HTTP_COMPRESS_LEVEL']
+        self.brotli_quality = app.config['HTTP_BROTLI_QUALITY']
+        self._templates = self._template_stamp(app.template_folder and
+                                               os.path.join(app.root_path, app.template_folder))
+        app.after_request(self._compress)
+        app.extensions['http_cache'] = self
+
+    @staticmethod
+    def _template_stamp(folder):
+        # Templates only change with a deploy, which restarts the processes
+        stats = []
+        for root, _, files in os.walk(folder or ''):
+            for name in sorted(files):
+                stat = os.stat(os.path.join(root, name))
+                stats.append((name, stat.st_mtime_ns, stat.st_size))
+        return hashlib.sha1(repr(sorted(stats)).encode()).hexdigest()
+
+    def release(self):
+        """Changes whenever the templates or the built assets do"""
+        assets = current_app.extensions.get('assets')
+        return self._templates, sorted(assets.manifest.values()) if assets else None
+
+    def _compress(self, response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE):
+            return response
+        response.vary.add('Accept-Encoding')
+
+        accepted = request.accept_encodings
+        if brotli is not None and accepted.quality('br') > 0:
+            encoding = 'br'
+        elif accepted.quality('gzip') > 0:
+            encoding = 'gzip'
+        else:
+            return response
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        if encoding == 'br':
+            response.set_data(brotli.compress(data, quality=self.brotli_quality))
+        else:
+            response.set_data(gzip.compress(data, self.level))
+        response.content_encoding = encoding
+        # The same strong ETag must not name different bytes
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
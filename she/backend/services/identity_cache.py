@@ -0,0 +1,97 @@
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from .cache import LocalLRU
+
+# Columns templates read from current_user. password_hash is deliberately
+# left out: the projection is for display and access checks only.
+IDENTITY_COLUMNS = (
+    'id', 'name', 'email', 'role', 'phone', 'location', 'education',
+    'skill_level', 'interests', 'completed_courses', 'expertise',
+    'experience_years', 'company', 'position', 'created_at',
+)
+
+
+class CachedUser(UserMixin):
+    """Read-only projection of a users row, used as current_user.
+
+    Views that change the logged-in user must load the real row with
+    db.session.get(User, current_user.id) and commit that.
+    """
+
+    def __init__(self, fields):
+        self.__dict__.update(fields)
+
+    def __repr__(self):
+        return f'<CachedUser {self.id}>'
+
+
+class IdentityCache:
+    """Short-TTL, per-process cache of user projections for flask-login.
+
+    Entries are dropped as soon as a commit in this process writes the
+    user's row; other workers pick up the change within USER_CACHE_TTL.
+    """
+
+    def __init__(self, app=None):
+        self.entries = LocalLRU()
+        self.ttl = 30
+        self._table = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('USER_CACHE_TTL', 30)
+        app.config.setdefault('USER_CACHE_SIZE', 10000)
+        self.ttl = app.config['USER_CACHE_TTL']
+        self.entries = LocalLRU(app.config['USER_CACHE_SIZE'])
+
+    def load(self, user_id, loader):
+        """Return a CachedUser, calling loader(user_id) -> dict or None on a miss"""
+        entry = self.entries.get(user_id)
+        if entry is not None:
+            return CachedUser(entry[1])
+        fields = loader(user_id)
+        if fields is None:
+            return None
+        if self.ttl:
+            self.entries.set(user_id, fields, self.ttl)
+        return CachedUser(fields)
+
+    def invalidate(self, user_id=None):
+        if user_id is None:
+            self.entries.clear()
+        else:
+            self.entries.delete(user_id)
+
+    def watch(self, model):
+        """Invalidate users whose rows are written by a committed session"""
+        self._table = model.__tablename__
+        event.listen(Session, 'after_flush', self._track_flush)
+        event.listen(Session, 'do_orm_execute', self._track_execute)
+        event.listen(Session, 'after_commit', self._after_commit)
+        event.listen(Session, 'after_soft_rollback', self._after_rollback)
+
+    def _track_flush(self, session, flush_context):
+        changed = session.info.setdefault('identity_changes', set())
+        for instance in [*session.dirty, *session.deleted]:
+            if getattr(instance, '__tablename__', None) == self._table:
+                changed.add(instance.id)
+
+    def _track_execute(self, state):
+        # Bulk UPDATE/DELETE statements don't say which rows they touched
+        if ((state.is_update or state.is_delete) and state.bind_mapper is not None
+                and state.bind_mapper.local_table.name == self._table):
+            state.session.info.setdefault('identity_changes', set()).add(None)
+
+    def _after_commit(self, session):
+        changed = session.info.pop('identity_changes', set())
+        if None in changed:
+            self.invalidate()
+            return
+        for user_id in changed:
+            self.invalidate(user_id)
+
+    def _after_rollback(self, session, previous_transaction):
+        if previous_transaction.parent is None:
+            session.info.pop('identity_changes', None)
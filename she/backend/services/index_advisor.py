@@ -0,0 +1,80 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class QueryPlan:
+    name: str
+    sql: str
+    steps: list = field(default_factory=list)
+
+    @property
+    def scans(self):
+        """Plan steps that walk a whole table or index instead of searching it"""
+        return [step for step in self.steps if step.startswith('SCAN ')]
+
+    @property
+    def sorts(self):
+        """Plan steps that need a temporary b-tree to sort or group rows"""
+        return [step for step in self.steps if step.startswith('USE TEMP B-TREE')]
+
+    @property
+    def ok(self):
+        return not self.scans and not self.sorts
+
+
+def explain(connection, statement):
+    """Run EXPLAIN QUERY PLAN for a SQLAlchemy statement and return its steps"""
+    compiled = statement.compile(dialect=connection.dialect,
+                                 compile_kwargs={'literal_binds': True})
+    sql = str(compiled)
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}').fetchall()
+    # Each row is (id, parent, notused, detail)
+    return sql, [row[-1] for row in rows]
+
+
+def advise(connection, catalog):
+    """Explain every query in the catalog.
+
+    `catalog` maps a human readable name to a SQLAlchemy statement or ORM
+    query. Returns a QueryPlan per entry, in catalog order.
+    """
+    plans = []
+    for name, query in catalog.items():
+        statement = getattr(query, 'statement', query)
+        sql, steps = explain(connection, statement)
+        plans.append(QueryPlan(name=name, sql=sql, steps=steps))
+    return plans
+
+
+# Indexes once declared on the models and since made redundant by another
+# index with the same leading columns
+RETIRED_INDEXES = (
+    'ix_applications_job',  # ix_applications_job_score starts with job_id
+)
+
+
+def drop_retired_indexes(connection):
+    """Drop RETIRED_INDEXES from a database built while they were declared"""
+    existing = {row[0] for row in connection.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    dropped = [name for name in RETIRED_INDEXES if name in existing]
+    for name in dropped:
+        connection.exec_driver_sql(f'DROP INDEX "{name}"')
+    return dropped
+
+
+def create_missing_indexes(connection, metadata):
+    """Create indexes declared on the models that an existing database lacks.
+
+    db.create_all() only builds indexes together with new tables, so databases
+    created before an index was declared never get it.
+    """
+    created = []
+    existing = {row[0] for row in connection.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+                created.append(index.name)
+    return created
@@ -0,0 +1,218 @@
+from contextlib import nullcontext
+from itertools import islice
+from sqlalchemy import insert
+import codecs
+import csv
+import io
+import json
+import time
+
+FIELDS = ('title', 'description', 'company', 'location', 'requirements', 'salary_range')
+REQUIRED = ('title', 'description', 'location')
+FORMATS = ('csv', 'json')
+
+# Stop collecting error messages past this many; they are still counted
+MAX_ERRORS = 1000
+
+
+class InvalidImport(ValueError):
+    """The file as a whole can't be read (not per-row problems)"""
+
+
+def detect_format(filename):
+    """'csv' or 'json' from a file name (.jsonl and .ndjson are JSON)"""
+    extension = (filename or '').rsplit('.', 1)[-1].lower()
+    return 'json' if extension in ('json', 'jsonl', 'ndjson') else 'csv'
+
+
+def read_csv(stream):
+    """Yield (line number, row dict) from a binary CSV stream with a header row"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    if reader.fieldnames is None:
+        return
+    if not set(REQUIRED) <= {name.strip().lower() for name in reader.fieldnames if name}:
+        raise InvalidImport(f"CSV header must include {', '.join(REQUIRED)}")
+    try:
+        for row in reader:
+            yield reader.line_num, {(key or '').strip().lower(): value for key, value in row.items()}
+    except (csv.Error, UnicodeDecodeError) as error:
+        raise InvalidImport(f'Unreadable CSV after line {reader.line_num}: {error}')
+
+
+def read_json(stream, chunk_size=1 << 16, max_item=1 << 20):
+    """Yield (item number, object) from a JSON array or from JSON lines, without loading it whole.
+
+    Only the current chunk and at most one partly read item are held in
+    memory; an item that is still incomplete after `max_item` characters
+    means the file is broken.
+    """
+    decoder = json.JSONDecoder()
+    reader = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer, position, number, in_array, started = '', 0, 0, False, False
+    while True:
+        chunk = stream.read(chunk_size)
+        try:
+            buffer = buffer[position:] + reader.decode(chunk or b'', final=not chunk)
+        except UnicodeDecodeError as error:
+            raise InvalidImport(f'Invalid UTF-8 after item {number}: {error.reason}')
+        position = 0
+        while True:
+            # Skip whitespace and the array punctuation between items
+            while position < len(buffer) and (buffer[position].isspace() or
+                                              (in_array and buffer[position] in ',]')):
+                position += 1
+            if position == len(buffer):
+                break
+            if not started:
+                started = True
+                if buffer[position] == '[':
+                    in_array = True
+                    position += 1
+                    continue
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as error:
+                if chunk and len(buffer) - position < max_item:
+                    break  # the item continues in the next chunk
+                raise InvalidImport(f'Invalid JSON after item {number}: {error.msg}')
+            number += 1
+            position = end
+            yield number, item
+        if not chunk:
+            return
+
+
+def clean(row, lengths):
+    """(values, None) for a valid row, or (None, error message)"""
+    if not isinstance(row, dict):
+        return None, 'not an object'
+    values = {}
+    for field in FIELDS:
+        value = row.get(field)
+        value = '' if value is None else str(value).strip()
+        limit = lengths.get(field)
+        if limit and len(value) > limit:
+            return None, f'{field} is longer than {limit} characters'
+        values[field] = value
+    missing = [field for field in REQUIRED if not values[field]]
+    if missing:
+        return None, f"missing {', '.join(missing)}"
+    return values, None
+
+
+class ImportReport:
+    def __init__(self):
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    def error(self, number, message):
+        self.failed += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((number, message))
+
+    @property
+    def rate(self):
+        return self.inserted / self.seconds if self.seconds else 0.0
+
+
+def _valid_rows(rows, lengths, defaults, report, max_rows):
+    seen = 0
+    try:
+        for number, row in rows:
+            seen += 1
+            if max_rows is not None and seen > max_rows:
+                report.error(number, f'stopped: at most {max_rows} rows per import')
+                return
+            values, message = clean(row, lengths)
+            if message:
+                report.error(number, message)
+                continue
+            values['company'] = values['company'] or defaults.get('company') or ''
+            yield {**defaults, **values}
+    except InvalidImport as error:
+        # Keep the rows read before the file went bad
+        report.error(None, str(error))
+
+
+def _batches(rows, size):
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def column_defaults(table, exclude=()):
+    """Python-side column defaults of `table`, evaluated once.
+
+    Statements sent straight to the driver skip SQLAlchemy's defaults, so
+    they have to be supplied as values.
+    """
+    values = {}
+    for column in table.columns:
+        default = column.default
+        if column.key in exclude or default is None:
+            continue
+        if default.is_scalar:
+            values[column.key] = default.arg
+        elif default.is_callable:
+            values[column.key] = default.arg(None)
+    return values
+
+
+def import_jobs(session, model, rows, defaults, batch_size=1000, transaction_size=20000, max_rows=None,
+                wrap_transaction=None):
+    """Validate (number, row) pairs as they stream in and insert the good ones.
+
+    `defaults` fills columns the file doesn't set (recruiter_id, and the
+    company when a row has none). Valid rows go to the driver as one
+    executemany per `batch_size` rows, bypassing the ORM's per-row
+    bookkeeping, and are committed every `transaction_size` rows, so a
+    failure part way keeps what was already committed.
+    `wrap_transaction(session)`, if given, is a context manager entered
+    around the inserts of each transaction; since the ORM never sees these
+    inserts, it is where to mark caches and indexes that depend on the
+    table. Returns an ImportReport.
+    """
+    table = model.__table__
+    lengths = {column.key: column.type.length for column in table.columns
+               if getattr(column.type, 'length', None)}
+    dialect = session.get_bind().dialect
+    fixed = {**column_defaults(table, exclude=FIELDS), **defaults}
+    for key, value in fixed.items():
+        # Converted once here, as SQLAlchemy would per row (e.g. datetimes to SQLite text)
+        processor = table.c[key].type.bind_processor(dialect)
+        if processor is not None:
+            fixed[key] = processor(value)
+    # The compiled statement lists its columns in table order
+    keys = [column.key for column in table.columns if column.key in FIELDS or column.key in fixed]
+    statement = str(insert(table).compile(dialect=dialect, column_keys=keys))
+    report = ImportReport()
+    batches = _batches(_valid_rows(rows, lengths, fixed, report, max_rows), batch_size)
+    per_transaction = max(transaction_size // batch_size, 1)
+    started = time.perf_counter()
+
+    try:
+        batch = next(batches, None)
+        while batch is not None:
+            uncommitted = 0
+            with wrap_transaction(session) if wrap_transaction else nullcontext():
+                connection = session.connection()
+                for _ in range(per_transaction):
+                    connection.exec_driver_sql(statement, [tuple(row[key] for key in keys) for row in batch])
+                    uncommitted += len(batch)
+                    batch = next(batches, None)
+                    if batch is None:
+                        break
+            session.commit()
+            report.inserted += uncommitted
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        report.seconds = time.perf_counter() - started
+    return report
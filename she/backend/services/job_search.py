@@ -0,0 +1,173 @@
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from markupsafe import Markup, escape
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+import re
+
+# External-content FTS5 index over the searchable job columns. The jobs table
+# stays the source of truth; the triggers below keep the index in step with it.
+FTS_TABLE = 'jobs_fts'
+FTS_COLUMNS = ('title', 'description', 'requirements', 'location')
+TEXT_COLUMNS = ('title', 'description', 'requirements')
+
+# bm25() weights, in FTS_COLUMNS order: a hit in the title counts most
+COLUMN_WEIGHTS = (10.0, 2.0, 4.0, 1.0)
+
+# Control characters can't appear in form input, so they are safe markers
+# to swap for <mark> tags after the surrounding text has been escaped.
+_MARK_OPEN, _MARK_CLOSE = '\x02', '\x03'
+
+SearchHit = namedtuple('SearchHit', 'job_id score title snippet')
+
+_columns = ', '.join(FTS_COLUMNS)
+_new_values = ', '.join(f'new.{column}' for column in FTS_COLUMNS)
+_old_values = ', '.join(f'old.{column}' for column in FTS_COLUMNS)
+
+DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {_columns},
+        content='jobs', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE OF {_columns} ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END""",
+]
+
+
+def install(connection):
+    """Create the FTS index and its triggers, filling the index if it is new.
+
+    Returns False when this SQLite build has no FTS5 module.
+    """
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (FTS_TABLE,)).first() is not None
+    try:
+        for statement in DDL:
+            connection.exec_driver_sql(statement)
+    except OperationalError:
+        return False
+    if not exists:
+        rebuild(connection)
+    return True
+
+
+def rebuild(connection):
+    """Re-index every job from the jobs table"""
+    connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+@contextmanager
+def deferred_indexing(session):
+    """Index the jobs inserted inside the block in one pass, not by a trigger per row.
+
+    Meant for bulk imports, where the per-row trigger costs several times
+    the insert itself. The insert trigger is dropped and re-created within
+    the caller's transaction, which holds SQLite's write lock from the
+    DROP on, so no other writer can add a job the index misses, and a
+    rolled back import rolls the DROP back with it. Jobs updated or
+    deleted inside the block are still handled by their triggers.
+    `session` may also be a Connection. The caller commits.
+    """
+    connection = session if isinstance(session, Connection) else session.connection()
+    if not connection.connection.dbapi_connection.in_transaction:
+        # pysqlite only opens a transaction before INSERT/UPDATE/DELETE; the
+        # DROP would otherwise commit at once and outlive a failed import
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+    session.execute(text('DROP TRIGGER IF EXISTS jobs_fts_ai'))
+    try:
+        after = session.execute(text('SELECT coalesce(max(id), 0) FROM jobs')).scalar()
+        yield
+        session.execute(text(f"INSERT INTO {FTS_TABLE}(rowid, {_columns}) "
+                             f"SELECT id, {_columns} FROM jobs WHERE id > :after"), {'after': after})
+    finally:
+        session.execute(text(DDL[1]))
+
+
+def register(metadata):
+    """Install the FTS index whenever create_all() runs against SQLite"""
+    @event.listens_for(metadata, 'after_create')
+    def _install(target, connection, **kw):
+        if connection.dialect.name == 'sqlite':
+            install(connection)
+
+
+def is_available(session):
+    """True when the FTS index exists in the bound database"""
+    return session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': FTS_TABLE}).first() is not None
+
+
+def match_expression(query, columns=None):
+    """Turn free text into an FTS5 query: every word must match as a prefix.
+
+    Words are quoted so user input can never be parsed as FTS5 syntax.
+    """
+    terms = re.findall(r'\w+', query.lower())
+    if not terms:
+        return None
+    expression = ' '.join(f'"{term}"*' for term in terms)
+    if columns:
+        expression = f"{{{' '.join(columns)}}} : ({expression})"
+    return expression
+
+
+def search(session, query='', location='', limit=50, after=None):
+    """Rank active jobs with BM25.
+
+    Returns an OrderedDict of job id -> SearchHit, best match first. The
+    title and snippet of each hit are escaped Markup with matches wrapped
+    in <mark>. Pass `after` as the (bm25 score, job id) of the last hit
+    already shown to fetch the next page.
+    """
+    expressions = [expression for expression in (
+        match_expression(query, TEXT_COLUMNS),
+        match_expression(location, ('location',)),
+    ) if expression]
+    if not expressions:
+        return OrderedDict()
+
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    params = {
+        'match': ' AND '.join(f'({expression})' for expression in expressions),
+        'open': _MARK_OPEN,
+        'close': _MARK_CLOSE,
+        'limit': limit,
+    }
+    keyset = ''
+    if after and len(after) == 2:
+        keyset = f'AND (bm25({FTS_TABLE}, {weights}), {FTS_TABLE}.rowid) > (:after_score, :after_id)'
+        params['after_score'], params['after_id'] = after
+
+    rows = session.execute(text(f"""
+        SELECT {FTS_TABLE}.rowid,
+               bm25({FTS_TABLE}, {weights}) AS score,
+               highlight({FTS_TABLE}, 0, :open, :close),
+               snippet({FTS_TABLE}, -1, :open, :close, '…', 16)
+        FROM {FTS_TABLE}
+        JOIN jobs ON jobs.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH :match AND jobs.is_active = 1 {keyset}
+        ORDER BY score, {FTS_TABLE}.rowid
+        LIMIT :limit
+    """), params)
+    return OrderedDict(
+        (job_id, SearchHit(job_id, -score, _highlight(title), _highlight(snippet)))
+        for job_id, score, title, snippet in rows
+    )
+
+
+def _highlight(value):
+    html = str(escape(value or ''))
+    return Markup(html.replace(_MARK_OPEN, '<mark>').replace(_MARK_CLOSE, '</mark>'))
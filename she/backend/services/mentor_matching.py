@@ -0,0 +1,98 @@
+from .recommender import ItemIndex
+
+LEVELS = {'beginner': 0, 'basic': 1, 'intermediate': 2, 'advanced': 3}
+
+
+def level(skill_level):
+    """A learner's skill level on a 0..1 scale (unknown counts as basic)"""
+    return LEVELS.get((skill_level or '').strip().lower(), 1) / (len(LEVELS) - 1)
+
+
+def match(mentees, mentors, exclude=(), suggestions=3, candidates=10, experience_weight=0.15,
+          batch_size=2048, dimensions=1024, rounds=5):
+    """Suggest mentors to many learners at once, within each mentor's free capacity.
+
+    `mentees` are (id, interests text, skill level 0..1) and `mentors` are
+    (id, expertise text, experience years, free places). A pair scores
+    the TF-IDF cosine of interests against expertise, plus a bonus for
+    mentor experience that suits the learner's level, so advanced
+    learners lean towards senior mentors and beginners spread over the
+    rest. Pairs with nothing in common, and pairs in `exclude`, are never
+    suggested.
+
+    Scores are computed a batch of learners at a time as one matrix
+    product, keeping each learner's best `candidates`. Assignment is then
+    greedy over all kept pairs, best first: each learner gets at most one
+    assigned mentor and no mentor gets more learners than free places.
+    Learners whose candidates all filled up are scored again against the
+    mentors with room left, for up to `rounds` rounds. Returns
+    {mentee id: [(mentor id, score, assigned)]}, the assigned mentor
+    first, followed by alternatives that still had room.
+    """
+    index = ItemIndex(((mentor_id, text) for mentor_id, text, _, _ in mentors), dimensions)
+    np = index.np
+    if not mentees or not len(index):
+        return {}
+
+    idf, matrix = index.dense()
+    # Only buckets some mentor uses can score; the rest would multiply zeros
+    used = np.flatnonzero(matrix.any(axis=0))
+    matrix = matrix[:, used]
+    mentor_ids = index.ids
+    experience = np.array([min(years or 0, 20) / 20 for _, _, years, _ in mentors], np.float32)
+    remaining = [max(free, 0) for _, _, _, free in mentors]
+    exclude = set(exclude)
+    k = min(candidates, len(mentor_ids))
+
+    ranked, assigned = {}, {}
+    pending = list(mentees)
+    for _ in range(rounds):
+        closed = np.array(remaining) <= 0
+        if not pending or closed.all():
+            break
+        pair_scores, pair_mentees, pair_mentors = [], [], []
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            queries = np.vstack([index.vector(text) for _, text, _ in batch]) * idf
+            queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+            similarity = queries[:, used] @ matrix.T
+
+            levels = np.array([skill for _, _, skill in batch], np.float32)
+            scores = similarity + experience_weight * (1 - np.abs(levels[:, None] - experience[None, :]))
+            scores = np.where((similarity > 0) & ~closed, scores, -np.inf)
+
+            best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            order = np.argsort(-best_scores, axis=1, kind='stable')
+            best = np.take_along_axis(best, order, axis=1).tolist()
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            finite = np.isfinite(best_scores).tolist()
+            best_scores = best_scores.tolist()
+            for row, (mentee_id, _, _) in enumerate(batch):
+                kept = [(column, score) for column, score, ok in zip(best[row], best_scores[row], finite[row])
+                        if ok and (mentee_id, mentor_ids[column]) not in exclude]
+                ranked[mentee_id] = kept
+                for column, score in kept:
+                    pair_scores.append(score)
+                    pair_mentees.append(mentee_id)
+                    pair_mentors.append(column)
+
+        before = len(assigned)
+        for position in np.argsort(-np.array(pair_scores, np.float64), kind='stable').tolist():
+            mentee_id, column = pair_mentees[position], pair_mentors[position]
+            if mentee_id not in assigned and remaining[column] > 0:
+                assigned[mentee_id] = column
+                remaining[column] -= 1
+        if len(assigned) == before:
+            break
+        pending = [mentee for mentee in pending if mentee[0] not in assigned and ranked[mentee[0]]]
+
+    results = {}
+    for mentee_id, kept in ranked.items():
+        chosen = assigned.get(mentee_id)
+        picks = [(mentor_ids[column], score, True) for column, score in kept if column == chosen]
+        picks += [(mentor_ids[column], score, False) for column, score in kept
+                  if column != chosen and remaining[column] > 0][:suggestions - len(picks)]
+        if picks:
+            results[mentee_id] = picks
+    return results
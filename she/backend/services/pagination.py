@@ -0,0 +1,133 @@
+from flask import abort, current_app, request, url_for
+from sqlalchemy import literal, tuple_
+from datetime import datetime
+import base64
+import binascii
+import json
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(values):
+    """Pack sort-key values into an opaque, URL-safe token"""
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value
+                      for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, keys=None):
+    """Unpack a cursor, or return None if it is not valid.
+
+    With `keys`, values are checked against and converted to the key types
+    (None is allowed, for nullable keys).
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(values, list):
+        return None
+    if keys is None:
+        return values
+    if len(values) != len(keys):
+        return None
+    try:
+        return [_key_value(key, value) for key, value in zip(keys, values)]
+    except (TypeError, ValueError):
+        return None
+
+
+def _key_value(key, value):
+    python_type = key.type.python_type
+    if value is None:
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is float and type(value) is int:
+        return float(value)
+    if type(value) is not python_type:
+        raise TypeError(f'{key.key} cursor value is not a {python_type.__name__}')
+    return value
+
+
+def request_cursor(*keys):
+    """The cursor in the query string decoded against `keys`; None without one, 400 if invalid"""
+    token = request.args.get('cursor')
+    if not token:
+        return None
+    values = decode_cursor(token, keys)
+    if values is None:
+        abort(400)
+    return values
+
+
+def page_size():
+    """per_page from the query string, clamped to the configured bounds"""
+    default = current_app.config.get('PAGE_SIZE_DEFAULT', DEFAULT_PAGE_SIZE)
+    maximum = current_app.config.get('PAGE_SIZE_MAX', MAX_PAGE_SIZE)
+    size = request.args.get('per_page', default, type=int)
+    return max(1, min(size or default, maximum))
+
+
+class KeysetPage:
+    def __init__(self, items, next_cursor, per_page):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.per_page = per_page
+
+    @classmethod
+    def from_rows(cls, rows, per_page, cursor_values):
+        """Build a page from up to per_page + 1 rows fetched after a cursor"""
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = encode_cursor(cursor_values(rows[-1]))
+        return cls(rows, next_cursor, per_page)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def is_first(self):
+        return 'cursor' not in request.args
+
+    def next_url(self):
+        return self._url(cursor=self.next_cursor)
+
+    def first_url(self):
+        return self._url(cursor=None)
+
+    @staticmethod
+    def _url(**overrides):
+        args = request.args.to_dict()
+        args.update(request.view_args or {})
+        args.update(overrides)
+        return url_for(request.endpoint, **{k: v for k, v in args.items() if v is not None})
+
+
+def paginate(query, *keys, descending=False, cursor=None, per_page=None):
+    """Keyset-paginate an ORM query on the given sort keys.
+
+    The last key must be unique (normally the primary key) so the order is
+    total. Rows after the cursor are found with a row-value comparison that
+    the matching index can seek to, so every page costs the same as the
+    first one no matter how deep it is.
+    """
+    if cursor is None:
+        cursor = request.args.get('cursor')
+    if per_page is None:
+        per_page = page_size()
+
+    after = decode_cursor(cursor, keys) if cursor else None
+    if after is not None:
+        position = tuple_(*keys)
+        bound = tuple_(*[literal(value, key.type) for key, value in zip(keys, after)])
+        query = query.filter(position < bound if descending else position > bound)
+
+    order = [key.desc() for key in keys] if descending else list(keys)
+    rows = query.order_by(*order).limit(per_page + 1).all()
+    return KeysetPage.from_rows(rows, per_page,
+                                lambda row: [getattr(row, key.key) for key in keys])
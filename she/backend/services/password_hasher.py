@@ -0,0 +1,159 @@
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+
+class HashingBusy(RuntimeError):
+    """Raised when too many password hashes are already queued, or one takes too long"""
+
+
+class PasswordHasher:
+    """Runs werkzeug password hashing in a bounded process pool.
+
+    hashlib's scrypt and PBKDF2 release the GIL, but each hash still keeps
+    a core busy for tens of milliseconds, so a burst of logins hashed in
+    request threads takes every core from the pages being served. Here
+    they run in PASSWORD_HASH_WORKERS child processes; at most
+    PASSWORD_HASH_MAX_QUEUE hashes may be in flight per worker, beyond
+    which callers get HashingBusy instead of piling up. With
+    PASSWORD_HASH_WORKERS = 0 hashing runs inline.
+
+    The pool is per server worker, so the machine runs (server workers) x
+    PASSWORD_HASH_WORKERS hashing processes; with gunicorn's 2n+1 workers
+    the default of 1 already gives about two per core.
+    """
+
+    def __init__(self, app=None):
+        self.method = DEFAULT_METHOD
+        self.salt_length = 16
+        self.workers = 0
+        self.timeout = 10
+        self._prefix = None
+        self._slots = None
+        self._pool = None
+        self._pool_pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+        app.config.setdefault('PASSWORD_SALT_LENGTH', 16)
+        app.config.setdefault('PASSWORD_HASH_WORKERS', 1)
+        app.config.setdefault('PASSWORD_HASH_MAX_QUEUE', None)
+        app.config.setdefault('PASSWORD_HASH_TIMEOUT', 10)
+
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self.salt_length = app.config['PASSWORD_SALT_LENGTH']
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        self._prefix = None
+        max_queue = app.config['PASSWORD_HASH_MAX_QUEUE'] or max(self.workers, 1) * 4
+        self._slots = threading.BoundedSemaphore(max_queue)
+        app.extensions['password_hasher'] = self
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password,
+                         method=self.method, salt_length=self.salt_length)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """True when a stored hash was made with other parameters than configured"""
+        if self._prefix is None:
+            # 'pbkdf2' is stored as 'pbkdf2:sha256:<iterations>', so compare
+            # against what werkzeug actually writes for the configured method
+            self._prefix = generate_password_hash('', method=self.method, salt_length=1).split('$', 1)[0]
+        return pwhash.split('$', 1)[0] != self._prefix
+
+    def _executor(self):
+        # Pools don't survive fork, so each worker process builds its own
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def _submit(self, func, *args, **kwargs):
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HashingBusy('Password hashing queue is full')
+        try:
+            future = self._executor().submit(func, *args, **kwargs)
+        except BaseException:
+            slots.release()
+            raise
+        # A caller that times out stops waiting, but its hash keeps a pool
+        # process busy; the slot is only free once the hash is done
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def _run(self, func, *args, **kwargs):
+        if not self.workers:
+            return func(*args, **kwargs)
+        try:
+            return self._submit(func, *args, **kwargs).result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HashingBusy(f'Password hashing took over {self.timeout}s') from None
+        except BrokenProcessPool:
+            logger.exception('Password hashing pool died, hashing inline')
+            with self._lock:
+                self._pool = None
+            return func(*args, **kwargs)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None and self._pool_pid == os.getpid():
+                self._pool.shutdown()
+            self._pool = None
+
+
+def benchmark(hasher, logins=200, concurrency=None):
+    """Verify one password `logins` times from `concurrency` threads.
+
+    Returns the throughput overall and per pool worker, the figure to size
+    PASSWORD_HASH_WORKERS and the hash cost against.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = hasher.workers or 1
+    concurrency = concurrency or workers * 2
+    pwhash = hasher.hash('benchmark-password')
+    hasher.verify(pwhash, 'benchmark-password')  # start the pool outside the timing
+
+    def login(_):
+        try:
+            return hasher.verify(pwhash, 'benchmark-password')
+        except HashingBusy:
+            return None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as threads:
+        results = list(threads.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+
+    completed = sum(1 for result in results if result)
+    return {
+        'method': hasher.method,
+        'workers': workers,
+        'concurrency': concurrency,
+        'logins': completed,
+        'rejected': results.count(None),
+        'seconds': elapsed,
+        'logins_per_sec': completed / elapsed,
+        'logins_per_sec_per_core': completed / elapsed / workers,
+    }
+
+
+# Shared instance used by User.set_password/check_password; configured by
+# init_app, and hashes inline until then.
+passwords = PasswordHasher()
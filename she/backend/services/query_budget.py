@@ -0,0 +1,73 @@
+from flask import g, current_app, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised when a request issues more SQL statements than its budget allows"""
+
+
+def query_budget(limit):
+    """Set the maximum number of SQL statements a view may issue per request"""
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+class QueryBudget:
+    """Count SQL statements per request and fail routes that go over budget.
+
+    Counting is active when QUERY_BUDGET_ENABLED is set, or by default when the
+    app runs in debug or testing mode. Views decorated with @query_budget(n)
+    use their own limit, everything else falls back to QUERY_BUDGET_DEFAULT.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('QUERY_BUDGET_ENABLED', None)
+        app.config.setdefault('QUERY_BUDGET_DEFAULT', 20)
+        app.config.setdefault('QUERY_BUDGET_RAISE', True)
+
+        if not event.contains(Engine, 'before_cursor_execute', self._count_query):
+            event.listen(Engine, 'before_cursor_execute', self._count_query)
+        app.before_request(self._start)
+        app.after_request(self._check)
+
+    @staticmethod
+    def is_enabled(app):
+        enabled = app.config['QUERY_BUDGET_ENABLED']
+        if enabled is None:
+            return app.debug or app.testing
+        return enabled
+
+    def _start(self):
+        if self.is_enabled(current_app):
+            g.query_count = 0
+
+    @staticmethod
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and 'query_count' in g:
+            g.query_count += 1
+
+    def _check(self, response):
+        if 'query_count' not in g:
+            return response
+
+        count = g.pop('query_count')
+        view = current_app.view_functions.get(request.endpoint)
+        limit = getattr(view, 'query_budget', current_app.config['QUERY_BUDGET_DEFAULT'])
+        response.headers['X-Query-Count'] = str(count)
+
+        if count > limit:
+            message = f'{request.endpoint} issued {count} queries (budget {limit})'
+            if current_app.config['QUERY_BUDGET_RAISE']:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
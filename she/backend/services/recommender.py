@@ -0,0 +1,287 @@
+from flask import current_app
+from functools import lru_cache
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+STOP_WORDS = frozenset('''a an and are as at be by for from has have in is it its of on or our that
+the this to was we will with you your'''.split())
+
+
+def tokens(text):
+    return [token for token in TOKEN.findall((text or '').lower()) if token not in STOP_WORDS]
+
+
+def document(*fields):
+    """Join the text fields of an item or a profile into one document"""
+    return ' '.join(str(field) for field in fields if field)
+
+
+@lru_cache(maxsize=65536)
+def bucket(token, dimensions):
+    # Python's hash() differs per process; workers must agree on buckets
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little') % dimensions
+
+
+def term_frequencies(text, dimensions):
+    """Sublinear term frequencies of `text` as {bucket: tf}, bucketed by a stable hash"""
+    counts = {}
+    for token in tokens(text):
+        column = bucket(token, dimensions)
+        counts[column] = counts.get(column, 0) + 1
+    return {column: 1 + math.log(count) for column, count in counts.items()}
+
+
+class ItemIndex:
+    """Hashed TF-IDF vectors of one kind of item, as an inverted index.
+
+    Terms are hashed into `dimensions` buckets instead of being looked up
+    in a vocabulary. Only the L2-normalised TF-IDF weights of the terms
+    an item actually has are kept, as postings (item row, weight) sorted
+    by bucket, so memory grows with the text rather than with items ×
+    dimensions, and scoring a profile reads the postings of its own
+    terms only. An index is never changed once built; the Recommender
+    builds a new one when the items change and swaps it in.
+    """
+
+    def __init__(self, items, dimensions=1024):
+        import numpy as np
+
+        self.np = np
+        self.dimensions = dimensions
+        ids, rows, columns, tf = [], [], [], []
+        for row, (item_id, text) in enumerate(items):
+            ids.append(item_id)
+            for column, frequency in term_frequencies(text, dimensions).items():
+                rows.append(row)
+                columns.append(column)
+                tf.append(frequency)
+        rows = np.array(rows, np.int32)
+        columns = np.array(columns, np.int32)
+
+        df = np.bincount(columns, minlength=dimensions)
+        self.idf = (np.log((1 + len(ids)) / (1 + df)) + 1).astype(np.float32)
+        weights = np.array(tf, np.float32) * self.idf[columns]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(ids)))
+        weights /= np.maximum(norms, 1e-12).astype(np.float32)[rows]
+
+        order = np.argsort(columns, kind='stable')
+        self.ids = ids
+        self.rows, self.weights = rows[order], weights[order]
+        # Postings of bucket b are rows/weights[offsets[b]:offsets[b + 1]]
+        self.offsets = np.concatenate(([0], np.cumsum(df)))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def vector(self, text):
+        """Sublinear term frequencies of `text` as a dense row"""
+        row = self.np.zeros(self.dimensions, self.np.float32)
+        for column, frequency in term_frequencies(text, self.dimensions).items():
+            row[column] = frequency
+        return row
+
+    def dense(self):
+        """(idf, normalised TF-IDF matrix) as dense arrays, to score many queries at once.
+
+        The matrix is items × dimensions, so this is for small sets such
+        as one job's applicants, not for a whole catalogue.
+        """
+        np = self.np
+        matrix = np.zeros((len(self.ids), self.dimensions), np.float32)
+        matrix[self.rows, np.repeat(np.arange(self.dimensions), np.diff(self.offsets))] = self.weights
+        return self.idf, matrix
+
+    def top_k(self, profiles, k=10):
+        """Best item ids for each profile text, best first.
+
+        Items with no term in common with a profile are left out, so an
+        empty profile gets an empty list.
+        """
+        np = self.np
+        results = []
+        for profile in profiles:
+            query = {column: frequency * self.idf[column]
+                     for column, frequency in term_frequencies(profile, self.dimensions).items()}
+            norm = math.sqrt(sum(weight * weight for weight in query.values()))
+            spans = [(self.offsets[column], self.offsets[column + 1], weight / norm)
+                     for column, weight in query.items()]
+            if not spans or all(start == end for start, end, _ in spans):
+                results.append([])
+                continue
+
+            rows = np.concatenate([self.rows[start:end] for start, end, _ in spans])
+            contributions = np.concatenate([self.weights[start:end] * weight for start, end, weight in spans])
+            # Only items sharing a term with the profile get a score at all
+            candidates, positions = np.unique(rows, return_inverse=True)
+            scores = np.bincount(positions, weights=contributions)
+
+            count = min(k, len(candidates))
+            best = np.argpartition(-scores, count - 1)[:count]
+            ranked = best[np.lexsort((candidates[best], -scores[best]))]
+            results.append([self.ids[candidates[position]] for position in ranked if scores[position] > 0])
+        return results
+
+
+class _Unranked(Exception):
+    def __init__(self, ids):
+        self.ids = ids
+
+
+class Recommender:
+    """Personalised course and job picks for learners.
+
+    Sources are registered with source(kind, namespace, load), where load()
+    returns (id, text) pairs of everything recommendable and `namespace`
+    moves only when that text does. A user's top RECOMMENDER_TOP_K item
+    ids are cached in the shared VersionedCache, keyed on their profile
+    text, until the namespace is bumped.
+
+    Indexes are built off the request path: by build()/load_all() (e.g.
+    in the server's master before it forks, or by `flask
+    warm-recommendations`), or by a background thread when a request
+    finds the process's index missing or behind its namespace. Until
+    then requests rank with the index they have, without caching the
+    result, or get None.
+
+    NumPy is imported on first use; without it recommend() returns None
+    and callers show their unpersonalised lists.
+    """
+
+    def __init__(self, app=None):
+        self.sources = {}
+        self.indexes = {}
+        self.available = None
+        self.dimensions = 1024
+        self.top = 10
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RECOMMENDER_DIMENSIONS', 1024)
+        app.config.setdefault('RECOMMENDER_TOP_K', 10)
+
+        self.dimensions = app.config['RECOMMENDER_DIMENSIONS']
+        self.top = app.config['RECOMMENDER_TOP_K']
+        self.indexes = {}
+        app.extensions['recommender'] = self
+
+    def source(self, kind, namespace, load):
+        self.sources[kind] = (namespace, load)
+
+    def _numpy(self):
+        if self.available is None:
+            try:
+                import numpy  # noqa: F401
+                self.available = True
+            except ImportError:
+                logger.warning('NumPy is not installed, recommendations are disabled')
+                self.available = False
+        return self.available
+
+    def build(self, kind):
+        """Build the index of `kind` from its source and swap it in; returns it"""
+        if not self._numpy():
+            return None
+        indexes = self.indexes
+        namespace, load = self.sources[kind]
+        # Read the version before loading, so a commit in between leaves
+        # the index marked stale rather than passing for current
+        version = current_app.extensions['cache'].version(namespace)
+        started = time.perf_counter()
+        index = ItemIndex(load(), self.dimensions)
+        # One assignment, so readers see the old (version, index) or the new one
+        indexes[kind] = (version, index)
+        logger.info('Indexed %d %s in %.3fs', len(index), kind, time.perf_counter() - started)
+        return index
+
+    def load_all(self):
+        """Build every source's index, e.g. in a server's master before it forks workers"""
+        for kind in self.sources:
+            try:
+                self.build(kind)
+            except Exception:
+                logger.exception('Could not index %s; requests will index them in the background', kind)
+
+    def index(self, kind):
+        """(index, current) for `kind`; never builds on the caller's thread.
+
+        `index` is the last one built in this process, or None. When it is
+        missing or behind the namespace, a rebuild starts in the background.
+        """
+        if not self._numpy():
+            return None, False
+        namespace, _ = self.sources[kind]
+        version, index = self.indexes.get(kind, (None, None))
+        current = current_app.extensions['cache'].version(namespace)
+        if index is not None and version is not None and version == current:
+            return index, True
+        if current is not None or index is None:
+            self._refresh(kind)
+        return index, False
+
+    def _refresh(self, kind):
+        with self._lock:
+            if kind in self._refreshing:
+                return
+            self._refreshing.add(kind)
+        app, indexes = current_app._get_current_object(), self.indexes
+
+        def run():
+            try:
+                with app.app_context():
+                    # An app built since (e.g. by tests) starts with its own indexes
+                    if self.indexes is indexes:
+                        self.build(kind)
+            except Exception:
+                logger.exception('Could not rebuild the %s index', kind)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(kind)
+
+        threading.Thread(target=run, name=f'recommender-{kind}', daemon=True).start()
+
+    def _key(self, user_id, profile):
+        return f"recommended:{user_id}:{hashlib.sha1(profile.encode()).hexdigest()[:16]}"
+
+    def recommend(self, kind, user_id, profile):
+        """Ranked ids of `kind` for one user, cached until the items or the profile change.
+
+        Returns None while this process has no index of `kind` yet.
+        """
+        if self.available is False:
+            return None
+        namespace, _ = self.sources[kind]
+
+        def load():
+            index, current = self.index(kind)
+            ids = None if index is None else index.top_k([profile], self.top)[0]
+            if not current:
+                raise _Unranked(ids)
+            return ids
+
+        try:
+            return current_app.extensions['cache'].get_or_set(namespace, self._key(user_id, profile), load)
+        except _Unranked as unranked:
+            return unranked.ids
+
+    def warm(self, kind, users):
+        """Build the index of `kind` and cache the picks of many (user_id, profile) pairs"""
+        index = self.build(kind)
+        if index is None:
+            return 0
+        namespace, _ = self.sources[kind]
+        cache = current_app.extensions['cache']
+        done = 0
+        for user_id, profile in users:
+            cache.get_or_set(namespace, self._key(user_id, profile), lambda: index.top_k([profile], self.top)[0])
+            done += 1
+        return done
@@ -0,0 +1,198 @@
+from collections import namedtuple
+from math import ceil
+import json
+import platform
+import sqlite3
+import time
+import tracemalloc
+
+PERCENTILES = (50, 95, 99)
+
+# Browsers ask for compressed pages, so the timings include compressing them
+HEADERS = {'Accept-Encoding': 'gzip, br'}
+
+# role is the account the request is made as (None: a fresh anonymous
+# client every time); expect is the status a healthy response has
+Case = namedtuple('Case', 'name role method path data expect')
+
+
+class BenchmarkError(RuntimeError):
+    """A route answered with an unexpected status, so its timings mean nothing"""
+
+
+def fixtures(connection):
+    """Pick the accounts and ids the cases use from a seeded database.
+
+    The busiest of each: the job with the most applications (and its
+    recruiter), the mentor with the most accepted mentees, and a learner
+    with an unfinished enrollment. The choice is deterministic, so runs on
+    the same snapshot exercise the same rows.
+    """
+    def one(sql):
+        row = connection.exec_driver_sql(sql).first()
+        if row is None:
+            raise BenchmarkError(f'No rows for: {sql}; seed the database first (flask seed)')
+        return row
+
+    job_id, recruiter_id = one("SELECT id, recruiter_id FROM jobs "
+                               "ORDER BY applications_count DESC, id LIMIT 1")
+    mentor_id, = one("SELECT u.id FROM users u LEFT JOIN mentorships m "
+                     "ON m.mentor_id = u.id AND m.status = 'accepted' WHERE u.role = 'mentor' "
+                     "GROUP BY u.id ORDER BY count(m.id) DESC, u.id LIMIT 1")
+    learner_id, course_id = one("SELECT p.user_id, p.course_id FROM progress p "
+                                "JOIN users u ON u.id = p.user_id "
+                                "WHERE u.role = 'women' AND NOT p.completed ORDER BY p.id LIMIT 1")
+    emails = {}
+    for role, user_id in (('women', learner_id), ('mentor', mentor_id), ('recruiter', recruiter_id)):
+        emails[role], = one(f'SELECT email FROM users WHERE id = {int(user_id)}')
+    return {'emails': emails, 'job_id': job_id, 'course_id': course_id}
+
+
+def cases(fixture, password):
+    """The routes to time, in the order they run"""
+    return [
+        Case('login', None, 'POST', '/login',
+             {'email': fixture['emails']['women'], 'password': password}, 302),
+        Case('dashboard (learner)', 'women', 'GET', '/dashboard', None, 200),
+        Case('dashboard (mentor)', 'mentor', 'GET', '/dashboard', None, 200),
+        Case('dashboard (recruiter)', 'recruiter', 'GET', '/dashboard', None, 200),
+        Case('courses', 'women', 'GET', '/courses', None, 200),
+        Case('jobs', 'women', 'GET', '/jobs', None, 200),
+        Case('jobs search', 'women', 'GET', '/jobs?q=python&location=Bengaluru', None, 200),
+        Case('mentors', 'women', 'GET', '/mentors', None, 200),
+        Case('view-applicants', 'recruiter', 'GET', f"/view-applicants/{fixture['job_id']}", None, 200),
+        # Under 100%, so no certificate is issued on every round
+        Case('update-progress', 'women', 'POST', f"/update-progress/{fixture['course_id']}",
+             {'percentage': '50'}, 302),
+    ]
+
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of an already sorted list"""
+    return ordered[max(ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+def _login(app, email, password):
+    client = app.test_client()
+    response = client.post('/login', data={'email': email, 'password': password})
+    if response.status_code != 302:
+        raise BenchmarkError(f'Could not log in as {email}')
+    return client
+
+
+def _request(client, case):
+    response = client.open(case.path, method=case.method, data=case.data, headers=HEADERS)
+    response.close()
+    if response.status_code != case.expect:
+        raise BenchmarkError(f'{case.method} {case.path} answered {response.status_code}, '
+                             f'expected {case.expect}')
+    return int(response.headers.get('X-Query-Count', 0))
+
+
+def measure(app, case, client, rounds, warmup, memory_rounds):
+    """Time one case; returns its latency percentiles, query count and peak memory.
+
+    Latency comes from `rounds` requests after `warmup` untimed ones, which
+    fill the caches and the recommender as a running worker would have.
+    tracemalloc slows Python down several times, so peak memory is taken
+    in its own `memory_rounds` requests after the timed ones.
+    """
+    client_for = (lambda: app.test_client()) if case.role is None else (lambda: client)
+    for _ in range(warmup):
+        _request(client_for(), case)
+
+    timings, queries = [], 0
+    for _ in range(rounds):
+        current = client_for()
+        started = time.perf_counter()
+        count = _request(current, case)
+        timings.append(time.perf_counter() - started)
+        queries = max(queries, count)
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(memory_rounds):
+            current = client_for()
+            tracemalloc.reset_peak()
+            _request(current, case)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    result = {f'p{p}_ms': round(percentile(timings, p) * 1000, 3) for p in PERCENTILES}
+    result.update(mean_ms=round(sum(timings) / len(timings) * 1000, 3), queries=queries,
+                  peak_kib=round(peak / 1024, 1))
+    return result
+
+
+def run(app, password='password', rounds=100, warmup=10, memory_rounds=5, only=None):
+    """Drive every case through the test client of `app` and collect the results.
+
+    `app` should be a testing app on a scratch copy of a seeded database:
+    update-progress writes to it, and testing mode is what turns on the
+    X-Query-Count header (and fails a route that goes over its query
+    budget). `only`, if given, is a collection of case names to run.
+    """
+    with app.app_context():
+        db = app.extensions['sqlalchemy']
+        with db.engine.connect() as connection:
+            fixture = fixtures(connection)
+            users = connection.exec_driver_sql('SELECT count(*) FROM users').scalar()
+            jobs = connection.exec_driver_sql('SELECT count(*) FROM jobs').scalar()
+            applications = connection.exec_driver_sql('SELECT count(*) FROM applications').scalar()
+
+    clients = {role: _login(app, email, password) for role, email in fixture['emails'].items()}
+    selected = cases(fixture, password)
+    unknown = set(only or ()) - {case.name for case in selected}
+    if unknown:
+        raise BenchmarkError(f"Unknown route(s): {', '.join(sorted(unknown))}")
+    routes = {}
+    for case in selected:
+        if only and case.name not in only:
+            continue
+        routes[case.name] = measure(app, case, clients.get(case.role), rounds, warmup, memory_rounds)
+    return {
+        'meta': {
+            'rounds': rounds, 'warmup': warmup, 'memory_rounds': memory_rounds,
+            'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version,
+            'users': users, 'jobs': jobs, 'applications': applications,
+        },
+        'routes': routes,
+    }
+
+
+def compare(results, baseline, tolerance=0.5, noise_ms=2.0):
+    """Regressions of `results` against `baseline`, as (route, metric, before, after).
+
+    p95 latency and peak memory may grow by `tolerance` (a fraction)
+    before they count, and latency must also have grown by more than
+    `noise_ms`; a few-millisecond route can swing by half between two runs
+    on a busy machine. Query counts don't jitter, so any increase counts.
+    Routes missing from either side are skipped.
+    """
+    regressions = []
+    for name, before in baseline.get('routes', {}).items():
+        after = results['routes'].get(name)
+        if after is None:
+            continue
+        if (after['p95_ms'] > before['p95_ms'] * (1 + tolerance) and
+                after['p95_ms'] - before['p95_ms'] > noise_ms):
+            regressions.append((name, 'p95_ms', before['p95_ms'], after['p95_ms']))
+        if after['queries'] > before['queries']:
+            regressions.append((name, 'queries', before['queries'], after['queries']))
+        if after['peak_kib'] > before['peak_kib'] * (1 + tolerance):
+            regressions.append((name, 'peak_kib', before['peak_kib'], after['peak_kib']))
+    return regressions
+
+
+def load(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def save(results, path):
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(results, handle, indent=2)
+        handle.write('\n')
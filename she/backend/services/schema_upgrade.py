@@ -0,0 +1,52 @@
+from sqlalchemy import literal
+from sqlalchemy.schema import CreateColumn
+
+
+class UnsupportedUpgrade(RuntimeError):
+    """A declared column can't be added to an existing table in place"""
+
+
+def missing_columns(connection, metadata):
+    """(table, column) for every declared column an existing table lacks"""
+    existing_tables = {row[0] for row in connection.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'table'")}
+    missing = []
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue  # create_all() builds it whole
+        existing = {row[1] for row in connection.exec_driver_sql(f'PRAGMA table_info("{table.name}")')}
+        missing.extend((table, column) for column in table.columns if column.name not in existing)
+    return missing
+
+
+def column_ddl(column, dialect):
+    """The column definition for ALTER TABLE ... ADD COLUMN.
+
+    SQLite only adds a NOT NULL column with a default to fill the existing
+    rows, so a scalar Python default is written into the DDL as well.
+    """
+    ddl = str(CreateColumn(column).compile(dialect=dialect))
+    if column.primary_key:
+        raise UnsupportedUpgrade(f'{column.table.name}.{column.name} is part of the primary key')
+    if not column.nullable and column.server_default is None:
+        default = column.default
+        if default is None or not default.is_scalar:
+            raise UnsupportedUpgrade(f'{column.table.name}.{column.name} is NOT NULL without a default')
+        value = literal(default.arg, column.type).compile(dialect=dialect,
+                                                          compile_kwargs={'literal_binds': True})
+        ddl += f' DEFAULT {value}'
+    return ddl
+
+
+def add_missing_columns(connection, metadata):
+    """Add declared columns that existing tables lack; returns their 'table.column' names.
+
+    db.create_all() creates missing tables but never alters existing ones,
+    so databases created before a column was declared never get it.
+    """
+    added = []
+    for table, column in missing_columns(connection, metadata):
+        connection.exec_driver_sql(
+            f'ALTER TABLE "{table.name}" ADD COLUMN {column_ddl(column, connection.dialect)}')
+        added.append(f'{table.name}.{column.name}')
+    return added
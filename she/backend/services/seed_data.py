@@ -0,0 +1,366 @@
+from array import array
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from sqlalchemy import DateTime, insert
+from sqlalchemy.schema import CreateIndex, DropIndex
+import os
+import random
+import sqlite3
+import time
+
+from . import job_search
+
+FIRST_NAMES = ('Aanya', 'Priya', 'Meera', 'Ananya', 'Kavya', 'Divya', 'Sneha', 'Riya', 'Ishita', 'Pooja',
+               'Lakshmi', 'Fatima', 'Zara', 'Neha', 'Sara', 'Aisha', 'Nandini', 'Shreya', 'Tanvi', 'Maya',
+               'Rahul', 'Arjun', 'Vikram', 'Karan', 'Rohan', 'Sanjay', 'Anil', 'Deepak')
+LAST_NAMES = ('Sharma', 'Iyer', 'Nair', 'Reddy', 'Gupta', 'Patel', 'Menon', 'Khan', 'Das', 'Singh',
+              'Pillai', 'Rao', 'Joshi', 'Kulkarni', 'Bose', 'Fernandes', 'Mehta', 'Varma', 'Chopra', 'Ali')
+CITIES = ('Bengaluru', 'Chennai', 'Hyderabad', 'Pune', 'Mumbai', 'Delhi', 'Kochi', 'Kolkata', 'Jaipur',
+          'Ahmedabad', 'Coimbatore', 'Remote')
+EDUCATION = ('High School', 'Diploma', 'B.A.', 'B.Com', 'B.Sc', 'B.Tech', 'BCA', 'MBA', 'M.Sc', 'M.Tech')
+SKILL_LEVELS = ('beginner', 'basic', 'intermediate', 'advanced')
+SKILLS = ('python', 'javascript', 'html', 'css', 'sql', 'excel', 'data analysis', 'machine learning',
+          'statistics', 'tableau', 'power bi', 'java', 'react', 'django', 'flask', 'cloud', 'aws',
+          'cybersecurity', 'ui design', 'ux research', 'figma', 'canva', 'digital marketing', 'seo',
+          'content writing', 'social media', 'sales', 'accounting', 'finance', 'tally', 'hr',
+          'recruitment', 'project management', 'leadership', 'communication', 'public speaking',
+          'customer support', 'tailoring', 'entrepreneurship', 'photography')
+SUBJECTS = (('Web Development', 'Technology'), ('Python Programming', 'Technology'),
+            ('Data Analysis', 'Technology'), ('Cloud Computing', 'Technology'),
+            ('Cybersecurity Basics', 'Technology'), ('Digital Marketing', 'Marketing'),
+            ('Social Media Strategy', 'Marketing'), ('Content Writing', 'Marketing'),
+            ('Graphic Design', 'Design'), ('UX Design', 'Design'), ('Financial Literacy', 'Finance'),
+            ('Accounting with Tally', 'Finance'), ('Leadership & Communication', 'Personal Development'),
+            ('Public Speaking', 'Personal Development'), ('Entrepreneurship', 'Business'),
+            ('Project Management', 'Business'), ('Spoken English', 'Personal Development'))
+COURSE_LEVELS = ('Beginner', 'Intermediate', 'Advanced')
+COMPANIES = ('Lotus Tech', 'Saffron Labs', 'Indus Analytics', 'Banyan Systems', 'Peacock Media',
+             'Monsoon Finance', 'Jasmine Retail', 'Kaveri Health', 'Ganga Logistics', 'Nilgiri Software',
+             'Marigold Design', 'Teal Ventures')
+JOB_TITLES = ('Software Developer', 'Frontend Developer', 'Data Analyst', 'Business Analyst',
+              'Marketing Executive', 'Content Writer', 'UI/UX Designer', 'HR Associate', 'Accountant',
+              'Customer Success Associate', 'Project Coordinator', 'QA Engineer', 'Cloud Engineer',
+              'Sales Executive', 'Social Media Manager')
+POSITIONS = ('HR Manager', 'Talent Partner', 'Recruiter', 'Hiring Manager', 'Founder')
+
+# Every timestamp falls within the year after EPOCH, so runs don't depend on the clock
+EPOCH = datetime(2025, 1, 1)
+SPAN = 365 * 24 * 3600
+
+# Each table is written with these columns, in table order; the rest are left to their defaults
+COLUMNS = {
+    'users': ('id', 'name', 'email', 'password_hash', 'phone', 'location', 'education', 'skill_level',
+              'role', 'created_at', 'interests', 'completed_courses', 'expertise', 'experience_years',
+              'company', 'position'),
+    'tags': ('id', 'name'),
+    'user_tags': ('user_id', 'tag_id', 'kind'),
+    'courses': ('id', 'title', 'description', 'category', 'level', 'duration', 'mentor_id', 'created_at',
+                'thumbnail', 'price'),
+    'jobs': ('id', 'title', 'description', 'company', 'location', 'requirements', 'salary_range',
+             'recruiter_id', 'posted_at', 'is_active', 'applications_count', 'pending_count',
+             'reviewed_count', 'shortlisted_count', 'rejected_count'),
+    'applications': ('user_id', 'job_id', 'status', 'applied_at'),
+    'mentorships': ('mentee_id', 'mentor_id', 'status', 'requested_at', 'scheduled_date'),
+    'mentor_matches': ('mentee_id', 'mentor_id', 'rank', 'score', 'assigned', 'created_at'),
+    'progress': ('user_id', 'course_id', 'progress_percentage', 'completed', 'certificate_issued',
+                 'last_accessed', 'started_at', 'completed_at'),
+    'certificates': ('id', 'user_id', 'course_id', 'certificate_number', 'issued_date'),
+    'certificate_jobs': ('certificate_id', 'status', 'attempts', 'run_after', 'created_at', 'finished_at'),
+}
+
+# Cumulative odds of each application status
+APPLICATION_ODDS = ((0.6, 'pending'), (0.8, 'reviewed'), (0.9, 'shortlisted'), (1.0, 'rejected'))
+MENTORSHIP_ODDS = ((0.4, 'pending'), (0.75, 'accepted'), (0.85, 'rejected'), (1.0, 'completed'))
+
+
+def populated_tables(connection):
+    """The seeded tables that already have rows.
+
+    The seeder assigns ids from 1 and commits as it goes, so it only runs
+    on an empty database; any existing row could clash halfway through.
+    """
+    return [table for table in COLUMNS
+            if connection.exec_driver_sql(f'SELECT 1 FROM "{table}" LIMIT 1').first() is not None]
+
+
+def _pick(odds, roll):
+    for limit, value in odds:
+        if roll < limit:
+            return value
+    return odds[-1][1]
+
+
+class Seeder:
+    """Deterministic synthetic data for every table, written with bulk inserts.
+
+    The same `seed` and sizes always produce the same rows, apart from
+    the shared password hash, which is salted afresh each run. Ids are
+    assigned here, so foreign keys are known without reading anything
+    back. Rows go to the driver as one executemany per `batch_size`, and
+    the transaction is committed every `commit_every` rows to keep the
+    WAL small. Secondary indexes are dropped while loading and built once
+    at the end, and jobs are added to the search index in one pass; both
+    are far cheaper than keeping them up to date row by row.
+    """
+
+    def __init__(self, connection, metadata, seed=1, password_hash='', batch_size=10000,
+                 commit_every=200000, progress=None):
+        self.connection = connection
+        self.tables = metadata.tables
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.password_hash = password_hash
+        self.batch_size = batch_size
+        self.commit_every = commit_every
+        self.progress = progress
+        self.counts = {}
+        self._statements = {}
+        self._uncommitted = 0
+        # A pool of timestamps already in the database's format, so millions of
+        # rows don't each pay for date arithmetic and formatting
+        to_db = DateTime().bind_processor(connection.dialect) or (lambda value: value)
+        self._stamps = sorted(to_db(EPOCH + timedelta(seconds=self.rng.randrange(SPAN)))
+                              for _ in range(4096))
+        self.tag_ids = {name: tag_id for tag_id, name in
+                        enumerate(sorted({*SKILLS, *(subject.lower() for subject, _ in SUBJECTS)}), 1)}
+
+    def stamp(self):
+        return self._stamps[self.rng.randrange(len(self._stamps))]
+
+    def write(self, name, rows):
+        """Insert rows (tuples in COLUMNS[name] order) with one executemany"""
+        if not rows:
+            return
+        statement = self._statements.get(name)
+        if statement is None:
+            table, columns = self.tables[name], COLUMNS[name]
+            if [column.key for column in table.columns if column.key in columns] != list(columns):
+                raise ValueError(f'COLUMNS[{name!r}] is not in table order')
+            statement = self._statements[name] = str(
+                insert(table).compile(dialect=self.connection.dialect, column_keys=columns))
+        self.connection.exec_driver_sql(statement, rows)
+        self.counts[name] = self.counts.get(name, 0) + len(rows)
+        self._uncommitted += len(rows)
+        if self.commit_every and self._uncommitted >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        self.connection.commit()
+        self._uncommitted = 0
+
+    def _timed(self, name, load, *args):
+        started = time.perf_counter()
+        load(*args)
+        self.commit()
+        if self.progress:
+            self.progress(name, self.counts.get(name, 0), time.perf_counter() - started)
+
+    def run(self, users=1000, jobs=100, courses=50, applications=5000, mentorships=None, enrollments=None):
+        """Fill an empty schema; returns {table: rows written}"""
+        recruiters = max(users // 20, 1)
+        mentors = max(users // 10, 1)
+        women = max(users - recruiters - mentors, 1)
+        self.recruiter_ids = range(1, recruiters + 1)
+        self.mentor_ids = range(recruiters + 1, recruiters + mentors + 1)
+        self.women_ids = range(recruiters + mentors + 1, recruiters + mentors + women + 1)
+        self.course_ids = range(1, courses + 1)
+        self.job_ids = range(1, jobs + 1)
+        if mentorships is None:
+            mentorships = women // 5
+        if enrollments is None:
+            enrollments = women * 2
+
+        indexes = [index for table in self.tables.values() for index in table.indexes]
+        for index in indexes:
+            self.connection.execute(DropIndex(index, if_exists=True))
+        self.commit()
+        try:
+            self._timed('tags', self.load_tags)
+            self._timed('users', self.load_users)
+            self._timed('courses', self.load_courses)
+            self._timed('applications', self.load_applications, applications)
+            self._timed('jobs', self.load_jobs)
+            self._timed('mentorships', self.load_mentorships, mentorships)
+            self._timed('mentor_matches', self.load_mentor_matches)
+            self._timed('progress', self.load_progress, enrollments)
+        finally:
+            started = time.perf_counter()
+            for index in indexes:
+                self.connection.execute(CreateIndex(index, if_not_exists=True))
+            if self.connection.dialect.name == 'sqlite':
+                self.connection.exec_driver_sql('ANALYZE')
+            self.commit()
+            if self.progress:
+                self.progress('indexes', len(indexes), time.perf_counter() - started)
+        return dict(self.counts)
+
+    def load_tags(self):
+        self.write('tags', [(tag_id, name) for name, tag_id in self.tag_ids.items()])
+
+    def load_users(self):
+        rng, rows, tags = self.rng, [], []
+        last = self.women_ids[-1]
+        subjects = [subject for subject, _ in SUBJECTS]
+        for user_id in range(1, last + 1):
+            first, surname = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            interests = completed = expertise = experience = company = position = None
+            skill_level = None
+            if user_id in self.women_ids:
+                role = 'women'
+                skill_level = rng.choice(SKILL_LEVELS)
+                chosen = rng.sample(SKILLS, rng.randint(2, 4))
+                interests = ', '.join(chosen)
+                tags.extend((user_id, self.tag_ids[name], 'interest') for name in chosen)
+                done = rng.sample(subjects, rng.randint(0, 2))
+                completed = ', '.join(done) or None
+                tags.extend((user_id, self.tag_ids[name.lower()], 'course') for name in done)
+            elif user_id in self.mentor_ids:
+                role = 'mentor'
+                chosen = rng.sample(SKILLS, rng.randint(2, 5))
+                expertise = ', '.join(chosen)
+                tags.extend((user_id, self.tag_ids[name], 'expertise') for name in chosen)
+                experience = rng.randint(1, 25)
+            else:
+                role = 'recruiter'
+                company, position = rng.choice(COMPANIES), rng.choice(POSITIONS)
+            rows.append((user_id, f'{first} {surname}', f'{first}.{surname}.{user_id}@example.com'.lower(),
+                         self.password_hash, f'+91 9{rng.randrange(10 ** 9):09d}', rng.choice(CITIES),
+                         rng.choice(EDUCATION), skill_level, role, self.stamp(), interests, completed,
+                         expertise, experience, company, position))
+            if len(rows) >= self.batch_size:
+                self.write('users', rows)
+                self.write('user_tags', tags)
+                rows, tags = [], []
+        self.write('users', rows)
+        self.write('user_tags', tags)
+
+    def load_courses(self):
+        rng, rows = self.rng, []
+        for course_id in self.course_ids:
+            subject, category = rng.choice(SUBJECTS)
+            level = rng.choice(COURSE_LEVELS)
+            rows.append((course_id, f'{subject} {level} {course_id}',
+                         f'Learn {subject.lower()} step by step with hands-on projects.', category, level,
+                         f'{rng.choice((4, 6, 8, 10, 12))} weeks', rng.choice(self.mentor_ids), self.stamp(),
+                         'default-course.jpg', rng.choice((0.0, 0.0, 499.0, 999.0))))
+        self.write('courses', rows)
+
+    def load_applications(self, total):
+        """Spread `total` applications evenly over learners, each to distinct jobs.
+
+        Runs before load_jobs so the jobs' status counters can be written
+        with them instead of updated afterwards.
+        """
+        rng, rows, jobs = self.rng, [], len(self.job_ids)
+        self.job_counts = {status: array('l', [0]) * (jobs + 1) for _, status in APPLICATION_ODDS}
+        learners = len(self.women_ids)
+        for index, user_id in enumerate(self.women_ids):
+            count = min((index + 1) * total // learners - index * total // learners, jobs)
+            for job_id in rng.sample(self.job_ids, count):
+                status = _pick(APPLICATION_ODDS, rng.random())
+                self.job_counts[status][job_id] += 1
+                rows.append((user_id, job_id, status, self.stamp()))
+            if len(rows) >= self.batch_size:
+                self.write('applications', rows)
+                rows = []
+        self.write('applications', rows)
+
+    def load_jobs(self):
+        rng, rows = self.rng, []
+        counts = self.job_counts
+        # The insert trigger would index every row; index them all at the end instead
+        deferred = job_search.is_available(self.connection)
+        with job_search.deferred_indexing(self.connection) if deferred else nullcontext():
+            for job_id in self.job_ids:
+                title = rng.choice(JOB_TITLES)
+                skills = rng.sample(SKILLS, rng.randint(3, 5))
+                low = rng.randrange(2, 15)
+                pending, reviewed = counts['pending'][job_id], counts['reviewed'][job_id]
+                shortlisted, rejected = counts['shortlisted'][job_id], counts['rejected'][job_id]
+                rows.append((job_id, title, f'We are hiring a {title.lower()} to join our growing team.',
+                             rng.choice(COMPANIES), rng.choice(CITIES), ', '.join(skills),
+                             f'₹{low}L–₹{low + rng.randrange(2, 8)}L', rng.choice(self.recruiter_ids),
+                             self.stamp(), rng.random() < 0.9,
+                             pending + reviewed + shortlisted + rejected, pending, reviewed, shortlisted,
+                             rejected))
+                if len(rows) >= self.batch_size:
+                    self.write('jobs', rows)
+                    rows = []
+            self.write('jobs', rows)
+
+    def load_mentorships(self, total):
+        rng, rows, seen = self.rng, [], set()
+        for _ in range(total):
+            mentee, mentor = rng.choice(self.women_ids), rng.choice(self.mentor_ids)
+            if (mentee, mentor) in seen:
+                continue
+            seen.add((mentee, mentor))
+            status = _pick(MENTORSHIP_ODDS, rng.random())
+            rows.append((mentee, mentor, status, self.stamp(),
+                         self.stamp() if status in ('accepted', 'completed') else None))
+            if len(rows) >= self.batch_size:
+                self.write('mentorships', rows)
+                rows = []
+        self.write('mentorships', rows)
+
+    def load_mentor_matches(self):
+        """Three suggestions for a fifth of the learners, as `flask match-mentors` would leave them"""
+        rng, rows = self.rng, []
+        created_at = self.stamp()
+        picks = min(3, len(self.mentor_ids))
+        for mentee in self.women_ids[::5]:
+            score = 0.6 + rng.random() * 0.4
+            for rank, mentor in enumerate(rng.sample(self.mentor_ids, picks)):
+                rows.append((mentee, mentor, rank, round(score, 4), rank == 0, created_at))
+                score *= 0.9
+            if len(rows) >= self.batch_size:
+                self.write('mentor_matches', rows)
+                rows = []
+        self.write('mentor_matches', rows)
+
+    def load_progress(self, total):
+        """Enrollments, plus a certificate and its finished render job for some completed ones"""
+        rng, rows, certificates, renders = self.rng, [], [], []
+        learners, courses = len(self.women_ids), len(self.course_ids)
+        certificate_id = 0
+        for index, user_id in enumerate(self.women_ids):
+            count = min((index + 1) * total // learners - index * total // learners, courses)
+            for course_id in rng.sample(self.course_ids, count):
+                percentage = rng.choice((0, 10, 25, 40, 60, 80, 100, 100))
+                completed = percentage == 100
+                issued = completed and rng.random() < 0.6
+                started, accessed = self.stamp(), self.stamp()
+                rows.append((user_id, course_id, float(percentage), completed, issued, accessed, started,
+                             accessed if completed else None))
+                if issued:
+                    certificate_id += 1
+                    certificates.append((certificate_id, user_id, course_id,
+                                         f'SHE-{self.seed}-{certificate_id:08d}', accessed))
+                    renders.append((certificate_id, 'done', 1, accessed, accessed, accessed))
+            if len(rows) >= self.batch_size:
+                self.write('progress', rows)
+                self.write('certificates', certificates)
+                self.write('certificate_jobs', renders)
+                rows, certificates, renders = [], [], []
+        self.write('progress', rows)
+        self.write('certificates', certificates)
+        self.write('certificate_jobs', renders)
+
+
+def snapshot(database, path):
+    """Write a compact copy of a SQLite database to `path`, replacing any file there"""
+    if os.path.exists(path):
+        os.remove(path)
+    with sqlite3.connect(database) as connection:
+        connection.execute('VACUUM INTO ?', (path,))
+
+
+def restore(path, database):
+    """Copy a snapshot over a SQLite database file, e.g. a scratch DB for a test run"""
+    source = sqlite3.connect(path)
+    target = sqlite3.connect(database)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
@@ -0,0 +1,198 @@
+from flask import current_app, session as http_session
+from functools import wraps
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+import logging
+import multiprocessing
+import os
+import random
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# single writer; NORMAL sync is still durable against application crashes
+# in WAL mode; busy_timeout makes writers queue instead of failing at once.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # negative = KiB, so 64 MiB
+    'temp_store': 'MEMORY',
+}
+
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.05
+
+SQLITE_BUSY, SQLITE_LOCKED = 5, 6
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+
+def is_lock_error(error):
+    """True for SQLITE_BUSY/SQLITE_LOCKED, raw or wrapped by SQLAlchemy"""
+    error = getattr(error, 'orig', error)
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    code = getattr(error, 'sqlite_errorcode', None)
+    if code is not None:
+        return code & 0xff in (SQLITE_BUSY, SQLITE_LOCKED)
+    return 'locked' in str(error) or 'busy' in str(error)
+
+
+def with_lock_retry(func, rollback, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+    """Call func(), re-running it after rollback() while SQLite reports a lock.
+
+    busy_timeout absorbs most contention, but a writer that waited longer
+    than the timeout, or whose transaction already read an older snapshot,
+    still fails. Its changes are gone after the rollback, so the whole unit
+    of work has to run again.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except (OperationalError, sqlite3.OperationalError) as error:
+            if attempt == retries or not is_lock_error(error):
+                raise
+            rollback()
+            delay = backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+            logger.info('Database locked, retrying in %.3fs (attempt %d of %d)',
+                        delay, attempt + 1, retries)
+            time.sleep(delay)
+
+
+def retry_on_lock(view):
+    """Re-run a writing view when its commit hits a locked database.
+
+    Messages flashed by a failed attempt are discarded so the user only
+    sees those of the attempt that went through.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        extension = current_app.extensions.get('sqlite_tuning')
+        if extension is None:
+            return view(*args, **kwargs)
+        flashes = list(http_session.get('_flashes', []))
+
+        def rollback():
+            extension.db.session.rollback()
+            if flashes:
+                http_session['_flashes'] = list(flashes)
+            else:
+                http_session.pop('_flashes', None)
+
+        return with_lock_retry(lambda: view(*args, **kwargs), rollback,
+                               extension.retries, extension.backoff)
+    return wrapper
+
+
+class SQLiteTuning:
+    """Per-connection PRAGMAs and lock retries for SQLite databases.
+
+    SQLITE_PRAGMAS entries override DEFAULT_PRAGMAS (set one to None to
+    leave SQLite's default). Views decorated with @retry_on_lock are re-run
+    up to SQLITE_LOCK_RETRIES times with jittered exponential backoff.
+    """
+
+    def __init__(self, app=None, db=None):
+        self.db = db
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        self.retries = DEFAULT_RETRIES
+        self.backoff = DEFAULT_BACKOFF
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db=None):
+        app.config.setdefault('SQLITE_PRAGMAS', {})
+        app.config.setdefault('SQLITE_LOCK_RETRIES', DEFAULT_RETRIES)
+        app.config.setdefault('SQLITE_LOCK_BACKOFF', DEFAULT_BACKOFF)
+
+        self.db = db or self.db
+        self.pragmas = {name: value for name, value in
+                        {**DEFAULT_PRAGMAS, **app.config['SQLITE_PRAGMAS']}.items()
+                        if value is not None}
+        self.retries = app.config['SQLITE_LOCK_RETRIES']
+        self.backoff = app.config['SQLITE_LOCK_BACKOFF']
+        if not event.contains(Engine, 'connect', self._on_connect):
+            event.listen(Engine, 'connect', self._on_connect)
+        app.extensions['sqlite_tuning'] = self
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        if isinstance(dbapi_connection, sqlite3.Connection):
+            apply_pragmas(dbapi_connection, self.pragmas)
+
+
+def _stress_worker(path, tuned, transactions, results):
+    # Plain sqlite3 rather than an engine, so listeners inherited from the
+    # parent process can't tune the "default" run
+    connection = sqlite3.connect(path)
+    if tuned:
+        apply_pragmas(connection, DEFAULT_PRAGMAS)
+
+    def unit_of_work():
+        # Read, then write: the shape of an enrollment or application request
+        with connection:
+            total = connection.execute('SELECT count(*) FROM stress').fetchone()[0]
+            connection.execute('INSERT INTO stress (worker, seen) VALUES (?, ?)', (os.getpid(), total))
+
+    committed = failed = 0
+    for _ in range(transactions):
+        try:
+            if tuned:
+                with_lock_retry(unit_of_work, connection.rollback, retries=10)
+            else:
+                unit_of_work()
+            committed += 1
+        except sqlite3.OperationalError as error:
+            if not is_lock_error(error):
+                raise
+            failed += 1
+    connection.close()
+    results.put((committed, failed))
+
+
+def stress(path, processes=8, transactions=200, tuned=True):
+    """Hammer a scratch database at `path` with concurrent read-then-write transactions.
+
+    Untuned runs keep SQLite's defaults (rollback journal, the driver's
+    5 second timeout) and do not retry, like the app did before. Returns
+    committed/failed counts and commits per second.
+    """
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    setup = sqlite3.connect(path)
+    setup.execute('PRAGMA journal_mode=DELETE')
+    setup.execute('CREATE TABLE stress (id INTEGER PRIMARY KEY, worker INTEGER, seen INTEGER)')
+    setup.close()
+
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_stress_worker, args=(path, tuned, transactions, results))
+               for _ in range(processes)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    committed = sum(outcome[0] for outcome in outcomes)
+    return {
+        'tuned': tuned,
+        'processes': processes,
+        'committed': committed,
+        'failed': sum(outcome[1] for outcome in outcomes),
+        'seconds': elapsed,
+        'commits_per_sec': committed / elapsed,
+    }
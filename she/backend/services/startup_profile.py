@@ -0,0 +1,89 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Run in a fresh interpreter so nothing is imported yet
+COLD_START_SCRIPT = '''
+import json, resource, sys, time
+started = time.perf_counter()
+from {module} import {factory}
+imported = time.perf_counter()
+app = {factory}()
+created = time.perf_counter()
+print(json.dumps({{
+    'import_seconds': imported - started,
+    'create_seconds': created - imported,
+    'max_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': len(sys.modules),
+    'heavy_modules': sorted({{name.split('.')[0] for name in sys.modules}} & {heavy!r}),
+}}))
+'''
+
+HEAVY_MODULES = {'reportlab', 'PIL'}
+
+
+def cold_start(module='app', factory='create_app', cwd=None):
+    """Import the app and build it in a new interpreter; return timings and memory"""
+    script = COLD_START_SCRIPT.format(module=module, factory=factory, heavy=HEAVY_MODULES)
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', script], cwd=cwd, check=True,
+                            capture_output=True, text=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_seconds'] = time.perf_counter() - started
+    return result
+
+
+def memory_usage():
+    """Rss, Pss, Shared and Private KiB of this process, from /proc (Linux only)"""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if value.strip().endswith('kB'):
+                fields[name] = int(value.split()[0])
+    return {
+        'rss_kib': fields.get('Rss', 0),
+        'pss_kib': fields.get('Pss', 0),
+        'shared_kib': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+        'private_kib': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+
+def forked_workers(app, workers=4, paths=('/',), freeze=True):
+    """Fork `workers` children from this process, as gunicorn --preload does.
+
+    Each child serves `paths` once through the test client and reports its
+    memory; what the children share with the parent costs nothing per
+    worker, so private memory is the real per-worker cost.
+    """
+    import gc
+
+    if freeze:
+        gc.freeze()
+    reports = []
+    for _ in range(workers):
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_end)
+            status = 0
+            try:
+                client = app.test_client()
+                for path in paths:
+                    client.get(path)
+                os.write(write_end, json.dumps(memory_usage()).encode())
+            except BaseException:
+                status = 1
+            finally:
+                os._exit(status)
+        os.close(write_end)
+        with os.fdopen(read_end) as pipe:
+            data = pipe.read()
+        os.waitpid(pid, 0)
+        if data:
+            reports.append(json.loads(data))
+    if freeze:
+        gc.unfreeze()
+    return reports
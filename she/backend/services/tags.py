@@ -0,0 +1,21 @@
+import re
+
+# Free-text profile columns mirrored into normalized user_tags rows, by tag kind
+TAG_COLUMNS = {
+    'expertise': 'expertise',
+    'interest': 'interests',
+    'course': 'completed_courses',
+}
+
+_SEPARATORS = re.compile(r'[,;/|\n]+')
+
+
+def parse_tags(value):
+    """Split a comma-ish profile string into normalized tag names"""
+    tags = []
+    for part in _SEPARATORS.split(value or ''):
+        name = ' '.join(part.lower().split())[:100]
+        if name and name not in tags:
+            tags.append(name)
+    return tags
+
@@ -0,0 +1,58 @@
+from jinja2 import FileSystemBytecodeCache
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateCache:
+    """Compiled templates on disk, and compiled into memory at boot.
+
+    Jinja compiles a template to Python source and then to bytecode the
+    first time each process renders it. The bytecode cache keeps the
+    result under TEMPLATE_BYTECODE_CACHE (default instance/jinja-cache), so
+    a restarted worker only unmarshals it; entries are keyed on the
+    template's source checksum and the Python version, so edits and
+    upgrades invalidate them. With TEMPLATE_PRELOAD (on unless debugging)
+    every template is loaded by create_app(), which under a preloading
+    server happens once in the master, so workers inherit them compiled.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('TEMPLATE_BYTECODE_CACHE', os.path.join(app.instance_path, 'jinja-cache'))
+        app.config.setdefault('TEMPLATE_PRELOAD', not app.debug)
+
+        directory = app.config['TEMPLATE_BYTECODE_CACHE']
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            # jinja_options is only read when app.jinja_env is first built
+            if 'jinja_env' in app.__dict__:
+                app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+            else:
+                app.jinja_options = {**app.jinja_options,
+                                     'bytecode_cache': FileSystemBytecodeCache(directory)}
+        app.extensions['template_cache'] = self
+
+    @staticmethod
+    def compile_all(app):
+        """Load every template of the app; returns [(name, seconds)]"""
+        if app.jinja_env.cache is not None:
+            app.jinja_env.cache.clear()
+        timings = []
+        for name in app.jinja_env.list_templates(extensions=('html',)):
+            started = time.perf_counter()
+            app.jinja_env.get_template(name)
+            timings.append((name, time.perf_counter() - started))
+        logger.info('Loaded %d template(s) in %.3fs', len(timings), sum(t for _, t in timings))
+        return timings
+
+    @staticmethod
+    def clear(app):
+        cache = app.jinja_env.bytecode_cache
+        if cache is not None:
+            cache.clear()
@@ -0,0 +1,44 @@
+// Navbar scroll
+const navbar = document.getElementById('navbar');
+window.addEventListener('scroll', () => navbar.classList.toggle('scrolled', window.scrollY > 50));
+
+// Click-based dropdown toggle (fixes logout not working on hover)
+function toggleDropdown(e) {
+    e.stopPropagation();
+    const menu = document.getElementById('dropdownMenu');
+    const icon = document.getElementById('chevronIcon');
+    const isOpen = menu.classList.contains('open');
+    menu.classList.toggle('open');
+    if (icon) icon.style.transform = isOpen ? 'rotate(0deg)' : 'rotate(180deg)';
+}
+// Close dropdown when clicking anywhere outside
+document.addEventListener('click', function(e) {
+    const dropdown = document.getElementById('profileDropdown');
+    const menu = document.getElementById('dropdownMenu');
+    const icon = document.getElementById('chevronIcon');
+    if (dropdown && !dropdown.contains(e.target)) {
+        if (menu) menu.classList.remove('open');
+        if (icon) icon.style.transform = 'rotate(0deg)';
+    }
+});
+
+// Auto-dismiss flash messages
+setTimeout(() => {
+    document.querySelectorAll('.flash-msg').forEach(m => {
+        m.style.transition = 'opacity 0.5s, transform 0.5s';
+        m.style.opacity = '0';
+        m.style.transform = 'translateX(30px)';
+        setTimeout(() => m.remove(), 500);
+    });
+}, 5000);
+
+// Scroll reveal
+const revealEls = document.querySelectorAll('.reveal');
+const observer = new IntersectionObserver(entries => {
+    entries.forEach((e) => {
+        if (e.isIntersecting) {
+            setTimeout(() => e.target.classList.add('visible'), e.target.dataset.delay || 0);
+        }
+    });
+}, { threshold: 0.1 });
+revealEls.forEach(el => observer.observe(el));
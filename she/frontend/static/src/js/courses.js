@@ -0,0 +1,69 @@
+function filterCourses(){
+    const cat=document.getElementById('categoryFilter').value;
+    const lvl=document.getElementById('levelFilter').value;
+    document.querySelectorAll('.course-card').forEach(card=>{
+        const showCat=cat==='all'||card.dataset.category===cat;
+        const showLvl=lvl==='all'||card.dataset.level===lvl;
+        card.style.display=showCat&&showLvl?'flex':'none';
+    });
+}
+function showEnrollMsg(btn){
+    btn.textContent='✅ Enrolled!';
+    btn.style.background='linear-gradient(135deg,#4caf93,#2e9c7a)';
+    btn.disabled=true;
+}
+
+// ── Chat ──
+let currentMentor=null;
+const greetings={
+    'Priya':['Hello! 🌸 I\'m Priya, your bakery mentor. What would you like to learn today?','Ask me anything about baking, pastry or running your kitchen business!'],
+    'Meena':['Hi there! 🧵 I\'m Meena. Ready to help you master stitching and fashion design!','What are you working on — a dress, blouse or something new?'],
+    'Anjali':['Hey! 💻 I\'m Anjali. Let\'s build something amazing with code!','Ask me about web dev, Python, or how to start your tech career.'],
+    'Kavitha':['Hello! 💄 I\'m Kavitha. Beauty and confidence go hand in hand!','Ask me about hair care, skin routines or setting up your parlour.'],
+    'Rekha':['Hi! 🏠 I\'m Rekha. Let\'s grow your home business together!','Ask me about pricing, Instagram marketing, or managing customers.'],
+    'Sudha':['Hello! 🎨 I\'m Sudha. Let\'s create something beautiful today!','Ask me about fabric painting, embroidery or craft business tips.'],
+};
+function toggleChat(){
+    const w=document.getElementById('chatWidget');
+    w.classList.toggle('open');
+}
+function switchMentor(){
+    const val=document.getElementById('mentorSelect').value;
+    if(!val)return;
+    const[name,course]=val.split('|');
+    currentMentor=name;
+    document.getElementById('chatMentorName').textContent='Mentor '+name;
+    document.getElementById('chatMentorCourse').textContent=course;
+    const msgs=document.getElementById('chatMessages');
+    msgs.innerHTML='';
+    (greetings[name]||['Hello! How can I help you today?']).forEach((m,i)=>{
+        setTimeout(()=>addMsg(m,'mentor'),i*600);
+    });
+}
+function addMsg(text,type){
+    const msgs=document.getElementById('chatMessages');
+    const now=new Date().toLocaleTimeString([],{hour:'2-digit',minute:'2-digit'});
+    const div=document.createElement('div');
+    div.className='chat-msg '+type;
+    div.innerHTML=text+'<div class="chat-msg-time">'+now+'</div>';
+    msgs.appendChild(div);
+    msgs.scrollTop=msgs.scrollHeight;
+}
+function sendMessage(){
+    const input=document.getElementById('chatInput');
+    const text=input.value.trim();
+    if(!text)return;
+    if(!currentMentor){alert('Please select a mentor first 🌸');return;}
+    addMsg(text,'learner');
+    input.value='';
+    setTimeout(()=>{
+        const replies=[
+            'Great question! Let me guide you step by step 🌸',
+            'Absolutely! That\'s a wonderful thing to learn.',
+            'I love your enthusiasm! Here\'s what I suggest...',
+            'Practice makes perfect! Start small and build up.',
+            'You\'re on the right track! Keep going 💪',
+        ];
+        addMsg(replies[Math.floor(Math.random()*replies.length)],'mentor');
+    },700+Math.random()*600);
+}
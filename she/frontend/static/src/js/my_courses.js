@@ -0,0 +1,44 @@
+const mentorGreetings={
+    'Priya':['Hello! 🧁 Great to see you working hard on your bakery course!','What questions do you have about today\'s lesson?'],
+    'Meena':['Hi! 🧵 Hope your stitching practice is going well!','Feel free to ask about any technique you\'re stuck on.'],
+    'Anjali':['Hey! 💻 Ready to debug some code together?','Ask me anything — no question is too small!'],
+    'Kavitha':['Hello! 💄 How\'s your beauty course going?','I\'m here to help with any styling questions!'],
+    'Rekha':['Hi! 🏠 Let\'s grow your business together!','Ask about pricing, marketing or customer management.'],
+    'Sudha':['Hello! 🎨 What are you creating today?','Ask me about any craft technique you\'re working on.'],
+};
+function openChat(mentor,emoji,course){
+    document.getElementById('cpAvatar').textContent=emoji;
+    document.getElementById('cpName').textContent='Mentor '+mentor;
+    document.getElementById('cpCourse').textContent=course;
+    const msgs=document.getElementById('cpMessages');
+    msgs.innerHTML='';
+    const greets=mentorGreetings[mentor]||['Hello! How can I help you today? 🌸'];
+    greets.forEach((m,i)=>setTimeout(()=>cpAddMsg(m,'mentor'),i*600));
+    document.getElementById('chatPanel').classList.add('open');
+}
+function closeChat(){document.getElementById('chatPanel').classList.remove('open')}
+function cpAddMsg(text,type){
+    const msgs=document.getElementById('cpMessages');
+    const now=new Date().toLocaleTimeString([],{hour:'2-digit',minute:'2-digit'});
+    const div=document.createElement('div');
+    div.className='cp-msg '+type;
+    div.innerHTML=text+'<div class="cp-msg-time">'+now+'</div>';
+    msgs.appendChild(div);
+    msgs.scrollTop=msgs.scrollHeight;
+}
+function cpSend(){
+    const input=document.getElementById('cpInput');
+    const text=input.value.trim();
+    if(!text)return;
+    cpAddMsg(text,'learner');
+    input.value='';
+    const replies=[
+        'Great question! Let me explain step by step 🌸',
+        'You\'re making such good progress! Here\'s what to do next...',
+        'That\'s a common challenge. Try this approach...',
+        'Excellent! Practice this daily and you\'ll master it.',
+        'I\'m proud of your dedication! Keep going 💪',
+        'Let me share a tip that helped many of my students...',
+    ];
+    setTimeout(()=>cpAddMsg(replies[Math.floor(Math.random()*replies.length)],'mentor'),600+Math.random()*500);
+}
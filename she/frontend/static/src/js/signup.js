@@ -0,0 +1,28 @@
+function switchRole() {
+    const role = document.querySelector('input[name="role"]:checked').value;
+    document.getElementById('mentorFields').classList.toggle('active', role === 'mentor');
+    document.getElementById('recruiterFields').classList.toggle('active', role === 'recruiter');
+}
+
+function togglePwd(id, btn) {
+    const input = document.getElementById(id);
+    const icon = btn.querySelector('i');
+    input.type = input.type === 'password' ? 'text' : 'password';
+    icon.className = input.type === 'password' ? 'fas fa-eye' : 'fas fa-eye-slash';
+}
+
+// Password match check
+document.getElementById('confirmPwd').addEventListener('input', function() {
+    const pwd = document.getElementById('signupPwd').value;
+    const err = document.getElementById('pwdError');
+    err.style.display = this.value && this.value !== pwd ? 'block' : 'none';
+});
+
+document.getElementById('signupForm').addEventListener('submit', function(e) {
+    const pwd = document.getElementById('signupPwd').value;
+    const conf = document.getElementById('confirmPwd').value;
+    if (pwd !== conf) {
+        e.preventDefault();
+        document.getElementById('pwdError').style.display = 'block';
+    }
+});
@@ -0,0 +1,115 @@
+let answers = {};
+
+function selectOption(el, qName) {
+    // Deselect all in this question
+    document.querySelectorAll(`#${qName} .option-label`).forEach(l => l.classList.remove('selected'));
+    el.classList.add('selected');
+    el.querySelector('input').checked = true;
+    answers[qName] = el.querySelector('input').value;
+}
+
+function nextQ(current) {
+    if (!answers[`q${current}`]) {
+        // Gentle shake if nothing selected
+        const card = document.getElementById(`q${current}`);
+        card.style.animation = 'none';
+        card.style.border = '2px solid var(--petal)';
+        setTimeout(() => card.style.border = '1px solid rgba(212,92,132,0.12)', 800);
+        return;
+    }
+    document.getElementById(`q${current}`).classList.remove('active');
+    document.getElementById(`q${current + 1}`).classList.add('active');
+    updateSteps(current + 1);
+    window.scrollTo({ top: 200, behavior: 'smooth' });
+}
+
+function prevQ(current) {
+    document.getElementById(`q${current}`).classList.remove('active');
+    document.getElementById(`q${current - 1}`).classList.add('active');
+    updateSteps(current - 1);
+    window.scrollTo({ top: 200, behavior: 'smooth' });
+}
+
+function updateSteps(active) {
+    for (let i = 1; i <= 5; i++) {
+        const dot = document.getElementById(`dot-${i}`);
+        dot.classList.remove('active', 'done');
+        if (i < active) dot.classList.add('done');
+        else if (i === active) dot.classList.add('active');
+    }
+    for (let i = 1; i <= 4; i++) {
+        const line = document.getElementById(`line-${i}`);
+        line.classList.toggle('done', i < active);
+    }
+}
+
+function showResults() {
+    if (!answers['q5']) {
+        const card = document.getElementById('q5');
+        card.style.border = '2px solid var(--petal)';
+        setTimeout(() => card.style.border = '1px solid rgba(212,92,132,0.12)', 800);
+        return;
+    }
+
+    // Calculate scores based on answers
+    let digital = 30, creative = 30, analytical = 30, leadership = 30;
+
+    if (answers.q1 === 'advanced') digital += 50;
+    else if (answers.q1 === 'intermediate') digital += 35;
+    else if (answers.q1 === 'basic') digital += 20;
+    else digital += 5;
+
+    if (answers.q2 === 'tech') { digital += 20; analytical += 10; }
+    else if (answers.q2 === 'business') { leadership += 25; }
+    else if (answers.q2 === 'creative') { creative += 30; }
+    else if (answers.q2 === 'data') { analytical += 30; digital += 10; }
+
+    if (answers.q4 === 'freelance') { leadership += 15; creative += 10; }
+    else if (answers.q4 === 'job') { digital += 10; analytical += 10; }
+    else if (answers.q4 === 'upskill') { analytical += 15; }
+
+    // Cap at 100
+    digital = Math.min(digital, 95);
+    creative = Math.min(creative, 95);
+    analytical = Math.min(analytical, 95);
+    leadership = Math.min(leadership, 95);
+
+    // Show results panel
+    document.getElementById('q5').classList.remove('active');
+    document.getElementById('stepIndicators').style.display = 'none';
+    const res = document.getElementById('results');
+    res.classList.add('active');
+
+    // Determine title
+    const maxSkill = Math.max(digital, creative, analytical, leadership);
+    if (maxSkill === digital) {
+        document.getElementById('resultTitle').innerHTML = "You're a <em>Tech Trailblazer!</em> 💻";
+        document.getElementById('resultDesc').textContent = "You have strong digital instincts! Your path shines in web development, digital tools, and tech-driven roles.";
+    } else if (maxSkill === creative) {
+        document.getElementById('resultTitle').innerHTML = "You're a <em>Creative Visionary!</em> 🎨";
+        document.getElementById('resultDesc').textContent = "Your creative spark is your superpower! Design, content creation, and branding are where you'll truly shine.";
+    } else if (maxSkill === analytical) {
+        document.getElementById('resultTitle').innerHTML = "You're an <em>Analytical Gem!</em> 📊";
+        document.getElementById('resultDesc').textContent = "You love making sense of data and patterns. A future in analytics, finance, or research awaits you.";
+    } else {
+        document.getElementById('resultTitle').innerHTML = "You're a <em>Natural Leader!</em> 🌟";
+        document.getElementById('resultDesc').textContent = "People follow your energy! Business, management, and entrepreneurship are your natural territories.";
+    }
+
+    // Animate bars
+    setTimeout(() => {
+        animateBar('digital', digital);
+        animateBar('creative', creative);
+        animateBar('analytical', analytical);
+        animateBar('leadership', leadership);
+    }, 200);
+
+    window.scrollTo({ top: 0, behavior: 'smooth' });
+}
+
+function animateBar(name, value) {
+    const bar = document.getElementById(`bar-${name}`);
+    const score = document.getElementById(`score-${name}`);
+    bar.style.width = value + '%';
+    score.textContent = value + '%';
+}
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from models import db  # noqa: E402
+
+PASSWORD = 'password'
+
+
+@pytest.fixture
+def app(tmp_path):
+    """An app on an empty database of its own, with its own shared cache file"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'app.sqlite3'}",
+        'CACHE_SHARED_PATH': str(tmp_path / 'cache.sqlite3'),
+        'CERTIFICATE_STORAGE': str(tmp_path / 'certificates'),
+        'TEMPLATE_BYTECODE_CACHE': None,
+        'TEMPLATE_PRELOAD': False,
+        # Hash inline and cheaply; the pool and the real cost are not under test
+        'PASSWORD_HASH_WORKERS': 0,
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+    })
+    with app.app_context():
+        db.create_all()
+    # No app context is held across the test: requests made while one is
+    # pushed would share its `g`, and with it Flask-Login's current user
+    yield app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def seeded_app(app):
+    """`app` filled by `flask seed` with a small deterministic data set"""
+    result = app.test_cli_runner().invoke(args=[
+        'seed', '--users', '80', '--jobs', '12', '--courses', '8', '--applications', '200'])
+    assert result.exit_code == 0, result.output
+    return app
+
+
+def login(app, email, password=PASSWORD):
+    client = app.test_client()
+    response = client.post('/login', data={'email': email, 'password': password})
+    assert response.status_code == 302, f'could not log in as {email}'
+    return client
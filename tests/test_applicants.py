@@ -0,0 +1,29 @@
+from conftest import login
+from models import db, Application, Job, User
+
+
+def test_applying_scores_the_application(seeded_app):
+    with seeded_app.app_context():
+        job = Job.query.order_by(Job.id).first()
+        email = User.query.filter(User.role == 'women', ~User.applications.any(
+            Application.job_id == job.id)).order_by(User.id).first().email
+        job_id = job.id
+
+    assert login(seeded_app, email).get(f'/apply-job/{job_id}').status_code == 302
+    with seeded_app.app_context():
+        scores = [score for (score,) in db.session.query(Application.match_score).filter_by(job_id=job_id)]
+        assert scores and None not in scores
+
+
+def test_viewing_applicants_writes_nothing(seeded_app):
+    with seeded_app.app_context():
+        job = Job.query.filter(Job.applications_count > 0).order_by(Job.id).first()
+        db.session.execute(db.update(Application).where(Application.job_id == job.id).values(match_score=None))
+        db.session.commit()
+        job_id, email = job.id, db.session.get(User, job.recruiter_id).email
+
+    response = login(seeded_app, email).get(f'/view-applicants/{job_id}')
+    assert response.status_code == 200
+    with seeded_app.app_context():
+        assert db.session.query(Application.id).filter(
+            Application.job_id == job_id, Application.match_score.isnot(None)).first() is None
@@ -0,0 +1,62 @@
+from datetime import date
+import os
+import zipfile
+
+import pytest
+
+from she.backend.services import bulk_certificates
+
+
+class Crash(Exception):
+    pass
+
+
+def completions(count):
+    return [{'user_id': user_id, 'user_name': f'Learner {user_id}', 'course_name': 'Data Analysis',
+             'completion_date': date(2024, 5, 1), 'certificate_number': f'SHE-2024-{user_id:05d}'}
+            for user_id in range(1, count + 1)]
+
+
+def crash_after(chunks):
+    def progress(done, elapsed):
+        progress.calls += 1
+        if progress.calls == chunks:
+            raise Crash
+    progress.calls = 0
+    return progress
+
+
+def test_resume_finishes_a_crashed_archive_without_redoing_chunks(tmp_path):
+    path = str(tmp_path / 'certificates.zip')
+    with pytest.raises(Crash):
+        bulk_certificates.write_zip(path, completions(10), workers=1, chunk_size=3,
+                                    progress=crash_after(2))
+    assert os.path.exists(path + '.journal')
+
+    done = []
+    count = bulk_certificates.write_zip(path, completions(10), workers=1, chunk_size=3,
+                                        progress=lambda total, elapsed: done.append(total))
+    assert count == 10
+    # The two chunks written before the crash were not rendered again
+    assert done == [9, 10]
+    assert not os.path.exists(path + '.journal')
+
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        names = archive.namelist()
+        assert names == [bulk_certificates.arcname(completion) for completion in completions(10)]
+        assert all(archive.read(name).startswith(b'%PDF') for name in names)
+
+
+def test_resume_ignores_a_torn_journal_line(tmp_path):
+    path = str(tmp_path / 'certificates.zip')
+    with pytest.raises(Crash):
+        bulk_certificates.write_zip(path, completions(6), workers=1, chunk_size=3,
+                                    progress=crash_after(1))
+    with open(path + '.journal', 'a') as journal:
+        journal.write('{"offset": ')
+
+    assert bulk_certificates.write_zip(path, completions(6), workers=1, chunk_size=3) == 6
+    with zipfile.ZipFile(path) as archive:
+        assert archive.testzip() is None
+        assert len(archive.namelist()) == 6
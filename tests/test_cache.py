@@ -0,0 +1,62 @@
+from app import cache
+from conftest import login
+from models import db, Course, User
+
+
+def add_course(title):
+    db.session.add(Course(title=title, description='', category='Technology',
+                          level='Beginner', duration='1 week'))
+
+
+def test_commit_bumps_the_namespaces_of_written_tables(app):
+    with app.app_context():
+        before = cache.version('courses')
+        add_course('Rust for Beginners')
+        db.session.commit()
+        assert cache.version('courses') == before + 1
+        assert cache.version('jobs') == 0
+
+
+def test_rollback_leaves_versions_alone(app):
+    with app.app_context():
+        before = cache.version('courses')
+        add_course('Rust for Beginners')
+        db.session.flush()
+        db.session.rollback()
+        # The marks of the rolled back flush must not leak into this commit
+        db.session.commit()
+        assert cache.version('courses') == before
+
+
+def test_bulk_statements_bump_the_namespace(app):
+    with app.app_context():
+        add_course('Rust for Beginners')
+        db.session.commit()
+        before = cache.version('courses')
+        db.session.execute(db.update(Course).values(level='Advanced'))
+        db.session.commit()
+        assert cache.version('courses') == before + 1
+
+
+def test_cached_values_are_reloaded_after_a_write(app):
+    with app.app_context():
+        def titles():
+            return [course.title for course in Course.query.order_by(Course.id)]
+
+        assert cache.get_or_set('courses', 'titles', titles) == []
+        add_course('Rust for Beginners')
+        db.session.commit()
+        assert cache.get_or_set('courses', 'titles', titles) == ['Rust for Beginners']
+
+
+def test_courses_page_shows_a_course_added_after_it_was_cached(seeded_app):
+    with seeded_app.app_context():
+        email = User.query.filter_by(role='women').order_by(User.id).first().email
+    client = login(seeded_app, email)
+    # One page holds every course, so the new one can only be missing if stale
+    assert b'Rust for Beginners' not in client.get('/courses?per_page=100').data
+
+    with seeded_app.app_context():
+        add_course('Rust for Beginners')
+        db.session.commit()
+    assert b'Rust for Beginners' in client.get('/courses?per_page=100').data
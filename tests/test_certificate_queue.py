@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+from models import db, Certificate, CertificateJob
+from she.backend.services import certificate_queue
+from she.backend.services.certificate_queue import DONE, FAILED, QUEUED, RUNNING, CertificateQueue
+
+
+def make_queue(max_attempts=3):
+    return CertificateQueue(db.session, CertificateJob, max_attempts=max_attempts, lease=60)
+
+
+def enqueue(queue, number='SHE-1'):
+    job = queue.enqueue(Certificate(certificate_number=number))
+    db.session.commit()
+    return job.id
+
+
+def expire_lease(job_id):
+    db.session.get(CertificateJob, job_id).locked_until = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+
+
+def test_a_lease_is_exclusive_until_it_expires(app):
+    with app.app_context():
+        queue = make_queue()
+        job_id = enqueue(queue)
+        assert queue.claim('worker-1').id == job_id
+        assert queue.claim('worker-2') is None
+
+        expire_lease(job_id)
+        job = queue.claim('worker-2')
+        assert (job.id, job.locked_by, job.attempts) == (job_id, 'worker-2', 2)
+
+
+def test_an_expired_lease_on_the_last_attempt_fails_the_job(app):
+    with app.app_context():
+        queue = make_queue(max_attempts=3)
+        job_id = enqueue(queue)
+        # A job that kills its worker every time
+        for _ in range(3):
+            assert queue.claim('worker').id == job_id
+            expire_lease(job_id)
+
+        assert queue.claim('worker') is None
+        job = db.session.get(CertificateJob, job_id)
+        assert (job.status, job.attempts, job.locked_by) == (FAILED, 3, None)
+        assert 'Lease expired' in job.last_error
+        assert queue.counts()[FAILED] == 1
+
+
+def test_failed_handlers_are_retried_then_parked(app):
+    with app.app_context():
+        queue = CertificateQueue(db.session, CertificateJob, max_attempts=2, retry_delay=0)
+        enqueue(queue, 'SHE-1')
+        good = enqueue(queue, 'SHE-2')
+
+        def handler(job):
+            if job.id != good:
+                raise ValueError('no template')
+
+        assert certificate_queue.work(queue, handler, once=True) == 1
+        counts = queue.counts()
+        assert (counts[DONE], counts[FAILED], counts[QUEUED], counts[RUNNING]) == (1, 1, 0, 0)
+
+        assert queue.requeue_failed() == 1
+        assert queue.counts()[QUEUED] == 1
@@ -0,0 +1,30 @@
+import re
+
+from conftest import login
+from models import db, Progress, User
+from she.backend.routes.certificates import get_queue, render_certificate
+from she.backend.services import certificate_queue
+
+
+def test_a_completed_course_links_to_its_certificate(seeded_app):
+    with seeded_app.app_context():
+        progress = Progress.query.join(User).filter(
+            User.role == 'women', Progress.completed.is_(False)).order_by(Progress.id).first()
+        email, course_id = progress.user.email, progress.course_id
+    client = login(seeded_app, email)
+
+    assert client.post(f'/update-progress/{course_id}', data={'percentage': '100'}).status_code == 302
+    assert b'Certificate being prepared' in client.get('/my-courses').data
+
+    with seeded_app.app_context():
+        assert certificate_queue.work(get_queue(), render_certificate, once=True) == 1
+    page = client.get('/my-courses').get_data(as_text=True)
+    url, = re.findall(r'href="(/certificates/[0-9a-f]+\.pdf)"', page)
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.data.startswith(b'%PDF')
+    # Only the learner it was issued to can download it
+    with seeded_app.app_context():
+        other = User.query.filter(User.role == 'women', User.email != email).first().email
+    assert login(seeded_app, other).get(url).status_code == 404
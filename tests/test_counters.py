@@ -0,0 +1,72 @@
+from conftest import login
+from models import db, APPLICATION_STATUSES, Application, Job, User
+
+
+def counters(job):
+    return {'applications': job.applications_count,
+            **{status: getattr(job, f'{status}_count') for status in APPLICATION_STATUSES}}
+
+
+def counted(job_id):
+    """The counters as reconcile-counters computes them, from the applications table"""
+    rows = db.session.query(Application.status, db.func.count(Application.id)).filter_by(
+        job_id=job_id).group_by(Application.status)
+    expected = {'applications': 0, **dict.fromkeys(APPLICATION_STATUSES, 0)}
+    for status, total in rows:
+        expected['applications'] += total
+        if status in APPLICATION_STATUSES:
+            expected[status] = total
+    return expected
+
+
+def test_seeded_counters_match_the_applications(seeded_app):
+    with seeded_app.app_context():
+        for job in Job.query:
+            assert counters(job) == counted(job.id)
+
+
+def test_applying_and_reviewing_move_the_counters(seeded_app):
+    with seeded_app.app_context():
+        job = Job.query.order_by(Job.id).first()
+        learner = User.query.filter(User.role == 'women', ~User.applications.any(
+            Application.job_id == job.id)).order_by(User.id).first()
+        recruiter_email = db.session.get(User, job.recruiter_id).email
+        job_id, learner_email = job.id, learner.email
+
+    assert login(seeded_app, learner_email).get(f'/apply-job/{job_id}').status_code == 302
+    with seeded_app.app_context():
+        application = Application.query.filter_by(job_id=job_id).order_by(Application.id.desc()).first()
+        application_id = application.id
+    recruiter = login(seeded_app, recruiter_email)
+    assert recruiter.get(f'/update-application/{application_id}/shortlisted').status_code == 302
+
+    with seeded_app.app_context():
+        job = db.session.get(Job, job_id)
+        assert counters(job) == counted(job_id)
+
+
+def test_reconcile_counters_repairs_drift(seeded_app):
+    with seeded_app.app_context():
+        job_id = Job.query.order_by(Job.id).first().id
+        # A legacy status with no counter of its own, and counters gone wrong
+        application = Application.query.filter_by(job_id=job_id).first()
+        application.status = 'withdrawn'
+        db.session.execute(db.update(Job).values(applications_count=0, pending_count=99))
+        db.session.commit()
+
+    result = seeded_app.test_cli_runner().invoke(args=['reconcile-counters'])
+    assert result.exit_code == 0, result.output
+
+    with seeded_app.app_context():
+        for job in Job.query:
+            assert counters(job) == counted(job.id)
+
+
+def test_moving_a_legacy_status_only_counts_the_known_one(seeded_app):
+    with seeded_app.app_context():
+        job = Job.query.order_by(Job.id).first()
+        before = counters(job)
+        job.move_application('withdrawn', 'reviewed')
+        db.session.commit()
+        db.session.refresh(job)
+        assert counters(job) == {**before, 'reviewed': before['reviewed'] + 1}
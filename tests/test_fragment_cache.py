@@ -0,0 +1,23 @@
+from app import cache
+
+
+def cached_pages():
+    shared = cache.shared._connection()
+    return shared.execute("SELECT count(*) FROM cache_entries WHERE key LIKE 'pages:%'").fetchone()[0]
+
+
+def test_anonymous_home_page_is_cached_once(app):
+    client = app.test_client()
+    first = client.get('/')
+    assert first.status_code == 200
+    assert client.get('/').data == first.data
+    with app.app_context():
+        assert cached_pages() == 1
+
+
+def test_unknown_query_parameters_bypass_the_page_cache(app):
+    client = app.test_client()
+    for value in range(5):
+        assert client.get(f'/?utm_source={value}').status_code == 200
+    with app.app_context():
+        assert cached_pages() == 0
@@ -0,0 +1,88 @@
+import io
+
+import pytest
+
+from models import db, Job, User
+from she.backend.routes.jobs import run_import
+from she.backend.services import job_search
+
+
+def add_job(title, **fields):
+    job = Job(title=title, description='Build and test web services', location='Pune',
+              company='Acme', requirements='Python', **{'is_active': True, **fields})
+    db.session.add(job)
+    db.session.commit()
+    return job.id
+
+
+def trigger_names():
+    return {name for (name,) in db.session.execute(db.text(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'jobs'"))}
+
+
+def test_inserted_updated_and_deleted_jobs_stay_in_step_with_the_index(app):
+    with app.app_context():
+        job_id = add_job('Backend Engineer')
+        assert list(job_search.search(db.session, 'backend')) == [job_id]
+
+        db.session.get(Job, job_id).title = 'Frontend Engineer'
+        db.session.commit()
+        assert list(job_search.search(db.session, 'backend')) == []
+        assert list(job_search.search(db.session, 'frontend')) == [job_id]
+
+        db.session.delete(db.session.get(Job, job_id))
+        db.session.commit()
+        assert list(job_search.search(db.session, 'frontend')) == []
+        # Raises if the index holds anything the jobs table doesn't
+        db.session.execute(db.text("INSERT INTO jobs_fts(jobs_fts, rank) VALUES ('integrity-check', 1)"))
+
+
+def csv_upload(titles):
+    lines = ['title,description,location'] + [f'{title},Data pipelines,Pune' for title in titles]
+    return io.BytesIO('\n'.join(lines).encode() + b'\n')
+
+
+class DroppedUpload(io.RawIOBase):
+    """An upload whose client goes away after the first chunk"""
+
+    def __init__(self, data):
+        self.chunks = [data]
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self.chunks:
+            raise ConnectionResetError('client went away')
+        data = self.chunks.pop()
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def recruiter():
+    user = User(name='Hiring', email='hr@example.com', role='recruiter', company='Acme')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_an_import_indexes_its_jobs(app):
+    with app.app_context():
+        report = run_import(csv_upload(['Data Engineer', 'Data Analyst']), 'csv', recruiter(), batch_size=1)
+        assert report.inserted == 2
+        assert len(job_search.search(db.session, 'data')) == 2
+        assert 'jobs_fts_ai' in trigger_names()
+
+
+def test_a_failed_import_keeps_the_insert_trigger(app):
+    with app.app_context():
+        upload = io.BufferedReader(DroppedUpload(csv_upload(['Data Engineer'] * 3).getvalue()))
+        # The rows of the first chunk are inserted before the upload fails
+        with pytest.raises(ConnectionResetError):
+            run_import(upload, 'csv', recruiter(), batch_size=1)
+        assert Job.query.count() == 0
+        assert 'jobs_fts_ai' in trigger_names()
+
+        job_id = add_job('Machine Learning Engineer')
+        assert list(job_search.search(db.session, 'machine learning')) == [job_id]
@@ -0,0 +1,34 @@
+from conftest import login
+from models import db, ACTIVE_MENTORSHIP_STATUSES, Mentorship, MentorMatch, User
+
+
+def unmentored_learners(count):
+    active = db.session.query(Mentorship.mentee_id).filter(
+        Mentorship.status.in_(ACTIVE_MENTORSHIP_STATUSES))
+    return [user.email for user in User.query.filter(
+        User.role == 'women', User.id.notin_(active)).order_by(User.id).limit(count)]
+
+
+def test_places_reserved_by_match_mentors_count_against_capacity(seeded_app):
+    with seeded_app.app_context():
+        mentor = User.query.filter_by(role='mentor').order_by(User.id).first()
+        active = Mentorship.query.filter(Mentorship.mentor_id == mentor.id,
+                                         Mentorship.status.in_(ACTIVE_MENTORSHIP_STATUSES)).count()
+        reserved_email, other_email = unmentored_learners(2)
+        reserved = User.query.filter_by(email=reserved_email).one()
+        MentorMatch.query.delete()
+        db.session.add(MentorMatch(mentee_id=reserved.id, mentor_id=mentor.id, rank=0, score=0.5,
+                                   assigned=True))
+        db.session.commit()
+        mentor_id = mentor.id
+    # One free place, and match-mentors gave it away
+    seeded_app.config['MENTOR_CAPACITY'] = active + 1
+
+    login(seeded_app, other_email).get(f'/request-mentor/{mentor_id}')
+    login(seeded_app, reserved_email).get(f'/request-mentor/{mentor_id}')
+
+    with seeded_app.app_context():
+        requested = {user.email for user in User.query.join(
+            Mentorship, Mentorship.mentee_id == User.id).filter(Mentorship.mentor_id == mentor_id)}
+        assert reserved_email in requested
+        assert other_email not in requested
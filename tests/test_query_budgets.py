@@ -0,0 +1,38 @@
+import pytest
+
+from conftest import PASSWORD, login
+from models import db
+from she.backend.services import route_bench
+from she.backend.services.query_budget import QueryBudgetExceeded
+
+
+def budget_of(app, path, method='GET'):
+    adapter = app.url_map.bind('localhost')
+    endpoint, _ = adapter.match(path.split('?')[0], method=method)
+    view = app.view_functions[endpoint]
+    return getattr(view, 'query_budget', app.config['QUERY_BUDGET_DEFAULT'])
+
+
+def test_list_views_stay_within_their_budgets(seeded_app):
+    with seeded_app.app_context(), db.engine.connect() as connection:
+        fixture = route_bench.fixtures(connection)
+    clients = {role: login(seeded_app, email) for role, email in fixture['emails'].items()}
+
+    for case in route_bench.cases(fixture, PASSWORD):
+        if case.role is None:
+            continue
+        # Twice: cold caches first, then warm ones
+        for _ in range(2):
+            response = clients[case.role].open(case.path, method=case.method, data=case.data)
+            assert response.status_code == case.expect, case.name
+            count = int(response.headers['X-Query-Count'])
+            assert count <= budget_of(seeded_app, case.path, case.method), case.name
+
+
+def test_going_over_budget_raises(seeded_app, monkeypatch):
+    with seeded_app.app_context(), db.engine.connect() as connection:
+        fixture = route_bench.fixtures(connection)
+    client = login(seeded_app, fixture['emails']['women'])
+    monkeypatch.setattr(seeded_app.view_functions['courses'], 'query_budget', 0, raising=False)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get('/courses')
@@ -0,0 +1,70 @@
+import threading
+
+from app import cache, recommender
+from conftest import login
+from models import db, Job, User
+from she.backend.services.recommender import ItemIndex
+
+
+def wait_for_refresh():
+    for thread in threading.enumerate():
+        if thread.name.startswith('recommender-'):
+            thread.join()
+
+
+def test_index_ranks_items_by_shared_terms():
+    index = ItemIndex([(1, 'python data analysis'), (2, 'bakery management'), (3, 'python web')])
+    assert index.top_k(['python data', 'tailoring', ''], k=2) == [[1, 3], [], []]
+
+
+def test_only_indexed_job_fields_move_the_text_namespace(seeded_app):
+    with seeded_app.app_context():
+        job = Job.query.order_by(Job.id).first()
+        texts, jobs = cache.version('job_texts'), cache.version('jobs')
+
+        job.record_application()
+        db.session.commit()
+        assert (cache.version('job_texts'), cache.version('jobs')) == (texts, jobs + 1)
+
+        db.session.execute(db.update(Job), [{'id': job.id, 'pending_count': 0}])
+        db.session.commit()
+        assert cache.version('job_texts') == texts
+
+        job.title = 'Senior Data Analyst'
+        db.session.commit()
+        assert cache.version('job_texts') == texts + 1
+
+
+def test_requests_never_build_the_index(seeded_app):
+    with seeded_app.test_request_context():
+        user = User.query.filter_by(role='women').order_by(User.id).first()
+        # No index in this process yet: nothing to rank with, a build starts elsewhere
+        assert recommender.recommend('jobs', user.id, 'python data') is None
+        wait_for_refresh()
+        index, current = recommender.index('jobs')
+        assert current and len(index) == Job.query.filter_by(is_active=True).count()
+
+
+def test_a_stale_index_is_used_but_its_picks_are_not_cached(seeded_app):
+    with seeded_app.test_request_context():
+        job = Job.query.order_by(Job.id).first()
+        recommender.build('jobs')
+        job.title = 'Python developer'
+        db.session.commit()
+
+        picks = recommender.recommend('jobs', 1, 'python')
+        assert picks is not None and job.id not in picks
+        wait_for_refresh()
+        assert job.id in recommender.recommend('jobs', 1, 'python')
+        # Now current, so the picks were cached
+        assert cache.get_or_set('job_texts', recommender._key(1, 'python'), lambda: None) is not None
+
+
+def test_learner_dashboard_stays_within_budget_with_recommendations(seeded_app):
+    with seeded_app.app_context():
+        email = User.query.filter_by(role='women').order_by(User.id).first().email
+        recommender.load_all()
+    client = login(seeded_app, email)
+    response = client.get('/dashboard')
+    assert response.status_code == 200
+    assert int(response.headers['X-Query-Count']) <= 8
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+import sqlite3
+
+import pytest
+
+from conftest import login
+from models import db, Progress, User
+from she.backend.services import sqlite_tuning
+
+
+def test_app_connections_are_tuned(app):
+    with app.app_context():
+        assert db.session.execute(db.text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert db.session.execute(db.text('PRAGMA busy_timeout')).scalar() == 5000
+
+
+def test_lock_errors_are_retried_after_a_rollback():
+    calls, rollbacks = [], []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise sqlite3.OperationalError('database is locked')
+        return 'done'
+
+    assert sqlite_tuning.with_lock_retry(flaky, lambda: rollbacks.append(1), backoff=0) == 'done'
+    assert len(rollbacks) == 2
+
+
+def test_other_errors_are_not_retried():
+    def broken():
+        raise sqlite3.OperationalError('no such table: jobs')
+
+    with pytest.raises(sqlite3.OperationalError):
+        sqlite_tuning.with_lock_retry(broken, pytest.fail, backoff=0)
+
+
+def test_concurrent_writer_processes_never_see_a_lock_error(tmp_path):
+    result = sqlite_tuning.stress(str(tmp_path / 'stress.sqlite3'), processes=4, transactions=50)
+    assert (result['committed'], result['failed']) == (200, 0)
+    connection = sqlite3.connect(str(tmp_path / 'stress.sqlite3'))
+    assert connection.execute('SELECT count(*) FROM stress').fetchone()[0] == 200
+    connection.close()
+
+
+def test_concurrent_requests_all_commit(seeded_app):
+    with seeded_app.app_context():
+        enrollments = [(progress.user.email, progress.course_id) for progress in
+                       Progress.query.join(User).filter(Progress.completed.is_(False)).limit(6)]
+
+    def learner(email, course_id):
+        client = login(seeded_app, email)
+        statuses = {client.post(f'/update-progress/{course_id}', data={'percentage': str(percentage)}
+                                ).status_code for percentage in range(1, 21)}
+        return statuses
+
+    with ThreadPoolExecutor(len(enrollments)) as pool:
+        results = list(pool.map(lambda enrollment: learner(*enrollment), enrollments))
+    assert results == [{302}] * len(enrollments)
+
+    with seeded_app.app_context():
+        for email, course_id in enrollments:
+            progress = Progress.query.join(User).filter(
+                User.email == email, Progress.course_id == course_id).one()
+            assert progress.progress_percentage == 20